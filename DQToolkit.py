@@ -17,10 +17,326 @@
 * DataSource and derived objects implement sources of tabular data (currently excel sheets, wikitables)
 * Rule implements the validation rules
 
+The heavy backends are imported lazily: numpy and pandas on first use (e.g. when a frame is materialized),
+the other backends (openpyxl, lxml, pyarrow, duckdb, aiohttp, matplotlib) inside the objects using them.
+Importing the module and working with rule metadata therefore does not load them
+
 """
 
-import numpy as np
-import pandas as pd
+import hashlib
+import http.client
+import http.server
+import importlib
+import io
+import json
+import mmap
+import operator
+import os
+import pickle
+import shutil
+import socket
+import socketserver
+import threading
+import time
+import tracemalloc
+import warnings
+import zipfile
+from collections import OrderedDict, namedtuple
+from collections.abc import MutableMapping
+
+
+class LazyModule(object):
+    """ A placeholder for a module global of this module (e.g. np) that imports the module on first attribute
+    access and then rebinds the global to the module itself. The laziness is confined to the global: the
+    module is imported normally (sys.modules is not modified) and concurrent first accesses are serialized by
+    the import lock
+
+    """
+
+    def __init__(self, name, alias):
+        """ Create a placeholder
+
+        :param name: the module name (e.g. 'pandas')
+        :param alias: the name of the global of this module (e.g. 'pd')
+        """
+        # Underscore names, so that they do not hide attributes of the module
+        self.__dict__.update(_name=name, _alias=alias)
+
+    def __getattr__(self, attribute):
+        return getattr(self._load(), attribute)
+
+    def __repr__(self):
+        return '<lazy module {!r}>'.format(self._name)
+
+    def _load(self):
+        module = importlib.import_module(self._name)
+        globals()[self._alias] = module
+        return module
+
+
+def load_backends():
+    """ Import numpy and pandas now instead of on first use (e.g. to move the import cost out of a timed
+    section)
+
+    """
+    for module in (np, pd):
+        if isinstance(module, LazyModule):
+            module._load()
+
+
+np = LazyModule('numpy', 'np')
+pd = LazyModule('pandas', 'pd')
+
+
+#
+# Profiling Instrumentation
+#
+
+class NullSpan(object):
+    """ The span returned by a disabled Profiler_ (does nothing) """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attributes):
+        pass
+
+
+NULL_SPAN = NullSpan()
+
+
+class Span(object):
+    """ A timed (and optionally memory traced) section of the validation workflow.
+    Spans inherit the attributes (frame, column, rule, ...) of the span they are nested in
+
+    """
+
+    def __init__(self, profiler, name, attributes):
+        self.profiler = profiler
+        self.name = name
+        self.attributes = attributes
+        self.parent = None
+        self.max_peak = 0
+
+    def set(self, **attributes):
+        """ Add attributes to the span (e.g. the cache outcome once known) """
+        self.attributes.update(attributes)
+
+    def __enter__(self):
+        stack = self.profiler.stack
+        if stack:
+            self.parent = stack[-1]
+            self.attributes = dict(self.parent.attributes, **self.attributes)
+        stack.append(self)
+        if self.profiler.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self.parent is not None:
+                self.parent.max_peak = max(self.parent.max_peak, peak)
+            tracemalloc.reset_peak()
+            self.start_memory = current
+            self.max_peak = current
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        event = {'name': self.name, 'start': self.start - self.profiler.origin, 'duration': end - self.start}
+        event.update(self.attributes)
+        if self.profiler.trace_memory:
+            peak = max(self.max_peak, tracemalloc.get_traced_memory()[1])
+            event['peak_bytes'] = peak - self.start_memory
+            if self.parent is not None:
+                self.parent.max_peak = max(self.parent.max_peak, peak)
+        self.profiler.stack.pop()
+        self.profiler.events.append(event)
+        return False
+
+
+class Profiler(object):
+    """ The _`Profiler` object records the wall time (and optionally the peak traced memory) of the
+    stages of the validation workflow: parsing / loading, type coercion, rule functions and result
+    bookkeeping, per frame / column / rule, together with cell counts and cache outcomes.
+    It is disabled by default, in which case instrumented code only pays an attribute check.
+    The module level instance PROFILER is used by the toolkit objects
+
+    :Example:
+
+    .. code-block:: python
+
+        PROFILER.enable()
+        MySource.validate_all(MyRule)
+        print(PROFILER.summary())
+        PROFILER.to_chrome_trace('validation_trace.json')
+
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.trace_memory = False
+        # Whether tracemalloc was started by the profiler (and must be stopped by it)
+        self.started_tracing = False
+        self.events = []
+        self.stack = []
+        self.origin = time.perf_counter()
+
+    def enable(self, trace_memory=False):
+        """ Start recording events
+
+        :param trace_memory: also record the peak allocated memory of each span (uses tracemalloc, slower)
+        """
+        self.enabled = True
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracing = True
+
+    def disable(self):
+        """ Stop recording events (recorded events are kept). Memory tracing started by the host application
+        is left running """
+        self.enabled = False
+        self.trace_memory = False
+        if self.started_tracing:
+            self.started_tracing = False
+            tracemalloc.stop()
+
+    def clear(self):
+        self.events = []
+        self.origin = time.perf_counter()
+
+    def span(self, name, **attributes):
+        """ A context manager timing a section of code
+
+        :param name: the stage name (e.g. 'parse', 'coercion', 'rule', 'bookkeeping')
+        :param attributes: attributes of the span (frame, column, rule, cells, ...)
+        """
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, attributes)
+
+    def to_frame(self):
+        """ Return the recorded events as a DataFrame (one row per span) """
+        return pd.DataFrame(self.events)
+
+    def summary(self, by=('frame', 'column', 'rule', 'name')):
+        """ Aggregate the recorded events (total duration, calls, cells, peak memory, cache hits) by the given attributes """
+        df = self.to_frame()
+        if df.empty:
+            return df
+        keys = [key for key in by if key in df.columns]
+        aggregations = {'duration': ['sum', 'count']}
+        if 'cells' in df.columns:
+            aggregations['cells'] = 'sum'
+        if 'peak_bytes' in df.columns:
+            aggregations['peak_bytes'] = 'max'
+        if 'cache' in df.columns:
+            df['cache_hit'] = df['cache'] == 'hit'
+            aggregations['cache_hit'] = 'sum'
+        summary = df.groupby(keys, dropna=False).agg(aggregations)
+        summary.columns = [{('duration', 'sum'): 'duration', ('duration', 'count'): 'calls'}.get(column, column[0])
+                           for column in summary.columns]
+        return summary
+
+    def to_json(self, filename):
+        """ Export the recorded events as a JSON list """
+        with open(filename, 'w') as f:
+            json.dump(self.events, f, default=str)
+
+    def to_chrome_trace(self, filename):
+        """ Export the recorded events in the Chrome trace event format (chrome://tracing, Perfetto) """
+        trace = []
+        for event in self.events:
+            args = {key: value for key, value in event.items() if key not in ('name', 'start', 'duration')}
+            trace.append({'name': event['name'], 'cat': 'DQToolkit', 'ph': 'X', 'pid': os.getpid(), 'tid': 0,
+                          'ts': event['start'] * 1e6, 'dur': event['duration'] * 1e6, 'args': args})
+        with open(filename, 'w') as f:
+            json.dump({'traceEvents': trace, 'displayTimeUnit': 'ms'}, f, default=str)
+
+
+PROFILER = Profiler()
+
+
+#
+# Validation Reports
+#
+
+ValidationRecord = namedtuple('ValidationRecord', ['frame', 'column', 'rule', 'status', 'true_count', 'false_count',
+                                                   'na_count', 'elapsed'])
+
+
+class ValidationReport(object):
+    """ The _`ValidationReport` object collects a structured record (ValidationRecord) per validated
+    frame / column / rule: the status message, the True / False / NA counts and the elapsed time
+
+    """
+
+    def __init__(self):
+        self.records = []
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def add(self, frame, column, rule, msg, result=None, elapsed=None):
+        """ Add the outcome of a rule over a column
+
+        :param frame: the frame index
+        :param column: the column name
+        :param rule: the rule name (or plan entry label)
+        :param msg: the validation status message
+        :param result: the ValidationResult_ / ValidationCounts_ (if any)
+        :param elapsed: the evaluation time in seconds
+        :return: the ValidationRecord
+        """
+        if result is not None:
+            counts = (result.true_count, result.false_count, result.na_count)
+        else:
+            counts = (None, None, None)
+        record = ValidationRecord(frame, column, rule, msg, *counts, elapsed)
+        self.records.append(record)
+        return record
+
+    def clear(self):
+        self.records = []
+
+    def to_frame(self):
+        """ Return the report as a DataFrame (one row per record)
+
+        """
+        return pd.DataFrame(self.records, columns=ValidationRecord._fields)
+
+
+class ConsoleReporter(object):
+    """ The _`ConsoleReporter` object renders validation progress to the console.
+    It is opt-in: assign an instance to DataSource.reporter to enable it
+
+    :Example:
+
+    .. code-block:: python
+
+        MySource.reporter = ConsoleReporter()
+        MySource.validate_all(MyRule)
+
+    """
+
+    def __init__(self, show_results=False):
+        """ Create a new console reporter
+
+        :param show_results: also print the full outcome (True/False per cell) of each column
+        """
+        self.show_results = show_results
+
+    def frame_started(self, frame):
+        print("Validating Frame: ", frame)
+
+    def column_validated(self, record, result=None):
+        print("-- Validating Column: ", record.column, record.rule, record.status)
+        if self.show_results and result is not None and hasattr(result, 'to_array'):
+            print(list(result))
 
 
 #
@@ -40,12 +356,78 @@ class DataSource(object):
         self.col_datatypes = {}
         self.status = {}
         self.results = {}
+        # The rule that produced each status / results outcome (frame: {column: rule name})
+        self.status_rules = {}
+        self.rule_status = {}
+        self.rule_results = {}
+        self.dataset_status = {}
+        self.dataset_results = {}
         self.frame_names = {}
         self.frame_no = 1
+        # The ColumnProfile_ of each (frame, column), shared by describe and the rules
+        self.profiles = {}
+        self.report = ValidationReport()
+        self.reporter = None
+        self.failure_index = FailureIndex()
 
-    def describe(self, verbosity=0):
+    def record(self, frame, column, rule, msg, result=None, elapsed=None):
+        """ Record a validation outcome in the report and the failure index (and pass it to the reporter, if any)
+
+        """
+        record = self.report.add(frame, column, rule, msg, result, elapsed)
+        self.failure_index.add(frame, column, rule, result)
+        if self.reporter is not None:
+            self.reporter.column_validated(record, result)
+
+    def frame_started(self, frame):
+        if self.reporter is not None:
+            self.reporter.frame_started(frame)
+
+    def set_status_rule(self, frame, columns, rule):
+        """ Record the rule of the status / results outcomes of columns (e.g. for the ResultStore_)
+
+        """
+        rules = self.status_rules.setdefault(frame, {})
+        for col in columns:
+            rules[col] = rule
+
+    def frame_index(self, frame):
+        """ The index of a frame given by index or by name (e.g. a sheet name)
+
+        """
+        if isinstance(frame, str):
+            return list(self.frame_names).index(frame)
+        return frame
+
+    def profile(self, frame, column):
+        """ The ColumnProfile_ of a column. Profiles are computed once and reused by describe and the rules
+        until the column data changes (the frame is replaced or the column is reassigned or modified)
+
+        """
+        series = self.df[frame][column]
+        token = ColumnProfile.data_token(series)
+        cached = self.profiles.get((frame, column))
+        if cached is None or cached[0] != token:
+            cached = token, ColumnProfile(series)
+            self.profiles[(frame, column)] = cached
+        return cached[1]
+
+    def clear_profiles(self, frame=None):
+        """ Release the cached column profiles (of a frame or of all frames)
+
+        """
+        if frame is None:
+            self.profiles.clear()
+        else:
+            for key in [key for key in self.profiles if key[0] == frame]:
+                del self.profiles[key]
+
+    def describe(self, verbosity=0, approximate=False, chunksize=100000):
         """ Describe the obtained dataframes
 
+        :param approximate: compute the summary statistics chunk by chunk in a single pass, with approximate
+            quantiles and distinct counts (ApproximateStatistics_) instead of DataFrame.describe
+        :param chunksize: the number of rows per chunk in approximate mode
         :return: 
         """
 
@@ -55,17 +437,29 @@ class DataSource(object):
             print("Frame: ", frame, " Data Types")
             print(self.df[frame].dtypes)
             print("-" * 80)
+            print("Frame: ", frame, " Cell Types")
+            print("-" * 80)
+            for col in self.col_names[frame]:
+                col_profile = self.profile(frame, col)
+                counts = ', '.join('{}: {}'.format(name, count) for name, count in col_profile.type_counts().items())
+                print('{:<40}'.format(col), '{:<10}'.format(col_profile.kind), counts)
+            print("-" * 80)
             print("Frame: ", frame, " Summary Statistics")
             print("-" * 80)
             if verbosity == 0:
                 print("Column Names: ", self.col_names[frame])
                 print("Row Count: ", self.col_length[frame])
+            elif approximate:
+                statistics = ApproximateStatistics()
+                for start in range(0, len(self.df[frame]), chunksize):
+                    statistics.update(self.df[frame].iloc[start:start + chunksize])
+                print(statistics.to_frame())
             else:
                 print(self.df[frame].describe())
 
     def validate(self, column, Validation_Rule, frame=0):
         """ Validate desired frame / column against the activated validation rule.
-        When applicable, it returns a list of Booleans (True/False)
+        When applicable, the outcome is stored as a ValidationResult_ (packed Booleans True/False)
 
         :param column:
         :param Validation_Rule:
@@ -73,163 +467,1330 @@ class DataSource(object):
         :return:
         """
 
-        series = self.df[frame][column]
-        msg, validation_list = Validation_Rule.apply(series)
-        if validation_list:
-            self.status[frame][column] = msg
-            self.results[frame][column] = validation_list
-        else:
-            self.status[frame][column] = msg
+        with PROFILER.span('validate', frame=frame, column=column, rule=Validation_Rule.active_rule_name) as span:
+            col_profile = self.profile(frame, column)
+            span.set(cells=col_profile.length)
+            start = time.perf_counter()
+            msg, validation_list = Validation_Rule.apply(col_profile)
+            elapsed = time.perf_counter() - start
+            with PROFILER.span('bookkeeping'):
+                if validation_list:
+                    self.status[frame][column] = msg
+                    self.results[frame][column] = validation_list
+                else:
+                    self.status[frame][column] = msg
+                    # Drop the outcome of a previous rule, it does not belong to this status
+                    self.results[frame].pop(column, None)
+                self.set_status_rule(frame, [column], Validation_Rule.active_rule_name)
+                self.record(frame, column, Validation_Rule.active_rule_name, msg, validation_list, elapsed)
 
     def validate_frame(self, Validation_Rule, frame=0):
-        """ Validate all columns of a frame against the activated validation rule. Returns lists of Booleans (True/False)
+        """ Validate all columns of a frame against the activated validation rule. Stores ValidationResult_ outcomes
 
         :param Validation_Rule:
         :param frame:
         :return:
         """
         for col in self.col_names[frame]:
-            print("-- Validating Column: ", col)
             self.validate(col, Validation_Rule, frame)
 
     def validate_all(self, Validation_Rule):
         """ Validate all columns of all frames frame against the activated validation rule.
-        Returns lists of Booleans (True/False)
+        Stores ValidationResult_ outcomes
 
         :param Validation_Rule:
         :return:
         """
         for frame in range(self.frame_no):
-            print("Validating Frame: ", frame)
+            self.frame_started(frame)
             self.validate_frame(Validation_Rule, frame)
 
-    def validation_summary(self):
+    def validate_plan(self, Validation_Plan, frame=None):
+        """ Validate frames against all the rules of a validation plan in a single pass.
+        Each column is read and profiled once; the outcomes of each plan entry are stored in
+        rule_status[label] and rule_results[label] with the same layout as status and results
+
+        :param Validation_Plan: the ValidationPlan_ to evaluate
+        :param frame: the frame to validate (all frames if None)
+        :return:
+        """
+        frames = range(self.frame_no) if frame is None else [frame]
+        for frame in frames:
+            self.frame_started(frame)
+            outcomes = {}
+            timings = {}
+            for col in self.col_names[frame]:
+                timings[col] = {}
+                with PROFILER.span('validate', frame=frame, column=col):
+                    outcomes[col] = Validation_Plan.evaluate(self.profile(frame, col), col, timings[col])
+            self.store_plan_outcomes(Validation_Plan.labels(), frame, outcomes, timings)
+
+    def store_plan_outcomes(self, labels, frame, outcomes, timings=None):
+        """ Store the outcomes of a validation plan over a frame
+
+        :param labels: the plan entry labels
+        :param frame: the frame index
+        :param outcomes: a dictionary of column: {label: (msg, ValidationResult)}
+        :param timings: an optional dictionary of column: {label: elapsed seconds}
+        """
+        for label in labels:
+            self.rule_status.setdefault(label, {}).setdefault(frame, {})
+            self.rule_results.setdefault(label, {}).setdefault(frame, {})
+        for col, col_outcomes in outcomes.items():
+            for label, (msg, validation_list) in col_outcomes.items():
+                self.rule_status[label][frame][col] = msg
+                if validation_list:
+                    self.rule_results[label][frame][col] = validation_list
+                elapsed = timings.get(col, {}).get(label) if timings else None
+                self.record(frame, col, label, msg, validation_list, elapsed)
+
+    def validate_incremental(self, validator, state=None, frame=None):
+        """ Validate frames against a rule (or all the rules of a validation plan), re-evaluating only the
+        row blocks whose content changed since the saved validation state. Outcomes of unchanged blocks
+        are taken from the state and merged with the new ones. Outcomes are stored as by validate_frame
+        (a Rule_) or validate_plan (a ValidationPlan_)
+
+        :param validator: the Rule_ or ValidationPlan_ to evaluate
+        :param state: the ValidationState_ of a previous run (None for a full run)
+        :param frame: the frame to validate (all frames if None)
+        :return: the updated ValidationState_
+
+        :Example:
+
+        .. code-block:: python
+
+            state = MySource.validate_incremental(MyRule, ValidationState.load('tape.state'))
+            state.save('tape.state')
+
+        """
+        if state is None:
+            state = ValidationState()
+        if isinstance(validator, ValidationPlan):
+            entries = validator.entries
+            rules = validator.rules
+        else:
+            entries = [(validator.active_rule_name, validator.active_rule, validator.active_rule_args, None)]
+            rules = validator
+        state.last_run = {'blocks': 0, 'changed_blocks': 0, 'evaluated_cells': 0}
+        frames = range(self.frame_no) if frame is None else [frame]
+        for frame in frames:
+            self.frame_started(frame)
+            for col in self.col_names[frame]:
+                col_profile = self.profile(frame, col)
+                series = col_profile.series
+                with PROFILER.span('fingerprint', frame=frame, column=col, cells=col_profile.length):
+                    blocks = col_profile.block_fingerprints(state.block_size)
+                changed = state.changed_blocks(frame, col, blocks)
+                state.last_run['blocks'] += len(blocks)
+                state.last_run['changed_blocks'] += len(changed)
+                profiles = {}
+                for label, function, args, columns in entries:
+                    if not ValidationPlan.selects((label, function, args, columns), col):
+                        continue
+                    start = time.perf_counter()
+                    key = (label, function, repr(args))
+                    previous = state.outcomes.get((key, frame, col))
+                    if previous is not None and not changed and len(previous) == col_profile.length:
+                        stored = previous
+                    else:
+                        stored = state.merge(previous, changed if previous is not None else range(len(blocks)),
+                                             col_profile.length, series, function, args, rules.vectorized,
+                                             profiles)
+                    state.outcomes[(key, frame, col)] = stored
+                    if col_profile.length == 0:
+                        msg, validation_list = "Empty Series", None
+                    elif stored.na_count > 0:
+                        msg, validation_list = 'Rule Not Applicable', None
+                    else:
+                        msg, validation_list = 'Validated', stored
+                    elapsed = time.perf_counter() - start
+                    if isinstance(validator, ValidationPlan):
+                        # store_plan_outcomes records the outcome
+                        self.store_plan_outcomes([label], frame, {col: {label: (msg, validation_list)}},
+                                                 {col: {label: elapsed}})
+                    else:
+                        self.status[frame][col] = msg
+                        if validation_list:
+                            self.results[frame][col] = validation_list
+                        else:
+                            self.results[frame].pop(col, None)
+                        self.set_status_rule(frame, [col], label)
+                        self.record(frame, col, label, msg, validation_list, elapsed)
+                state.blocks[(frame, col)] = blocks
+        return state
+
+    def validate_dataset(self, Dataset_Plan, frame=None):
+        """ Validate frames against the dataset (row / multi column / cross frame) rules of a plan.
+        The outcome of each entry is stored per frame in dataset_status[label] and dataset_results[label]
+        as a ValidationResult_ with one value per row
+
+        :param Dataset_Plan: the DatasetPlan_ to evaluate
+        :param frame: the frame to validate (all frames if None)
+        :return:
+        """
+        frames = range(self.frame_no) if frame is None else [self.frame_index(frame)]
+        for frame in frames:
+            self.frame_started(frame)
+            df = self.df[frame]
+            for entry in Dataset_Plan.entries:
+                label, function, args = entry[:3]
+                if not Dataset_Plan.selects(entry, frame, self.frame_names[frame] if self.frame_names else None, df):
+                    continue
+                start = time.perf_counter()
+                with PROFILER.span('validate', frame=frame, rule=label, cells=len(df)):
+                    msg, validation_list = evaluate_dataset_rule(function, args, self, frame)
+                self.dataset_status.setdefault(label, {})[frame] = msg
+                if validation_list:
+                    self.dataset_results.setdefault(label, {})[frame] = validation_list
+                self.record(frame, ', '.join(map(str, dataset_rule_columns(function, args))), label, msg,
+                            validation_list, time.perf_counter() - start)
+
+    def dataset_summary(self):
+        """ Display a summary of the dataset rule outcomes
+
+        :return:
+        """
+        print("\n")
+        print('{:<20}'.format("Rule"), '{:<10}'.format("Frame"), '{:<20}'.format("Validation Status"),
+              '{:<20}'.format("True / False Count"))
+        print("=" * 80)
+        for label, frames in self.dataset_status.items():
+            for frame, msg in frames.items():
+                if msg == 'Validated':
+                    result = self.dataset_results[label][frame]
+                    print('{:<20}'.format(label), '{:<10}'.format(frame), '{:<20}'.format(msg),
+                          'True: {:<10}'.format(result.true_count), 'False: {:<10}'.format(result.false_count))
+                else:
+                    print('{:<20}'.format(label), '{:<10}'.format(frame), '{:<20}'.format(msg))
+
+    def failing_rows(self, checks, frame=0, n=None, how='all'):
+        """ The rows of a frame that fail the given checks, as a DataFrame slice
+
+        :param checks: a (column, rule) pair or a list of pairs (rule: the rule name or plan / dataset entry label)
+        :param frame: the frame
+        :param n: return only the first n rows
+        :param how: 'all' (rows failing every check) or 'any' (rows failing at least one check)
+        :return: the failing rows (positions from FailureIndex_)
+
+        :Example:
+
+        .. code-block:: python
+
+            MySource.validate_plan(MyPlan)
+            MySource.failing_rows([('Current Balance', 'R2'), ('Original Balance', 'R2')], n=20)
+
+        """
+        return self.df[frame].iloc[self.failing_positions(checks, frame, n, how)]
+
+    def failing_positions(self, checks, frame=0, n=None, how='all'):
+        """ The sorted row positions of a frame that fail the given checks (see failing_rows)
+
+        """
+        if isinstance(checks, tuple):
+            checks = [checks]
+        keys = [(frame, column, rule) for column, rule in checks]
+        if how == 'all':
+            return self.failure_index.intersection(keys, n)
+        return self.failure_index.union(keys, n)
+
+    def plot_validation(self, frame=0, label=None, **plot_args):
+        """ Draw the polar validation plot of a frame (one ray per column, rows along the radius, requires
+        matplotlib). Large frames are drawn as binned shares of passing cells (see plot_polar)
+
+        :param frame: the frame
+        :param label: plot the outcomes of a validation plan entry instead of the activated rule
+        :param plot_args: the plot_polar arguments (ax, mode, max_points, bins, title, filename)
+        :return: the axes
+
+        :Example:
+
+        .. code-block:: python
+
+            MySource.validate_all(MyRule)
+            MySource.plot_validation(filename='Test.png')
+
+        """
+        results = self.results if label is None else self.rule_results[label]
+        return plot_polar(results.get(self.frame_index(frame), {}), **plot_args)
+
+    def validation_summary(self, label=None):
         """ Display a summary of the validation outcomes for a given frame
 
+        :param label: display the outcomes of a validation plan entry instead of the activated rule
         :return:
         """
+        if label is None:
+            status, results = self.status, self.results
+        else:
+            status, results = self.rule_status[label], self.rule_results[label]
         print("\n")
         print('{:<20}'.format("Column"), '{:<20}'.format("Validation Status"), '{:<20}'.format("True / False Count"))
         print("=" * 80)
-        for frame in range(self.frame_no):
-            for col in self.col_names[frame]:
-                if self.status[frame][col] == 'Validated':
-                    print(self.results[frame][col])
-                    true_count = sum(self.results[frame][col])
-                    false_count = len(self.results[frame][col]) - true_count
-                    print('{:<20}'.format(col), '{:<20}'.format(self.status[frame][col]),
+        # Only the validated columns are listed (in validation order), so frames that were not validated
+        # (e.g. sheets that are not loaded yet) are not read
+        for frame in sorted(status):
+            for col, msg in status[frame].items():
+                if msg == 'Validated':
+                    true_count = results[frame][col].true_count
+                    false_count = results[frame][col].false_count
+                    print('{:<20}'.format(col), '{:<20}'.format(msg),
                           'True: {:<10}'.format(true_count),
                           'False: {:<10}'.format(false_count))
                 else:
-                    print('{:<20}'.format(col), '{:<20}'.format(self.status[frame][col]))
+                    print('{:<20}'.format(col), '{:<20}'.format(msg))
 
 
 #
-#  Excel sheet Datasource
+#  Lazy frame mapping
 #
 
-class XLSDataSource(DataSource):
-    """ The _`XLSDataSource` object implements an excel sheet data source.
-    It treats each excel sheet as a distinct table
-    The class inherits from DataSource_
+class LazyFrames(MutableMapping):
+    """ The _`LazyFrames` object is a mapping of frame index to a value (e.g. a dataframe) that is
+    only computed, by calling the loader function, on first access. Values can also be assigned directly
+
+    """
+
+    def __init__(self, keys, loader):
+        """ Create a new lazy mapping
+
+        :param keys: the frame indexes
+        :param loader: function of the frame index returning the value
+        """
+        self._keys = list(keys)
+        self._loader = loader
+        self._data = {}
+
+    def __getitem__(self, key):
+        if key not in self._data:
+            if key not in self._keys:
+                raise KeyError(key)
+            self._data[key] = self._loader(key)
+        return self._data[key]
+
+    def __setitem__(self, key, value):
+        if key not in self._keys:
+            self._keys.append(key)
+        self._data[key] = value
+
+    def __delitem__(self, key):
+        self._keys.remove(key)
+        self._data.pop(key, None)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        return 'LazyFrames(keys={}, loaded={})'.format(self._keys, sorted(self._data))
+
+    def is_loaded(self, key):
+        """ Test whether the value of a key has already been materialized
+
+        """
+        return key in self._data
+
+
+#
+#  Parsed frame cache
+#
 
+class FrameCache(object):
+    """ The _`FrameCache` object implements an on-disk cache of parsed dataframes.
+    Entries are keyed by the content hash of the source file and the parsing options, so a
+    modified file never hits a stale entry. Frames are stored as pickle (protocol 5) streams with
+    their data buffers written out-of-band to a separate file that is memory-mapped on load.
+    The total size of the cache is bounded: the least recently used entries are evicted first
 
     """
 
-    def __init__(self, filename, header_row):
-        """ Create a new xls data source
+    def __init__(self, directory, max_bytes=2 ** 30):
+        """ Create a new (or open an existing) frame cache
 
-        :param filename: the excel filename
-        :type header_row: the row with the column names (must be the same for all sheets)
+        :param directory: the cache directory (created if needed)
+        :param max_bytes: the maximum total size of the cached files
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
 
-        :Example:
+    @staticmethod
+    def file_hash(filename, block_size=2 ** 20):
+        """ The SHA-256 hash of the content of a file
 
-        .. code-block:: python
+        """
+        digest = hashlib.sha256()
+        with open(filename, 'rb') as f:
+            for block in iter(lambda: f.read(block_size), b''):
+                digest.update(block)
+        return digest.hexdigest()
 
-            filename = "../datasets/EBA_Sample.xlsx"
-            header_row = 2
-            MySource = XLSDataSource(filename, header_row)
+    @staticmethod
+    def make_key(content_hash, *options):
+        """ The cache key of a file (content hash) parsed with the given options
 
         """
-        DataSource.__init__(self)
-        # Read the excel file from disk
-        self.xls = pd.ExcelFile(filename, engine="openpyxl")
-        # Frame names are the sheet names
-        self.frame_names = self.xls.sheet_names
-        # Number of sheets / frames
-        self.frame_no = len(self.frame_names)
-        # The header row (values start immediately below)
-        self.header_row = header_row
+        return hashlib.sha256(repr((content_hash,) + options).encode('utf-8')).hexdigest()
 
-        # Create the dataframes (one per sheet)
-        for frame in range(self.frame_no):
-            self.df[frame] = pd.read_excel(self.xls, self.frame_names[frame], header=self.header_row)
-            self.col_names[frame] = list(self.df[frame])
-            self.results[frame] = {}
-            self.col_length[frame] = self.df[frame].shape[0]
-            self.status[frame] = {}
+    def entry_path(self, key, name=None):
+        path = os.path.join(self.directory, key)
+        if name is None:
+            return path
+        return os.path.join(path, hashlib.sha1(str(name).encode('utf-8')).hexdigest())
 
-    # def validate_frame(self, Validation_Rule):
-    #     for frame in range(self.frame_no):
-    #
-    #         for col in self.col_names[frame]:
-    #             series = self.df[frame][col]
-    #             self.results[self.sheet_names[frame]][col] = Validation_Rule.apply(series)
+    def get_meta(self, key):
+        """ The metadata (dictionary) stored with an entry, or None if the entry does not exist
 
+        """
+        try:
+            with open(os.path.join(self.entry_path(key), 'meta.json')) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
 
-class WikiDataSource(DataSource):
-    """ The _`WWWDataSource` object implements a wikitable data source
-    The class inherits from DataSource_
+    def put_meta(self, key, meta):
+        os.makedirs(self.entry_path(key), exist_ok=True)
+        with open(os.path.join(self.entry_path(key), 'meta.json'), 'w') as f:
+            json.dump(meta, f)
 
-    """
+    def get(self, key, name):
+        """ Load a cached frame, memory-mapping its data buffers. Returns None on a cache miss
 
-    def __init__(self, url):
-        """ Create a new web data source
+        :param key: the entry key
+        :param name: the frame name within the entry (e.g. the sheet name)
+        """
+        path = self.entry_path(key, name)
+        try:
+            with open(path + '.idx') as f:
+                layout = json.load(f)
+            with open(path + '.pkl', 'rb') as f:
+                data = f.read()
+            buffers = []
+            if layout:
+                with open(path + '.buf', 'rb') as f:
+                    # Copy-on-write mapping: pages are shared with the page cache until written to
+                    mapped = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY))
+                buffers = [mapped[offset:offset + length] for offset, length in layout]
+            df = pickle.loads(data, buffers=buffers)
+        except (OSError, ValueError, pickle.UnpicklingError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        os.utime(self.entry_path(key))
+        return df
 
-        :param url: the webpage hosting the wikitable (must be accessible)
+    def put(self, key, name, df):
+        """ Store a frame in the cache and evict old entries if the size bound is exceeded
 
-        .. note:: The initialization in itself does not validate if the web page is accessible
+        :param key: the entry key
+        :param name: the frame name within the entry (e.g. the sheet name)
+        :param df: the dataframe
+        """
+        os.makedirs(self.entry_path(key), exist_ok=True)
+        path = self.entry_path(key, name)
+        buffers = []
+        data = pickle.dumps(df, protocol=5, buffer_callback=buffers.append)
+        layout = []
+        with open(path + '.buf', 'wb') as f:
+            for buffer in buffers:
+                raw = buffer.raw()
+                # Align each buffer to 64 bytes
+                offset = f.tell()
+                padding = -offset % 64
+                f.write(b'\0' * padding)
+                layout.append((offset + padding, raw.nbytes))
+                f.write(raw)
+        with open(path + '.pkl', 'wb') as f:
+            f.write(data)
+        # The index is written last: an entry without index is treated as a miss
+        with open(path + '.idx', 'w') as f:
+            json.dump(layout, f)
+        os.utime(self.entry_path(key))
+        self.evict()
 
-        .. note:: Because wikitables (and html tables more generally) do not store type metadata the
-        assumption is that there is a specific row in the table (second row) that stores type information
-        in pandas format. During initialization, there is a validatin step
+    def entries(self):
+        """ List the cache entries as (last access time, size in bytes, key), least recently used first
 
-        :Example:
+        """
+        entries = []
+        for key in os.listdir(self.directory):
+            path = self.entry_path(key)
+            if not os.path.isdir(path):
+                continue
+            size = sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+            entries.append((os.path.getmtime(path), size, key))
+        return sorted(entries)
 
-        .. code-block:: python
+    def size(self):
+        return sum(entry[1] for entry in self.entries())
 
-            url = "https://en.wikipedia.org/wiki/List_of_data_breaches"
-            MySource = WWWDataSource(url)
+    def evict(self):
+        """ Remove least recently used entries until the cache fits within max_bytes
 
         """
-        DataSource.__init__(self)
-        # TODO Current implementation assumes there is only single table per wiki page (index 0)
-        # Read the wikitable from the URL and create the dataframe
-        self.df[0] = pd.read_html(url, attrs={"class": "wikitable"}, header=0)[0]
-        self.col_datatypes = list(self.df[0].iloc[1])
-        print(self.col_datatypes)
-        print(self.df[0].dtypes)
+        entries = self.entries()
+        total = sum(entry[1] for entry in entries)
+        for _, size, key in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(self.entry_path(key), ignore_errors=True)
+            total -= size
 
-        self.df[0].drop(self.df[0].index[[0, 1]], inplace=True)
-        self.col_names[0] = list(self.df[0])
+    def clear(self):
+        for _, _, key in self.entries():
+            shutil.rmtree(self.entry_path(key), ignore_errors=True)
 
-        # self.df[0].drop(self.df[0].index[1])
-        # self.df[0].reindex()
 
-        # self.df[0].drop(self.df[0].index[1])
-        # self.df[0].reindex()
+#
+#  Persistent result store
+#
 
-        print(self.df[0].head(2))
+class ResultStore(object):
+    """ The _`ResultStore` object keeps the validation outcomes of many runs on disk. Each run is a directory
+    with a small JSON index (frames, columns, rules, status messages and counts) and a single binary file
+    holding the packed outcome bits (and recorded failure positions) of all the columns, aligned to 64 bytes.
+    Opening a run reads the index only: the outcomes are memory-mapped, so a summary never reads the bits and
+    other consumers read only the columns they access
 
-        # c = 0
-        # for col in self.df[0].columns:
-        #     self.df[0][col] = self.df[0][col].astype(self.col_datatypes[c])
-        #     c +=1
+    """
 
-        # pd.to_numeric(self.df[0])
+    def __init__(self, directory):
+        """ Create (or open) a result store
 
-        # Determine column length
-        self.col_length[0] = self.df[0].count
+        :param directory: the store directory
+
+        :Example:
+
+        .. code-block:: python
+
+            MyStore = ResultStore('validation_runs')
+            run_id = MyStore.save(MySource, metadata={'dataset': 'EBA_Sample'})
+            MyStore.open(run_id).validation_summary()
+
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def run_path(self, run_id, name=None):
+        path = os.path.join(self.directory, run_id)
+        return path if name is None else os.path.join(path, name)
+
+    def new_run_id(self):
+        run_id = time.strftime('%Y%m%dT%H%M%S')
+        suffix = 0
+        while os.path.exists(self.run_path(run_id if suffix == 0 else '{}-{}'.format(run_id, suffix))):
+            suffix += 1
+        return run_id if suffix == 0 else '{}-{}'.format(run_id, suffix)
+
+    def save(self, source, run_id=None, metadata=None):
+        """ Store the outcomes of a data source (status / results, rule_status / rule_results of validation plans
+        and dataset_status / dataset_results of dataset plans)
+
+        :param source: the DataSource_
+        :param run_id: the run identifier (a timestamp if omitted)
+        :param metadata: a JSON serializable dictionary stored with the run
+        :return: the run identifier
+        """
+        if run_id is None:
+            run_id = self.new_run_id()
+        elif os.path.exists(self.run_path(run_id)):
+            raise ValueError("Run already exists: " + str(run_id))
+        frames = [frame for frame in range(source.frame_no) if frame in source.status or
+                  any(frame in status for status in source.rule_status.values()) or
+                  any(frame in status for status in source.dataset_status.values())]
+        index = {'run_id': run_id, 'created': time.time(), 'metadata': metadata or {},
+                 'source': type(source).__name__, 'frame_no': source.frame_no,
+                 'frame_names': [str(name) for name in source.frame_names] if source.frame_names else [],
+                 'col_names': {str(frame): [str(col) for col in source.col_names[frame]] for frame in frames},
+                 'entries': []}
+        temporary = self.run_path('.' + run_id + '.tmp')
+        shutil.rmtree(temporary, ignore_errors=True)
+        os.makedirs(temporary)
+        with PROFILER.span('store', run=run_id), open(os.path.join(temporary, 'outcomes.bin'), 'wb') as f:
+
+            def write(array):
+                offset = f.tell()
+                padding = -offset % 64
+                f.write(b'\0' * padding)
+                f.write(np.ascontiguousarray(array).tobytes())
+                return offset + padding
+
+            def add(kind, label, frame, column, msg, outcome):
+                entry = {'kind': kind, 'label': label, 'frame': frame, 'column': column, 'status': msg}
+                if msg != 'Validated':
+                    # Only validated outcomes are stored (a slot may hold the outcome of an earlier rule)
+                    outcome = None
+                if isinstance(outcome, ValidationResult):
+                    entry.update(type='result', length=outcome.length, true_count=outcome.true_count,
+                                 na_count=outcome.na_count, bits=[write(outcome.bits), outcome.bits.nbytes])
+                    if outcome.na_bits is not None:
+                        entry['na_bits'] = [write(outcome.na_bits), outcome.na_bits.nbytes]
+                elif isinstance(outcome, ValidationCounts):
+                    entry.update(type='counts', length=outcome.length, true_count=outcome.true_count,
+                                 na_count=outcome.na_count)
+                    if outcome.failures is not None:
+                        failures = outcome.failures.astype(np.int64)
+                        entry['failures'] = [write(failures), len(failures)]
+                index['entries'].append(entry)
+
+            for frame in frames:
+                rules = source.status_rules.get(frame, {})
+                for col, msg in source.status.get(frame, {}).items():
+                    add('rule', rules.get(col), frame, str(col), msg, source.results[frame].get(col))
+            for label, status in source.rule_status.items():
+                for frame, columns in status.items():
+                    for col, msg in columns.items():
+                        add('plan', label, frame, str(col), msg, source.rule_results[label][frame].get(col))
+            for label, status in source.dataset_status.items():
+                for frame, msg in status.items():
+                    add('dataset', label, frame, None, msg, source.dataset_results.get(label, {}).get(frame))
+        # The index is written last and the run directory renamed into place: partial runs are never visible
+        with open(os.path.join(temporary, 'index.json'), 'w') as f:
+            json.dump(index, f, default=str)
+        os.rename(temporary, self.run_path(run_id))
+        return run_id
+
+    def index(self, run_id):
+        with open(self.run_path(run_id, 'index.json')) as f:
+            return json.load(f)
+
+    def runs(self):
+        """ The stored runs (identifier, creation time, source type, number of outcomes and metadata)
+
+        """
+        rows = []
+        for run_id in sorted(os.listdir(self.directory)):
+            if run_id.startswith('.') or not os.path.exists(self.run_path(run_id, 'index.json')):
+                continue
+            index = self.index(run_id)
+            rows.append({'run_id': run_id, 'created': pd.Timestamp(index['created'], unit='s'),
+                         'source': index['source'], 'outcomes': len(index['entries']), 'metadata': index['metadata']})
+        return pd.DataFrame(rows, columns=['run_id', 'created', 'source', 'outcomes', 'metadata'])
+
+    def open(self, run_id):
+        """ Open a stored run as a StoredRun_ (a read-only data source of outcomes)
+
+        """
+        return StoredRun(self, run_id)
+
+    def delete(self, run_id):
+        shutil.rmtree(self.run_path(run_id))
+
+
+class StoredRun(DataSource):
+    """ The _`StoredRun` object is a stored run of a ResultStore_ presented as a data source without data:
+    status / results (and the plan and dataset outcomes) are rebuilt from the run index, with the outcomes
+    over memory-mapped (read-only) buffers, so validation_summary, failing row queries and visualizations
+    work as on the original source. The class inherits from DataSource_
+
+    """
+
+    def __init__(self, store, run_id):
+        """ Open a stored run
+
+        :param store: the ResultStore_
+        :param run_id: the run identifier
+        """
+        DataSource.__init__(self)
+        self.run_id = run_id
+        index = store.index(run_id)
+        self.metadata = index['metadata']
+        self.frame_no = index['frame_no']
+        self.frame_names = index['frame_names']
+        for frame, columns in index['col_names'].items():
+            self.col_names[int(frame)] = columns
+        path = store.run_path(run_id, 'outcomes.bin')
+        self.data = np.memmap(path, dtype=np.uint8, mode='r') if os.path.getsize(path) else np.zeros(0, np.uint8)
+        for frame in range(self.frame_no):
+            self.col_names.setdefault(frame, [])
+            self.status[frame] = {}
+            self.results[frame] = {}
+        for entry in index['entries']:
+            outcome = self.outcome(entry)
+            frame, col, label, msg = entry['frame'], entry['column'], entry['label'], entry['status']
+            if entry['kind'] == 'rule':
+                status, results = self.status[frame], self.results[frame]
+                self.set_status_rule(frame, [col], label)
+            elif entry['kind'] == 'plan':
+                status = self.rule_status.setdefault(label, {}).setdefault(frame, {})
+                results = self.rule_results.setdefault(label, {}).setdefault(frame, {})
+            else:
+                self.dataset_status.setdefault(label, {})[frame] = msg
+                if outcome is not None:
+                    self.dataset_results.setdefault(label, {})[frame] = outcome
+                continue
+            status[col] = msg
+            if outcome is not None:
+                results[col] = outcome
+                self.failure_index.add(frame, col, label, outcome)
+
+    def outcome(self, entry):
+        """ Rebuild the ValidationResult_ (over the mapped bits) or ValidationCounts_ of an index entry
+
+        """
+        if entry.get('type') == 'result':
+            offset, nbytes = entry['bits']
+            na_bits = None
+            if 'na_bits' in entry:
+                na_offset, na_nbytes = entry['na_bits']
+                na_bits = self.data[na_offset:na_offset + na_nbytes]
+            return restore_result(self.data[offset:offset + nbytes], na_bits, entry['length'], entry['true_count'],
+                                  entry['na_count'])
+        elif entry.get('type') == 'counts':
+            failures = None
+            if 'failures' in entry:
+                offset, count = entry['failures']
+                failures = np.frombuffer(self.data, dtype=np.int64, count=count, offset=offset)
+            counts = ValidationCounts(keep_failures=failures is not None)
+            counts.add_counts(entry['length'], entry['true_count'], entry['na_count'], failures)
+            return counts
+        return None
+
+
+#
+#  Streaming xlsx reader
+#
+
+XLSX_NAMESPACE = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+XLSX_RELATIONSHIPS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+
+
+def column_index(reference):
+    """ The (0-based) column index of a cell reference (e.g. 'AB12' -> 27)
+
+    """
+    index = 0
+    for character in reference:
+        if character.isdigit():
+            break
+        index = index * 26 + ord(character) - 64
+    return index - 1
+
+
+def excel_usecols(usecols):
+    """ Convert an Excel style column selection (e.g. 'A:C,E') to column indexes (other selections are unchanged)
+
+    """
+    if not isinstance(usecols, str):
+        return usecols
+    indexes = []
+    for part in usecols.replace(' ', '').upper().split(','):
+        first, _, last = part.partition(':')
+        indexes.extend(range(column_index(first), column_index(last or first) + 1))
+    return indexes
+
+
+class XLSXReader(object):
+    """ The _`XLSXReader` object reads the sheets of an xlsx workbook by streaming the sheet XML
+    (expat callbacks, no element tree) instead of building the openpyxl cell model. Cells are converted as
+    pandas.read_excel converts them (openpyxl number / date semantics, errors and empty cells as missing values),
+    rows above the header row are skipped without conversion and the rows are turned into typed column buffers
+    (DataFrames) chunk by chunk
+
+    .. note:: Column types are inferred per chunk, so a column mixing types across chunks may differ in
+        the representation of its numbers (e.g. 1.0 instead of 1) from a whole sheet read. The columns are
+        fixed by the header row and the rows of the first chunk (unnamed columns as 'Unnamed: N'): cells of later
+        rows beyond the last column are dropped with a warning
+
+    """
+
+    def __init__(self, filename):
+        """ Open a workbook and read its sheet list, shared strings and date styles
+
+        :param filename: the xlsx filename
+        """
+        from lxml import etree
+        from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format, is_timedelta_format
+        from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900
+        self.filename = filename
+        with zipfile.ZipFile(filename) as archive:
+            workbook = etree.fromstring(archive.read('xl/workbook.xml'))
+            relationships = etree.fromstring(archive.read('xl/_rels/workbook.xml.rels'))
+            targets = {rel.get('Id'): rel.get('Target') for rel in relationships}
+            self.sheets = OrderedDict()
+            for sheet in workbook.iter(XLSX_NAMESPACE + 'sheet'):
+                target = targets[sheet.get(XLSX_RELATIONSHIPS + 'id')]
+                self.sheets[sheet.get('name')] = target.lstrip('/') if target.startswith('/') else 'xl/' + target
+            properties = workbook.find(XLSX_NAMESPACE + 'workbookPr')
+            date1904 = properties is not None and properties.get('date1904') in ('1', 'true')
+            self.epoch = CALENDAR_MAC_1904 if date1904 else CALENDAR_WINDOWS_1900
+
+            self.shared_strings = []
+            if 'xl/sharedStrings.xml' in archive.namelist():
+                with archive.open('xl/sharedStrings.xml') as f:
+                    for event, element in etree.iterparse(f, tag=XLSX_NAMESPACE + 'si'):
+                        # Plain text or rich text runs (phonetic runs are ignored)
+                        text = element.find(XLSX_NAMESPACE + 't')
+                        if text is not None:
+                            self.shared_strings.append(text.text or '')
+                        else:
+                            self.shared_strings.append(''.join(
+                                run.text or '' for run in element.iterfind(XLSX_NAMESPACE + 'r/' + XLSX_NAMESPACE + 't')))
+                        element.clear(keep_tail=True)
+
+            self.date_styles = set()
+            self.timedelta_styles = set()
+            if 'xl/styles.xml' in archive.namelist():
+                styles = etree.fromstring(archive.read('xl/styles.xml'))
+                formats = dict(BUILTIN_FORMATS)
+                for number_format in styles.iter(XLSX_NAMESPACE + 'numFmt'):
+                    formats[int(number_format.get('numFmtId'))] = number_format.get('formatCode')
+                cell_formats = styles.find(XLSX_NAMESPACE + 'cellXfs')
+                for style, xf in enumerate(cell_formats if cell_formats is not None else []):
+                    code = formats.get(int(xf.get('numFmtId', 0)))
+                    if code is not None and is_date_format(code):
+                        self.date_styles.add(style)
+                        if is_timedelta_format(code):
+                            self.timedelta_styles.add(style)
+
+    @property
+    def sheet_names(self):
+        return list(self.sheets)
+
+    def sheet_path(self, sheet_name):
+        if isinstance(sheet_name, int):
+            sheet_name = self.sheet_names[sheet_name]
+        return self.sheets[sheet_name]
+
+    def convert(self, data_type, style, value):
+        """ Convert the raw text of a cell to its value as seen by pandas.read_excel ('' for an empty cell)
+
+        :param data_type: the cell type attribute (t)
+        :param style: the cell style attribute (s)
+        :param value: the text of the cell value (or of the inline string)
+        """
+        from openpyxl.utils.datetime import from_excel, from_ISO8601
+        if not value:
+            return ''
+        if data_type == 'n':
+            value = float(value) if '.' in value or 'E' in value or 'e' in value else int(value)
+            style = int(style or 0)
+            if style in self.date_styles:
+                try:
+                    return from_excel(value, self.epoch, timedelta=style in self.timedelta_styles)
+                except (OverflowError, ValueError):
+                    return np.nan
+            integer = int(value)
+            return integer if integer == value else value
+        elif data_type == 's':
+            return self.shared_strings[int(value)]
+        elif data_type == 'b':
+            return bool(int(value))
+        elif data_type == 'e':
+            return np.nan
+        elif data_type == 'd':
+            return from_ISO8601(value)
+        return value
+
+    def rows(self, sheet_name, skip=0, blocksize=1 << 16):
+        """ Iterate over the rows of a sheet (from the first row, including empty rows) as (row index, values).
+        The sheet XML is parsed incrementally (expat callbacks, no element tree), so only the rows of the
+        current block are held in memory. The values of rows above skip are not converted ('' placeholders,
+        so only their width is known)
+
+        :param sheet_name: the sheet name (or index)
+        :param skip: the number of leading rows that are not converted
+        :param blocksize: the number of (compressed stream) bytes parsed at a time
+        """
+        from xml.parsers import expat
+        ready = []
+        columns = {}
+        # The row being parsed: [row index, values, next row index], the cell being parsed and its text
+        row = [0, None, 0]
+        cell = [None, None, None, 0]
+        text = []
+        collect = [False, 0]
+
+        def start(name, attributes):
+            name = name.rpartition(' ')[2]
+            if name == 'c':
+                reference = attributes.get('r')
+                if reference is None:
+                    column = cell[3]
+                else:
+                    letters = reference.rstrip('0123456789')
+                    column = columns.get(letters)
+                    if column is None:
+                        column = columns[letters] = column_index(letters)
+                cell[0] = column
+                cell[1] = attributes.get('t', 'n')
+                cell[2] = attributes.get('s')
+                text.clear()
+            elif name == 'v' or (name == 't' and collect[1] == 0):
+                collect[0] = True
+            elif name == 'rPh':
+                # Phonetic runs are not part of the cell text
+                collect[1] += 1
+            elif name == 'row':
+                index = attributes.get('r')
+                row[0] = int(index) - 1 if index is not None else row[2]
+                row[1] = []
+                cell[3] = 0
+
+        def end(name):
+            name = name.rpartition(' ')[2]
+            if name == 'c':
+                values = row[1]
+                column = cell[0]
+                cell[3] = column + 1
+                if not text:
+                    return
+                if row[0] < skip:
+                    # Only the width of the skipped rows matters
+                    values.extend([''] * (column + 1 - len(values)))
+                    return
+                value = ''.join(text)
+                data_type = cell[1]
+                if data_type == 'n' and cell[2] is None and value:
+                    # Plain numbers (the bulk of most sheets)
+                    if '.' in value or 'E' in value or 'e' in value:
+                        value = float(value)
+                        if value.is_integer():
+                            value = int(value)
+                    else:
+                        value = int(value)
+                else:
+                    value = self.convert(data_type if data_type != 'inlineStr' else 'str', cell[2], value)
+                    if isinstance(value, str) and value == '':
+                        return
+                values.extend([''] * (column - len(values)))
+                values.append(value)
+            elif name == 'v' or name == 't':
+                collect[0] = False
+            elif name == 'rPh':
+                collect[1] -= 1
+            elif name == 'row':
+                index = row[0]
+                while row[2] < index:
+                    ready.append((row[2], []))
+                    row[2] += 1
+                ready.append((index, row[1]))
+                row[2] = index + 1
+
+        def data(content):
+            if collect[0]:
+                text.append(content)
+
+        parser = expat.ParserCreate(namespace_separator=' ')
+        parser.buffer_text = True
+        parser.StartElementHandler = start
+        parser.EndElementHandler = end
+        parser.CharacterDataHandler = data
+        with zipfile.ZipFile(self.filename) as archive, archive.open(self.sheet_path(sheet_name)) as f:
+            while True:
+                block = f.read(blocksize)
+                parser.Parse(block, not block)
+                yield from ready
+                ready.clear()
+                if not block:
+                    break
+
+    def chunks(self, sheet_name=0, header_row=0, chunksize=100000, usecols=None, dtype_backend=None):
+        """ Iterate over the rows below the header row in chunks (DataFrames with consecutive RangeIndex)
+
+        :param sheet_name: the sheet name (or index)
+        :param header_row: the row with the column names (rows above it are skipped)
+        :param chunksize: the number of rows per chunk
+        :param usecols: the column selection (as in pandas.read_excel)
+        :param dtype_backend: the pandas dtype backend (e.g. 'pyarrow')
+        """
+        from pandas.io.parsers import TextParser
+        usecols = excel_usecols(usecols)
+        width = 0
+        header = None
+        names = None
+        buffer = []
+        blank = 0
+        offset = 0
+        # The column width is taken from the rows up to the end of the first chunk
+        last = header_row + chunksize
+        dropped = False
+
+        def parse(rows, names, offset):
+            rows = [row + [''] * (len(names) - len(row)) for row in rows]
+            with PROFILER.span('coercion', stage='columns', cells=len(rows) * len(names)):
+                df = TextParser(rows, names=names, header=None, skip_blank_lines=False, usecols=usecols,
+                                **backend_args(dtype_backend)).read()
+            df.index = pd.RangeIndex(offset, offset + len(df))
+            return df
+
+        for index, values in self.rows(sheet_name, skip=header_row):
+            if index <= last:
+                width = max(width, len(values))
+            elif names is None:
+                names = self.header_names(header or [], width)
+            if index < header_row:
+                continue
+            if index == header_row:
+                header = values
+                continue
+            if not values:
+                # Trailing empty rows are dropped, so empty rows are kept back until a row with data follows
+                blank += 1
+                continue
+            if names is not None and len(values) > len(names):
+                if not dropped:
+                    warnings.warn("Sheet {!r}: cells beyond the {} columns of the first chunk are ignored (from row "
+                                  "{})".format(sheet_name, len(names), index + 1))
+                    dropped = True
+                values = values[:len(names)]
+            buffer.extend([[]] * blank)
+            blank = 0
+            buffer.append(values)
+            if len(buffer) >= chunksize:
+                if names is None:
+                    names = self.header_names(header or [], width)
+                yield parse(buffer, names, offset)
+                offset += len(buffer)
+                buffer = []
+        if names is None:
+            names = self.header_names(header or [], width)
+        if buffer or offset == 0:
+            yield parse(buffer, names, offset)
+
+    @staticmethod
+    def header_names(header, width):
+        """ The column names pandas derives from a header row padded to the sheet width
+
+        """
+        from pandas.io.parsers import TextParser
+        if width == 0:
+            return []
+        header = list(header) + [''] * (width - len(header))
+        return list(TextParser([header], header=0, skip_blank_lines=False).read().columns)
+
+    def columns(self, sheet_name=0, header_row=0, usecols=None, chunksize=100000):
+        """ The column names of a sheet, as given by chunks with the same chunksize (only the header row is
+        converted; the rows of the first chunk are scanned for their width)
+
+        """
+        from pandas.io.parsers import TextParser
+        header = []
+        width = 0
+        for index, values in self.rows(sheet_name, skip=header_row):
+            width = max(width, len(values))
+            if index == header_row:
+                header = values
+                break
+        for index, values in self.rows(sheet_name, skip=header_row + chunksize + 1):
+            if index > header_row + chunksize:
+                break
+            width = max(width, len(values))
+        names = self.header_names(header, width)
+        return list(TextParser([], names=names, header=None, usecols=excel_usecols(usecols)).read().columns)
+
+    def read(self, sheet_name=0, header_row=0, usecols=None, dtype_backend=None, chunksize=100000):
+        """ Read a sheet into a DataFrame (the rows are converted chunk by chunk)
+
+        """
+        chunks = list(self.chunks(sheet_name, header_row, chunksize, usecols, dtype_backend))
+        if len(chunks) == 1:
+            return chunks[0]
+        return pd.concat(chunks)
+
+
+#
+#  Excel sheet Datasource
+#
+
+class XLSDataSource(DataSource):
+    """ The _`XLSDataSource` object implements an excel sheet data source.
+    It treats each excel sheet as a distinct table
+    The class inherits from DataSource_
+
+
+    """
+
+    def __init__(self, filename, header_row, sheets=None, usecols=None, workers=1, cache=None, dtype_backend=None,
+                 streaming=False):
+        """ Create a new xls data source. Sheets are only parsed when a frame is first accessed
+
+        :param filename: the excel filename
+        :type header_row: the row with the column names (must be the same for all sheets)
+        :param sheets: restrict the data source to the given sheet names (all sheets if None)
+        :param usecols: restrict loading to the given columns (passed to pandas.read_excel)
+        :param workers: the number of processes used to parse and validate sheets in parallel
+        :param cache: a FrameCache_ (or a cache directory) storing parsed sheets across runs
+        :param dtype_backend: 'pyarrow' to hold the columns as Arrow arrays (pandas ArrowDtype). Note that
+            pandas converts mixed type columns (e.g. times and numbers) to strings with this backend
+        :param streaming: parse xlsx sheets with the streaming XLSXReader_ instead of openpyxl (faster, lower memory)
+
+        :Example:
+
+        .. code-block:: python
+
+            filename = "../datasets/EBA_Sample.xlsx"
+            header_row = 2
+            MySource = XLSDataSource(filename, header_row)
+
+        """
+        DataSource.__init__(self)
+        self.filename = filename
+        self.workers = workers
+        self._xls = None
+        self.streaming = streaming
+        # The header row (values start immediately below)
+        self.header_row = header_row
+        self.usecols = usecols
+        self.dtype_backend = dtype_backend
+
+        # Parsed sheets are cached by file content (a callable column selection cannot be keyed)
+        if isinstance(cache, str):
+            cache = FrameCache(cache)
+        self.cache = cache if not callable(usecols) else None
+        self.cache_key = None
+        sheet_names = None
+        if self.cache is not None:
+            # The options that change the parsed frames (the streaming reader infers the column types per chunk
+            # and may parse a sheet differently from openpyxl)
+            options = (header_row, usecols) if dtype_backend is None else (header_row, usecols, dtype_backend)
+            if streaming:
+                options += ('streaming',)
+            self.cache_key = self.cache.make_key(FrameCache.file_hash(filename), *options)
+            meta = self.cache.get_meta(self.cache_key)
+            if meta is not None:
+                sheet_names = meta['sheet_names']
+        if sheet_names is None:
+            sheet_names = self.xls.sheet_names
+            if self.cache is not None:
+                self.cache.put_meta(self.cache_key, {'filename': os.path.basename(str(filename)),
+                                                     'sheet_names': sheet_names})
+
+        # Frame names are the sheet names
+        if sheets is None:
+            self.frame_names = sheet_names
+        else:
+            missing = [sheet for sheet in sheets if sheet not in sheet_names]
+            if missing:
+                raise ValueError("Sheets not found in workbook: " + str(missing))
+            self.frame_names = list(sheets)
+        # Number of sheets / frames
+        self.frame_no = len(self.frame_names)
+
+        # The dataframes (one per sheet) are created on first access
+        frames = range(self.frame_no)
+        self.df = LazyFrames(frames, self.read_frame)
+        self.col_names = LazyFrames(frames, lambda frame: list(self.df[frame]))
+        self.col_length = LazyFrames(frames, lambda frame: self.df[frame].shape[0])
+        for frame in frames:
+            self.results[frame] = {}
+            self.status[frame] = {}
+
+    @property
+    def xls(self):
+        """ The opened excel file (only opened when a sheet actually needs to be parsed)
+
+        """
+        if self._xls is None:
+            with PROFILER.span('open', filename=str(self.filename)):
+                self._xls = XLSXReader(self.filename) if self.streaming else pd.ExcelFile(self.filename,
+                                                                                          engine="openpyxl")
+        return self._xls
+
+    def is_cached(self, frame):
+        return self.cache is not None and os.path.exists(
+            self.cache.entry_path(self.cache_key, self.frame_names[frame]) + '.idx')
+
+    def read_frame(self, frame):
+        """ Parse a sheet of the workbook into a dataframe (or load it from the cache)
+
+        :param frame: the frame index
+        :return: the dataframe
+        """
+        with PROFILER.span('load', frame=frame) as span:
+            if self.cache is not None:
+                df = self.cache.get(self.cache_key, self.frame_names[frame])
+                if df is not None:
+                    span.set(cache='hit', cells=df.size)
+                    return df
+                span.set(cache='miss')
+            with PROFILER.span('parse'):
+                if self.streaming:
+                    df = self.xls.read(self.frame_names[frame], self.header_row, self.usecols, self.dtype_backend)
+                else:
+                    df = pd.read_excel(self.xls, self.frame_names[frame], header=self.header_row,
+                                       usecols=self.usecols, **backend_args(self.dtype_backend))
+            span.set(cells=df.size)
+            if self.cache is not None:
+                self.cache.put(self.cache_key, self.frame_names[frame], df)
+            return df
+
+    def load(self):
+        """ Materialize all frames (in parallel when more than one worker is configured)
+
+        """
+        self.run_parallel(None, lambda frame, outcomes, timings: None)
+        for frame in range(self.frame_no):
+            self.df[frame]
+
+    def run_parallel(self, validator, merge):
+        """ Parse the sheets that are not loaded yet and evaluate a validator (a Rule_ or a ValidationPlan_)
+        on them in a pool of worker processes. Parsed frames and outcomes are merged back in frame order.
+        Frames that are already loaded are left to the caller
+
+        :param validator: the Rule_ or ValidationPlan_ to evaluate (None to only parse)
+        :param merge: function (frame, outcomes, timings) storing the outcomes of a frame
+        :return: the list of frames that were processed by the pool
+        """
+        pending = [frame for frame in range(self.frame_no)
+                   if not self.df.is_loaded(frame) and not self.is_cached(frame)]
+        if self.workers <= 1 or len(pending) < 2:
+            return []
+        tasks = [(self.filename, self.frame_names[frame], self.header_row, self.usecols, validator, self.dtype_backend,
+                  self.streaming) for frame in pending]
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(pending))) as executor:
+            for frame, (df, outcomes, timings) in zip(pending, executor.map(validate_sheet, *zip(*tasks))):
+                self.df[frame] = df
+                if self.cache is not None:
+                    self.cache.put(self.cache_key, self.frame_names[frame], df)
+                merge(frame, outcomes, timings)
+        return pending
+
+    def validate_all(self, Validation_Rule):
+        """ Validate all columns of all frames against the activated validation rule.
+        With more than one worker, the sheets are parsed and validated in parallel processes
+
+        :param Validation_Rule:
+        :return:
+        """
+
+        def merge(frame, outcomes, timings):
+            self.frame_started(frame)
+            for col, (msg, validation_list) in outcomes.items():
+                self.status[frame][col] = msg
+                if validation_list:
+                    self.results[frame][col] = validation_list
+                self.set_status_rule(frame, [col], Validation_Rule.active_rule_name)
+                self.record(frame, col, Validation_Rule.active_rule_name, msg, validation_list, timings[col])
+
+        done = self.run_parallel(Validation_Rule, merge)
+        for frame in range(self.frame_no):
+            if frame not in done:
+                self.frame_started(frame)
+                self.validate_frame(Validation_Rule, frame)
+
+    def validate_plan(self, Validation_Plan, frame=None):
+        """ Validate frames against all the rules of a validation plan.
+        With more than one worker, the sheets are parsed and validated in parallel processes
+
+        .. note:: In parallel mode the plan is sent to the worker processes so column selectors must be picklable
+
+        :param Validation_Plan: the ValidationPlan_ to evaluate
+        :param frame: the frame to validate (all frames if None)
+        :return:
+        """
+        if frame is not None:
+            return DataSource.validate_plan(self, Validation_Plan, frame)
+        labels = Validation_Plan.labels()
+        done = self.run_parallel(Validation_Plan, lambda frame, outcomes, timings: self.store_plan_outcomes(
+            labels, frame, outcomes, timings))
+        for frame in range(self.frame_no):
+            if frame not in done:
+                DataSource.validate_plan(self, Validation_Plan, frame)
+
+    # def validate_frame(self, Validation_Rule):
+    #     for frame in range(self.frame_no):
+    #
+    #         for col in self.col_names[frame]:
+    #             series = self.df[frame][col]
+    #             self.results[self.sheet_names[frame]][col] = Validation_Rule.apply(series)
+
+
+def backend_args(dtype_backend):
+    """ The pandas reader arguments selecting a dtype backend (none for the default numpy backend)
+
+    """
+    return {} if dtype_backend is None else {'dtype_backend': dtype_backend}
+
+
+def validate_sheet(filename, sheet_name, header_row, usecols, validator, dtype_backend=None, streaming=False):
+    """ Parse an excel sheet and evaluate a validator on all its columns.
+    This is the unit of work of the parallel XLSDataSource_ mode (it runs in a worker process)
+
+    :param filename: the excel filename
+    :param sheet_name: the sheet to parse
+    :param header_row: the row with the column names
+    :param usecols: the column selection (passed to pandas.read_excel)
+    :param validator: a Rule_ (outcomes per column), a ValidationPlan_ (outcomes per column and label) or None
+    :param dtype_backend: the pandas dtype backend (e.g. 'pyarrow')
+    :param streaming: parse the sheet with the XLSXReader_
+    :return: (dataframe, outcomes, timings)
+    """
+    if streaming:
+        df = XLSXReader(filename).read(sheet_name, header_row, usecols, dtype_backend)
+    else:
+        df = pd.read_excel(filename, sheet_name, header=header_row, usecols=usecols, engine="openpyxl",
+                           **backend_args(dtype_backend))
+    outcomes = {}
+    timings = {}
+    if validator is None:
+        return df, outcomes, timings
+    for col in df.columns:
+        if isinstance(validator, ValidationPlan):
+            timings[col] = {}
+            outcomes[col] = validator.evaluate(df[col], col, timings[col])
+        else:
+            start = time.perf_counter()
+            outcomes[col] = evaluate_rule(validator.active_rule, validator.active_rule_args, ColumnProfile(df[col]),
+                                          validator.vectorized, validator.cache)
+            timings[col] = time.perf_counter() - start
+    return df, outcomes, timings
+
+
+class WikiDataSource(DataSource):
+    """ The _`WWWDataSource` object implements a wikitable data source
+    The class inherits from DataSource_
+
+    """
+
+    def __init__(self, url):
+        """ Create a new web data source
+
+        :param url: the webpage hosting the wikitable (must be accessible)
+
+        .. note:: The initialization in itself does not validate if the web page is accessible
+
+        .. note:: Because wikitables (and html tables more generally) do not store type metadata the
+        assumption is that there is a specific row in the table (second row) that stores type information
+        in pandas format. During initialization, there is a validatin step
+
+        :Example:
+
+        .. code-block:: python
+
+            url = "https://en.wikipedia.org/wiki/List_of_data_breaches"
+            MySource = WWWDataSource(url)
+
+        """
+        DataSource.__init__(self)
+        # TODO Current implementation assumes there is only single table per wiki page (index 0)
+        # Read the wikitable from the URL and create the dataframe
+        with PROFILER.span('load', url=url):
+            self.df[0] = pd.read_html(url, attrs={"class": "wikitable"}, header=0)[0]
+        self.col_datatypes = list(self.df[0].iloc[1])
+
+        self.df[0].drop(self.df[0].index[[0, 1]], inplace=True)
+        self.col_names[0] = list(self.df[0])
+
+        # self.df[0].drop(self.df[0].index[1])
+        # self.df[0].reindex()
+
+        # self.df[0].drop(self.df[0].index[1])
+        # self.df[0].reindex()
+
+        # c = 0
+        # for col in self.df[0].columns:
+        #     self.df[0][col] = self.df[0][col].astype(self.col_datatypes[c])
+        #     c +=1
+
+        # pd.to_numeric(self.df[0])
+
+        # Determine column length
+        self.col_length[0] = self.df[0].count
 
         # Initialize status / results
         self.status[0] = {}
@@ -238,16 +1799,2433 @@ class WikiDataSource(DataSource):
         self.results[0] = {}
 
 
+#
+#  Web page cache
+#
+
+class PageCache(object):
+    """ The _`PageCache` object stores fetched web pages on disk: the raw HTML, the validators of the
+    response (ETag / Last-Modified) used to revalidate the page and the tables parsed from it,
+    so that unchanged pages are neither downloaded nor parsed again
+
+    """
+
+    def __init__(self, directory):
+        """ Create (or open) a page cache
+
+        :param directory: the cache directory
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def entry_path(self, url):
+        return os.path.join(self.directory, hashlib.sha1(url.encode('utf-8')).hexdigest())
+
+    def get_meta(self, url):
+        """ The cached response metadata of a page (None if the page is not cached)
+
+        """
+        try:
+            with open(self.entry_path(url) + '.json') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def get_html(self, url):
+        with open(self.entry_path(url) + '.html', encoding='utf-8') as f:
+            return f.read()
+
+    def get_tables(self, url):
+        """ The tables parsed from a cached page (None if they are not cached)
+
+        """
+        try:
+            with open(self.entry_path(url) + '.pkl', 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+    def put(self, url, html, tables, etag=None, last_modified=None):
+        path = self.entry_path(url)
+        with open(path + '.html', 'w', encoding='utf-8') as f:
+            f.write(html)
+        with open(path + '.pkl', 'wb') as f:
+            pickle.dump(tables, f, protocol=pickle.HIGHEST_PROTOCOL)
+        # The metadata is written last: it marks the entry as complete
+        with open(path + '.json', 'w') as f:
+            json.dump({'url': url, 'etag': etag, 'last_modified': last_modified, 'fetched': time.time()}, f)
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.makedirs(self.directory, exist_ok=True)
+
+
+#
+#  Web (multi page, multi table) Datasource
+#
+
+class WebDataSource(DataSource):
+    """ The _`WebDataSource` object implements a data source of the html tables (by default the wikitables)
+    of many web pages. Pages are fetched concurrently (asyncio, over a pool of reused HTTP connections) and
+    every matching table of a page becomes a distinct frame. With a PageCache_ pages are revalidated with
+    their ETag / Last-Modified validators and the tables of unchanged pages are taken from the cache.
+    Pages that cannot be fetched or parsed are recorded in errors instead of failing the whole source.
+    The class inherits from DataSource_
+
+    .. note:: Requires aiohttp (and lxml for parsing)
+
+    """
+
+    def __init__(self, urls, cache=None, concurrency=16, timeout=30, attrs=None, fetch=True):
+        """ Create a new web data source
+
+        :param urls: the list of web pages hosting the tables
+        :param cache: a PageCache_ (or a cache directory) keeping the pages across runs
+        :param concurrency: the maximum number of simultaneous connections
+        :param timeout: the total timeout of each request (seconds)
+        :param attrs: the html attributes identifying the tables (default: the wikitables)
+        :param fetch: fetch the pages on initialization (otherwise call refresh, or await refresh_async)
+
+        :Example:
+
+        .. code-block:: python
+
+            urls = ["https://en.wikipedia.org/wiki/List_of_data_breaches",
+                    "https://en.wikipedia.org/wiki/List_of_stock_exchanges"]
+            MySource = WebDataSource(urls, cache='page_cache')
+            print(MySource.frame_names)
+
+        """
+        DataSource.__init__(self)
+        self.urls = list(urls)
+        if isinstance(cache, str):
+            cache = PageCache(cache)
+        self.cache = cache
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.attrs = {"class": "wikitable"} if attrs is None else attrs
+        self.tables = {}
+        self.errors = {}
+        self.fetch_status = {}
+        self.frame_names = []
+        self.frame_no = 0
+        if fetch:
+            self.refresh()
+
+    def refresh(self):
+        """ Fetch (or revalidate) all the pages and rebuild the frames
+
+        """
+        import asyncio
+        with PROFILER.span('load', pages=len(self.urls)):
+            asyncio.run(self.refresh_async())
+
+    async def refresh_async(self):
+        """ Fetch (or revalidate) all the pages and rebuild the frames (from a running event loop)
+
+        """
+        import asyncio
+        import aiohttp
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            await asyncio.gather(*(self.fetch(session, url) for url in self.urls))
+        self.build_frames()
+
+    async def fetch(self, session, url):
+        """ Fetch a page (conditionally when it is cached) and parse its tables
+
+        """
+        import asyncio
+        import aiohttp
+        meta = self.cache.get_meta(url) if self.cache is not None else None
+        headers = {}
+        if meta is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+        try:
+            async with session.get(url, headers=headers) as response:
+                if response.status == 304:
+                    tables = self.cache.get_tables(url)
+                    if tables is None:
+                        tables = self.parse(url, self.cache.get_html(url))
+                    self.tables[url] = tables
+                    self.fetch_status[url] = 'not modified'
+                    return
+                response.raise_for_status()
+                html = await response.text()
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+            self.tables[url] = self.parse(url, html)
+            self.fetch_status[url] = 'fetched'
+            self.errors.pop(url, None)
+            if self.cache is not None:
+                self.cache.put(url, html, self.tables[url], etag, last_modified)
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError, ValueError) as error:
+            self.tables[url] = []
+            self.fetch_status[url] = 'error'
+            self.errors[url] = repr(error)
+
+    def parse(self, url, html):
+        """ Parse all the matching tables of a page (an empty list if there are none)
+
+        """
+        with PROFILER.span('parse', url=url, bytes=len(html)):
+            try:
+                return pd.read_html(io.StringIO(html), attrs=self.attrs, header=0)
+            except ValueError:
+                # No matching table
+                return []
+
+    def build_frames(self):
+        """ Make one frame per table, in the order of the urls and of the tables within each page
+
+        """
+        self.df = {}
+        self.frame_names = []
+        for url in self.urls:
+            for index, table in enumerate(self.tables.get(url, [])):
+                frame = len(self.frame_names)
+                self.frame_names.append('{}#{}'.format(url, index))
+                self.df[frame] = table
+        self.frame_no = len(self.frame_names)
+        self.col_names = {frame: list(df) for frame, df in self.df.items()}
+        self.col_length = {frame: len(df) for frame, df in self.df.items()}
+        self.col_datatypes = {frame: df.dtypes for frame, df in self.df.items()}
+        self.status = {frame: {} for frame in self.df}
+        self.results = {frame: {} for frame in self.df}
+
+
+#
+# Streaming Data Source
+#
+
+def is_numeric_dtype(dtype):
+    """ Whether a column dtype holds real numbers or booleans (numpy, masked and Arrow dtypes)
+
+    """
+    return (pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_bool_dtype(dtype)) and \
+        not pd.api.types.is_complex_dtype(dtype)
+
+
+class StreamingStatistics(object):
+    """ The _`StreamingStatistics` object accumulates per column summary statistics
+    (count, null count, mean, standard deviation, min, max) over successive chunks of a table.
+    Means and variances are merged using the parallel (Chan et al.) update so a single pass suffices
+
+    """
+
+    def __init__(self):
+        self.row_count = 0
+        self.columns = {}
+
+    def update(self, chunk):
+        """ Add a chunk (a pandas DataFrame) to the statistics
+
+        """
+        self.row_count += len(chunk)
+        for column in chunk.columns:
+            series = chunk[column]
+            stats = self.columns.setdefault(column, {'count': 0, 'nulls': 0, 'numeric': True, 'mean': 0.0,
+                                                     'm2': 0.0, 'min': np.nan, 'max': np.nan})
+            values = series.dropna()
+            n = len(values)
+            stats['nulls'] += len(series) - n
+            if stats['numeric'] and not is_numeric_dtype(series.dtype):
+                # Statistics are only kept for columns that are numeric in every chunk
+                stats['numeric'] = n == 0
+            if stats['numeric'] and n > 0:
+                x = values.to_numpy(dtype=np.float64, na_value=np.nan)
+                mean = x.mean()
+                m2 = ((x - mean) ** 2).sum()
+                total = stats['count'] + n
+                delta = mean - stats['mean']
+                stats['mean'] += delta * n / total
+                stats['m2'] += m2 + delta ** 2 * stats['count'] * n / total
+                stats['min'] = np.fmin(stats['min'], x.min())
+                stats['max'] = np.fmax(stats['max'], x.max())
+            stats['count'] += n
+
+    def merge(self, other):
+        """ Add the statistics accumulated by another object (e.g. over a partition of the table)
+
+        """
+        self.row_count += other.row_count
+        for column, theirs in other.columns.items():
+            stats = self.columns.get(column)
+            if stats is None:
+                self.columns[column] = dict(theirs)
+                continue
+            if stats['numeric'] and theirs['numeric'] and theirs['count'] > 0:
+                total = stats['count'] + theirs['count']
+                delta = theirs['mean'] - stats['mean']
+                stats['mean'] += delta * theirs['count'] / total
+                stats['m2'] += theirs['m2'] + delta ** 2 * stats['count'] * theirs['count'] / total
+                stats['min'] = np.fmin(stats['min'], theirs['min'])
+                stats['max'] = np.fmax(stats['max'], theirs['max'])
+            stats['numeric'] = stats['numeric'] and theirs['numeric']
+            stats['count'] += theirs['count']
+            stats['nulls'] += theirs['nulls']
+
+    def to_frame(self):
+        """ Return the statistics as a DataFrame (one column per table column, like DataFrame.describe)
+
+        """
+        summary = {}
+        for column, stats in self.columns.items():
+            row = {'count': stats['count'], 'nulls': stats['nulls']}
+            if stats['numeric'] and stats['count'] > 0:
+                row['mean'] = stats['mean']
+                row['std'] = np.sqrt(stats['m2'] / (stats['count'] - 1)) if stats['count'] > 1 else np.nan
+                row['min'] = stats['min']
+                row['max'] = stats['max']
+            summary[column] = row
+        return pd.DataFrame(summary, index=['count', 'nulls', 'mean', 'std', 'min', 'max'])
+
+
+class QuantileSketch(object):
+    """ The _`QuantileSketch` object is a KLL quantile sketch: a hierarchy of compactors where level h keeps
+    (sorted) items of weight 2^h. A full level is sorted and every other item (random offset) is promoted to the
+    next level, so memory stays O(k) whatever the number of values. Sketches can be merged
+
+    """
+
+    def __init__(self, k=200, seed=None):
+        """ Create a new (empty) quantile sketch
+
+        :param k: the accuracy parameter (the capacity of the top level)
+        :param seed: the seed of the random compaction offsets
+        """
+        self.k = k
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self.rng = np.random.default_rng(seed)
+
+    def capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def update(self, values):
+        """ Add an array of values (NaN values are ignored)
+
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.n += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self.compress()
+
+    def merge(self, other):
+        """ Add the values summarized by another sketch
+
+        """
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self.compress()
+
+    def compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self.capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # With an odd number of items the smallest one stays at this level
+                odd = len(items) % 2
+                promoted = items[odd + self.rng.integers(2)::2]
+                self.levels[level] = items[:odd]
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    @property
+    def rank_error(self):
+        """ The normalized rank error of the quantiles (approximately 99% confidence; 0 while exact)
+
+        """
+        if len(self.levels) == 1:
+            return 0.0
+        return 2.296 / self.k ** 0.9723
+
+    def quantiles(self, q):
+        """ The approximate quantiles (a list of NaN if the sketch is empty)
+
+        :param q: the list of quantile levels (between 0 and 1)
+        """
+        if self.n == 0:
+            return [np.nan] * len(q)
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2 ** h, dtype=np.int64) for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        items = items[order]
+        cumulative = np.cumsum(weights[order])
+        positions = np.searchsorted(cumulative, np.asarray(q) * cumulative[-1], side='left')
+        return list(items[np.minimum(positions, len(items) - 1)])
+
+
+class HyperLogLog(object):
+    """ The _`HyperLogLog` object estimates the number of distinct values of a stream from 2^p small
+    registers keeping the maximum leading zero count of the value hashes. Sketches can be merged
+
+    """
+
+    def __init__(self, p=14):
+        """ Create a new (empty) distinct count sketch
+
+        :param p: the precision (2^p registers; the relative standard error is 1.04 / 2^(p/2))
+        """
+        self.p = p
+        self.m = 1 << p
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+
+    @staticmethod
+    def hash_values(series):
+        """ 64 bit hashes of the (non missing) values of a series. Numeric values are hashed as float64, so that
+        a value has the same hash whatever the dtype of the chunk it appears in
+
+        """
+        values = series.dropna()
+        if is_numeric_dtype(values.dtype):
+            return pd.util.hash_array(values.to_numpy(dtype=np.float64, na_value=np.nan))
+        return pd.util.hash_array(values.to_numpy(dtype=object), categorize=False)
+
+    def update(self, hashes):
+        """ Add an array of 64 bit value hashes
+
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        index = (hashes >> np.uint64(64 - self.p)).astype(np.intp)
+        rest = hashes & np.uint64((1 << (64 - self.p)) - 1)
+        # The position of the leftmost 1 bit of the remaining 64 - p bits
+        _, exponent = np.frexp(rest.astype(np.float64))
+        rank = (64 - self.p + 1 - exponent).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    @property
+    def relative_error(self):
+        """ The relative standard error of the estimate
+
+        """
+        return 1.04 / np.sqrt(self.m)
+
+    def estimate(self):
+        """ The estimated number of distinct values
+
+        """
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        estimate = alpha * self.m ** 2 / np.ldexp(1.0, -self.registers.astype(np.int64)).sum()
+        zeros = int((self.registers == 0).sum())
+        if estimate <= 2.5 * self.m and zeros > 0:
+            # Small range correction (linear counting)
+            estimate = self.m * np.log(self.m / zeros)
+        return estimate
+
+
+class ApproximateStatistics(StreamingStatistics):
+    """ The _`ApproximateStatistics` object extends StreamingStatistics_ with approximate quantiles
+    (QuantileSketch_) and distinct counts (HyperLogLog_) per column, with their error bounds.
+    All the statistics are computed in a single pass over the chunks, in memory independent of the row count
+
+    """
+
+    def __init__(self, k=200, p=14):
+        """ Create new (empty) approximate statistics
+
+        :param k: the accuracy parameter of the quantile sketches
+        :param p: the precision of the distinct count sketches
+        """
+        StreamingStatistics.__init__(self)
+        self.k = k
+        self.p = p
+        self.sketches = {}
+
+    def update(self, chunk):
+        """ Add a chunk (a pandas DataFrame) to the statistics
+
+        """
+        StreamingStatistics.update(self, chunk)
+        for column in chunk.columns:
+            series = chunk[column]
+            if column not in self.sketches:
+                self.sketches[column] = (QuantileSketch(self.k), HyperLogLog(self.p))
+            quantiles, distinct = self.sketches[column]
+            if self.columns[column]['numeric']:
+                quantiles.update(series.to_numpy(dtype=np.float64, na_value=np.nan))
+            distinct.update(HyperLogLog.hash_values(series))
+
+    def merge(self, other):
+        """ Add the statistics and sketches accumulated by another object (e.g. over a partition of the table)
+
+        """
+        StreamingStatistics.merge(self, other)
+        for column, (quantiles, distinct) in other.sketches.items():
+            if column in self.sketches:
+                self.sketches[column][0].merge(quantiles)
+                self.sketches[column][1].merge(distinct)
+            else:
+                self.sketches[column] = (quantiles, distinct)
+
+    def to_frame(self):
+        """ Return the statistics as a DataFrame, with the approximate quantiles, distinct counts and
+        their error bounds (rank_error: normalized rank error, distinct_error: relative standard error)
+
+        """
+        frame = StreamingStatistics.to_frame(self)
+        summary = {}
+        for column, (quantiles, distinct) in self.sketches.items():
+            row = {'distinct': distinct.estimate(), 'distinct_error': distinct.relative_error}
+            if self.columns[column]['numeric'] and quantiles.n > 0:
+                row.update(zip(['25%', '50%', '75%'], quantiles.quantiles([0.25, 0.5, 0.75])))
+                row['rank_error'] = quantiles.rank_error
+            summary[column] = row
+        extra = pd.DataFrame(summary, index=['25%', '50%', '75%', 'rank_error', 'distinct', 'distinct_error'])
+        return pd.concat([frame, extra[frame.columns]])
+
+
+class StreamDataSource(DataSource):
+    """ The _`StreamDataSource` object implements a CSV, Parquet or xlsx file data source that is read
+    in bounded-size chunks (Parquet: record batches, xlsx: rows of one sheet streamed by the XLSXReader_). The full table is never held in memory:
+    validation accumulates per column True / False / NA counts (ValidationCounts_) chunk by chunk.
+    The file is treated as a single frame.
+    The class inherits from DataSource_
+
+    """
+
+    def __init__(self, filename, chunksize=100000, file_format=None, keep_failures=False, dtype_backend=None,
+                 **read_args):
+        """ Create a new streaming data source
+
+        :param filename: the CSV, Parquet or xlsx filename
+        :param chunksize: the number of rows per chunk
+        :param file_format: 'csv', 'parquet' or 'xlsx' (inferred from the file extension if omitted)
+        :param keep_failures: also record the row positions of the failing cells
+        :param dtype_backend: 'pyarrow' to keep the chunk columns as Arrow arrays (pandas ArrowDtype)
+        :param read_args: additional keyword arguments passed to pandas.read_csv (xlsx: sheet_name and header)
+
+        .. note:: Parquet support requires pyarrow
+
+        :Example:
+
+        .. code-block:: python
+
+            MySource = StreamDataSource("loan_tape.csv", chunksize=500000)
+            MySource.validate_all(MyRule)
+            MySource.validation_summary()
+
+        """
+        DataSource.__init__(self)
+        self.filename = filename
+        self.chunksize = chunksize
+        self.keep_failures = keep_failures
+        self.dtype_backend = dtype_backend
+        self.read_args = read_args
+        if file_format is None:
+            name = str(filename).lower()
+            file_format = 'parquet' if name.endswith(('.parquet', '.pq')) else 'xlsx' if name.endswith(
+                ('.xlsx', '.xlsm')) else 'csv'
+        self.file_format = file_format
+        self.frame_names = [os.path.basename(str(filename))]
+        self.frame_no = 1
+        self.statistics = None
+
+        # Only the schema is read on initialization
+        if self.file_format == 'parquet':
+            import pyarrow.parquet as pq
+            self.col_names[0] = list(pq.ParquetFile(filename).schema_arrow.names)
+            self.col_length[0] = pq.ParquetFile(filename).metadata.num_rows
+        elif self.file_format == 'xlsx':
+            self.col_names[0] = XLSXReader(filename).columns(read_args.get('sheet_name', 0),
+                                                             read_args.get('header', 0), chunksize=chunksize)
+            self.col_length[0] = None
+        else:
+            self.col_names[0] = list(pd.read_csv(filename, nrows=0, **read_args).columns)
+            self.col_length[0] = None
+        self.status[0] = {}
+        self.results[0] = {}
+
+    def chunks(self, columns=None):
+        """ Iterate over the table in chunks (pandas DataFrames)
+
+        :param columns: restrict reading to the given columns
+        """
+        if self.file_format == 'parquet':
+            import pyarrow.parquet as pq
+            batches = pq.ParquetFile(self.filename).iter_batches(batch_size=self.chunksize, columns=columns)
+            types_mapper = pd.ArrowDtype if self.dtype_backend == 'pyarrow' else None
+            chunks = (batch.to_pandas(types_mapper=types_mapper) for batch in batches)
+        elif self.file_format == 'xlsx':
+            chunks = XLSXReader(self.filename).chunks(self.read_args.get('sheet_name', 0),
+                                                      self.read_args.get('header', 0), self.chunksize, columns,
+                                                      self.dtype_backend)
+        else:
+            chunks = pd.read_csv(self.filename, chunksize=self.chunksize, usecols=columns,
+                                 **backend_args(self.dtype_backend), **self.read_args)
+        try:
+            while True:
+                with PROFILER.span('parse', frame=0) as span:
+                    chunk = next(chunks, None)
+                    if chunk is not None:
+                        span.set(cells=chunk.size)
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            if hasattr(chunks, 'close'):
+                chunks.close()
+
+    def stream(self, evaluate, columns=None, statistics=None):
+        """ Evaluate rules chunk by chunk and accumulate the outcomes.
+        When all the columns are read, the row count and summary statistics are refreshed as well
+
+        :param evaluate: function (series, column, timings) returning a dictionary of key: (result, not_applicable)
+            (it may record the evaluation time of each key in the timings dictionary)
+        :param columns: restrict reading to the given columns
+        :param statistics: the (empty) statistics object to accumulate (a StreamingStatistics_ if omitted)
+        :return: a dictionary of key: {column: ValidationCounts}
+        """
+        counts = {}
+        self.timings = {}
+        if statistics is None and columns is None:
+            statistics = StreamingStatistics()
+        offset = 0
+        for chunk in self.chunks(columns):
+            if statistics is not None:
+                statistics.update(chunk)
+                self.col_datatypes[0] = chunk.dtypes
+            for column in chunk.columns:
+                timings = {}
+                start = time.perf_counter()
+                with PROFILER.span('validate', frame=0, column=column, cells=len(chunk)):
+                    outcomes = evaluate(chunk[column], column, timings)
+                elapsed = time.perf_counter() - start
+                for key, (result, not_applicable) in outcomes.items():
+                    accumulator = counts.setdefault(key, {}).setdefault(column, ValidationCounts(self.keep_failures))
+                    accumulator.update(result, not_applicable, offset)
+                    column_timings = self.timings.setdefault(key, {})
+                    column_timings[column] = column_timings.get(column, 0.0) + timings.get(key, elapsed)
+            offset += len(chunk)
+        self.col_length[0] = offset
+        if statistics is not None:
+            self.statistics = statistics
+        return counts
+
+    def scan(self, approximate=False):
+        """ Read the table once to compute the row count and summary statistics
+
+        :param approximate: also compute approximate quantiles and distinct counts (ApproximateStatistics_)
+        """
+        self.stream(lambda series, column, timings: {}, statistics=ApproximateStatistics() if approximate else None)
+
+    def describe(self, verbosity=0, approximate=False):
+        """ Describe the table from the accumulated (streamed) state
+
+        :param approximate: include approximate quantiles and distinct counts (with error bounds)
+        :return:
+        """
+        if self.statistics is None or (approximate and not isinstance(self.statistics, ApproximateStatistics)):
+            self.scan(approximate)
+        print("\n")
+        print("=" * 80)
+        print("Frame: ", 0, " Data Types")
+        print(self.col_datatypes.get(0))
+        print("-" * 80)
+        print("Frame: ", 0, " Summary Statistics")
+        print("-" * 80)
+        if verbosity == 0:
+            print("Column Names: ", self.col_names[0])
+            print("Row Count: ", self.col_length[0])
+        else:
+            print(self.statistics.to_frame())
+
+    def store(self, counts, status, results, key=None, rule=None):
+        for col, accumulator in counts.items():
+            status[col] = accumulator.status()
+            results[col] = accumulator
+            self.record(0, col, rule, status[col], accumulator, self.timings.get(key, {}).get(col))
+
+    def validate(self, column, Validation_Rule, frame=0):
+        """ Validate a column against the activated validation rule, reading only that column
+
+        :param column:
+        :param Validation_Rule:
+        :param frame:
+        :return:
+        """
+        rule = Validation_Rule
+        counts = self.stream(lambda series, col, timings: {None: rule_masks(rule.active_rule, rule.active_rule_args,
+                                                                   ColumnProfile(series), rule.vectorized)},
+                             columns=[column])
+        if not counts:
+            counts = {None: {column: ValidationCounts(self.keep_failures)}}
+        self.set_status_rule(frame, counts[None], rule.active_rule_name)
+        self.store(counts[None], self.status[frame], self.results[frame], None, rule.active_rule_name)
+
+    def validate_frame(self, Validation_Rule, frame=0):
+        """ Validate all columns against the activated validation rule in a single pass over the file
+
+        :param Validation_Rule:
+        :param frame:
+        :return:
+        """
+        rule = Validation_Rule
+        counts = self.stream(lambda series, col, timings: {None: rule_masks(rule.active_rule, rule.active_rule_args,
+                                                                   ColumnProfile(series), rule.vectorized)})
+        counts = counts.get(None, {})
+        for col in self.col_names[frame]:
+            counts.setdefault(col, ValidationCounts(self.keep_failures))
+        self.set_status_rule(frame, counts, rule.active_rule_name)
+        self.store(counts, self.status[frame], self.results[frame], None, rule.active_rule_name)
+
+    def validate_all(self, Validation_Rule):
+        """ Validate all columns against the activated validation rule (a single frame)
+
+        :param Validation_Rule:
+        :return:
+        """
+        self.frame_started(0)
+        self.validate_frame(Validation_Rule, 0)
+
+    def validate_plan(self, Validation_Plan, frame=None):
+        """ Validate all columns against all the rules of a validation plan in a single pass over the file
+
+        :param Validation_Plan: the ValidationPlan_ to evaluate
+        :param frame:
+        :return:
+        """
+        self.frame_started(0)
+        counts = self.stream(Validation_Plan.masks)
+        for label in Validation_Plan.labels():
+            status = self.rule_status.setdefault(label, {}).setdefault(0, {})
+            results = self.rule_results.setdefault(label, {}).setdefault(0, {})
+            self.store(counts.get(label, {}), status, results, label, label)
+
+
+#
+# Partitioned (out-of-core) Data Source
+#
+
+def write_partitions(data, directory, partition_rows=1000000, **read_args):
+    """ Write a table as a set of Parquet partitions (part-00000.parquet, ...) without holding it in memory
+
+    :param data: a DataFrame, a StreamDataSource_ or a filename (read in chunks by a StreamDataSource_), or a
+        dictionary of frame name: data (one subdirectory per frame)
+    :param directory: the output directory
+    :param partition_rows: the number of rows per partition
+    :param read_args: the StreamDataSource_ arguments when data is a filename (e.g. sep, sheet_name, header)
+    :return: the output directory (to be opened with PartitionedDataSource_)
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    if isinstance(data, dict):
+        for name, frame_data in data.items():
+            write_partitions(frame_data, os.path.join(directory, str(name)), partition_rows, **read_args)
+        return directory
+    if isinstance(data, pd.DataFrame):
+        chunks = (data.iloc[start:start + partition_rows] for start in range(0, max(len(data), 1), partition_rows))
+    else:
+        if not isinstance(data, StreamDataSource):
+            data = StreamDataSource(data, chunksize=partition_rows, **read_args)
+        chunks = data.chunks()
+    os.makedirs(directory, exist_ok=True)
+    for index, chunk in enumerate(chunks):
+        with PROFILER.span('write_partition', partition=index, cells=chunk.size):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            pq.write_table(table, os.path.join(directory, 'part-{:05d}.parquet'.format(index)))
+    return directory
+
+
+def validate_partition(path, columns, validator, keep_failures=False, dtype_backend=None, statistics=None):
+    """ Read a Parquet partition and evaluate a validator on its columns.
+    This is the unit of work of the PartitionedDataSource_ (it runs in a worker process)
+
+    :param path: the partition filename
+    :param columns: the columns to read (all if None)
+    :param validator: a Rule_ (outcomes under key None), a ValidationPlan_ (outcomes per label) or None
+    :param keep_failures: record the (partition) row positions of the failing cells
+    :param dtype_backend: the pandas dtype backend (e.g. 'pyarrow')
+    :param statistics: the statistics class to accumulate (e.g. StreamingStatistics_) or None
+    :return: (row count, counts {key: {column: ValidationCounts}}, timings {key: {column: seconds}}, statistics)
+    """
+    import pyarrow.parquet as pq
+    types_mapper = pd.ArrowDtype if dtype_backend == 'pyarrow' else None
+    df = pq.read_table(path, columns=columns).to_pandas(types_mapper=types_mapper)
+    if statistics is not None:
+        statistics = statistics()
+        statistics.update(df)
+    counts = {}
+    timings = {}
+    if validator is None:
+        return len(df), counts, timings, statistics
+    for column in df.columns:
+        column_timings = {}
+        start = time.perf_counter()
+        if isinstance(validator, ValidationPlan):
+            outcomes = validator.masks(df[column], column, column_timings)
+        else:
+            outcomes = {None: rule_masks(validator.active_rule, validator.active_rule_args, ColumnProfile(df[column]),
+                                         validator.vectorized)}
+        elapsed = time.perf_counter() - start
+        for key, (result, not_applicable) in outcomes.items():
+            accumulator = ValidationCounts(keep_failures)
+            accumulator.update(result, not_applicable)
+            counts.setdefault(key, {})[column] = accumulator
+            timings.setdefault(key, {})[column] = column_timings.get(key, elapsed)
+    return len(df), counts, timings, statistics
+
+
+class PartitionedDataSource(DataSource):
+    """ The _`PartitionedDataSource` object implements an out-of-core data source: each frame is a set of
+    on-disk Parquet partitions (e.g. written by write_partitions, Spark or Dask). Validation maps the rules
+    over the partitions, in parallel worker processes when more than one worker is configured, and reduces the
+    per partition True / False / NA counts (ValidationCounts_) and failing row positions in partition order.
+    Only one partition per worker is held in memory.
+    The class inherits from DataSource_
+
+    .. note:: The df mapping materializes a whole frame (all its partitions) on access, so the dataset rules
+        and incremental validation of the base class are only suited to frames that fit in memory
+
+    """
+
+    def __init__(self, partitions, workers=1, keep_failures=False, dtype_backend=None):
+        """ Create a new partitioned data source. Only the partition footers (row counts and schema) are read
+
+        :param partitions: a directory (its Parquet files form one frame, or each subdirectory holding Parquet
+            files is a frame), a list of Parquet files (one frame) or a dictionary of frame name: directory or
+            list of files
+        :param workers: the number of worker processes (1 evaluates the partitions in process)
+        :param keep_failures: also record the row positions of the failing cells (FailureIndex_ drill-down)
+        :param dtype_backend: 'pyarrow' to hold the partition columns as Arrow arrays (pandas ArrowDtype)
+
+        :Example:
+
+        .. code-block:: python
+
+            write_partitions("loan_tape.csv", "loan_tape_parts", partition_rows=1000000)
+            MySource = PartitionedDataSource("loan_tape_parts", workers=4)
+            MySource.validate_all(MyRule)
+            MySource.validation_summary()
+
+        """
+        import pyarrow.parquet as pq
+        DataSource.__init__(self)
+        self.workers = workers
+        self.keep_failures = keep_failures
+        self.dtype_backend = dtype_backend
+        self.partitions = {}
+        self.offsets = {}
+        self.statistics = {}
+        self.timings = {}
+
+        if isinstance(partitions, dict):
+            frames = [(str(name), self.partition_files(files)) for name, files in partitions.items()]
+        elif isinstance(partitions, (list, tuple)):
+            frames = [(os.path.basename(os.path.dirname(os.path.abspath(str(partitions[0])))) if partitions else '',
+                       [str(path) for path in partitions])]
+        elif self.partition_files(partitions):
+            frames = [(os.path.basename(os.path.abspath(str(partitions))), self.partition_files(partitions))]
+        else:
+            frames = [(name, self.partition_files(os.path.join(partitions, name)))
+                      for name in sorted(os.listdir(partitions))
+                      if os.path.isdir(os.path.join(partitions, name))]
+            frames = [(name, files) for name, files in frames if files]
+        self.frame_names = [name for name, _ in frames]
+        self.frame_no = len(frames)
+
+        for frame, (name, files) in enumerate(frames):
+            self.partitions[frame] = files
+            lengths = [pq.ParquetFile(path).metadata.num_rows for path in files]
+            self.offsets[frame] = np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)])
+            self.col_length[frame] = int(self.offsets[frame][-1])
+            schema = pq.ParquetFile(files[0]).schema_arrow if files else None
+            self.col_names[frame] = list(schema.names) if schema is not None else []
+            if schema is not None:
+                types_mapper = pd.ArrowDtype if dtype_backend == 'pyarrow' else None
+                self.col_datatypes[frame] = schema.empty_table().to_pandas(types_mapper=types_mapper).dtypes
+            self.status[frame] = {}
+            self.results[frame] = {}
+        self.df = LazyFrames(range(self.frame_no), self.read_frame)
+
+    @staticmethod
+    def partition_files(partitions):
+        """ The sorted Parquet files of a directory (a list of files is returned as is)
+
+        """
+        if isinstance(partitions, (list, tuple)):
+            return [str(path) for path in partitions]
+        if not os.path.isdir(partitions):
+            return []
+        return [os.path.join(partitions, name) for name in sorted(os.listdir(partitions))
+                if name.endswith(('.parquet', '.pq'))]
+
+    def read_partition(self, frame, index, columns=None):
+        """ Read a partition of a frame into a DataFrame (indexed by global row position)
+
+        """
+        import pyarrow.parquet as pq
+        frame = self.frame_index(frame)
+        types_mapper = pd.ArrowDtype if self.dtype_backend == 'pyarrow' else None
+        with PROFILER.span('parse', frame=frame, partition=index):
+            df = pq.read_table(self.partitions[frame][index], columns=columns).to_pandas(types_mapper=types_mapper)
+        df.index = pd.RangeIndex(self.offsets[frame][index], self.offsets[frame][index] + len(df))
+        return df
+
+    def failing_rows(self, checks, frame=0, n=None, how='all'):
+        """ The rows of a frame that fail the given checks. Only the partitions holding failing rows are read
+        (the frame is not materialized)
+
+        :param checks: a (column, rule) pair or a list of pairs (rule: the rule name or plan entry label)
+        :param frame: the frame
+        :param n: return only the first n rows
+        :param how: 'all' (rows failing every check) or 'any' (rows failing at least one check)
+        :return: the failing rows, indexed by global row position
+        """
+        frame = self.frame_index(frame)
+        positions = np.asarray(self.failing_positions(checks, frame, n, how), dtype=np.int64)
+        if len(positions) == 0:
+            return pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in self.col_datatypes[frame].items()})
+        # The partition of each (sorted) position, from the partition row offsets
+        owners = np.searchsorted(self.offsets[frame], positions, side='right') - 1
+        parts = [self.read_partition(frame, index).loc[positions[owners == index]] for index in np.unique(owners)]
+        return pd.concat(parts) if len(parts) > 1 else parts[0]
+
+    def read_frame(self, frame):
+        """ Materialize a whole frame (all its partitions) in memory
+
+        """
+        parts = [self.read_partition(frame, index) for index in range(len(self.partitions[frame]))]
+        if not parts:
+            return pd.DataFrame()
+        return pd.concat(parts) if len(parts) > 1 else parts[0]
+
+    def map_partitions(self, frames, validator, columns=None, statistics=None):
+        """ Evaluate a validator over all the partitions of the given frames and reduce the outcomes per frame.
+        With more than one worker, the partitions are evaluated in a pool of worker processes
+
+        .. note:: In parallel mode the validator is sent to the worker processes so column selectors must be
+            picklable
+
+        :param frames: the frame indexes
+        :param validator: the Rule_ or ValidationPlan_ to evaluate (None to only accumulate statistics)
+        :param columns: restrict reading to the given columns
+        :param statistics: the statistics class to accumulate per partition and merge (e.g. StreamingStatistics_)
+        :return: a dictionary of frame: (counts {key: {column: ValidationCounts}}, timings, statistics)
+        """
+        tasks = [(frame, index) for frame in frames for index in range(len(self.partitions[frame]))]
+        arguments = [(self.partitions[frame][index], columns, validator, self.keep_failures, self.dtype_backend,
+                      statistics) for frame, index in tasks]
+        reduced = {frame: ({}, {}, statistics() if statistics is not None else None) for frame in frames}
+        with PROFILER.span('map_partitions', frames=len(frames), partitions=len(tasks)):
+            if self.workers > 1 and len(tasks) > 1:
+                from concurrent.futures import ProcessPoolExecutor
+                with ProcessPoolExecutor(max_workers=min(self.workers, len(tasks))) as executor:
+                    for (frame, index), outcome in zip(tasks, executor.map(validate_partition, *zip(*arguments))):
+                        self.reduce_partition(reduced[frame], outcome, self.offsets[frame][index])
+            else:
+                for (frame, index), task in zip(tasks, arguments):
+                    self.reduce_partition(reduced[frame], validate_partition(*task), self.offsets[frame][index])
+        return reduced
+
+    def reduce_partition(self, reduced, outcome, offset):
+        """ Merge the outcome of a partition into the reduced outcome of its frame
+
+        """
+        counts, timings, statistics = reduced
+        length, partition_counts, partition_timings, partition_statistics = outcome
+        for key, columns in partition_counts.items():
+            for column, accumulator in columns.items():
+                counts.setdefault(key, {}).setdefault(column, ValidationCounts(self.keep_failures)).merge(
+                    accumulator, int(offset))
+                key_timings = timings.setdefault(key, {})
+                key_timings[column] = key_timings.get(column, 0.0) + partition_timings[key][column]
+        if statistics is not None:
+            statistics.merge(partition_statistics)
+
+    def store(self, frame, counts, status, results, timings, rule=None):
+        for col, accumulator in counts.items():
+            status[col] = accumulator.status()
+            results[col] = accumulator
+            self.record(frame, col, rule, status[col], accumulator, timings.get(col))
+
+    def validate(self, column, Validation_Rule, frame=0):
+        """ Validate a column against the activated validation rule, reading only that column of each partition
+
+        :param column:
+        :param Validation_Rule:
+        :param frame:
+        :return:
+        """
+        frame = self.frame_index(frame)
+        counts, timings, _ = self.map_partitions([frame], Validation_Rule, [column])[frame]
+        counts = counts.get(None, {column: ValidationCounts(self.keep_failures)})
+        self.set_status_rule(frame, counts, Validation_Rule.active_rule_name)
+        self.store(frame, counts, self.status[frame], self.results[frame], timings.get(None, {}),
+                   Validation_Rule.active_rule_name)
+
+    def validate_frame(self, Validation_Rule, frame=0):
+        """ Validate all columns of a frame against the activated validation rule (one pass over the partitions)
+
+        :param Validation_Rule:
+        :param frame:
+        :return:
+        """
+        self.validate_frames(Validation_Rule, [self.frame_index(frame)])
+
+    def validate_all(self, Validation_Rule):
+        """ Validate all columns of all frames against the activated validation rule. The partitions of all the
+        frames are scheduled together
+
+        :param Validation_Rule:
+        :return:
+        """
+        self.validate_frames(Validation_Rule, range(self.frame_no))
+
+    def validate_frames(self, Validation_Rule, frames):
+        reduced = self.map_partitions(frames, Validation_Rule)
+        for frame in frames:
+            self.frame_started(frame)
+            counts, timings, _ = reduced[frame]
+            counts = counts.get(None, {})
+            for col in self.col_names[frame]:
+                counts.setdefault(col, ValidationCounts(self.keep_failures))
+            self.set_status_rule(frame, counts, Validation_Rule.active_rule_name)
+            self.store(frame, counts, self.status[frame], self.results[frame], timings.get(None, {}),
+                       Validation_Rule.active_rule_name)
+
+    def validate_plan(self, Validation_Plan, frame=None):
+        """ Validate frames against all the rules of a validation plan (one pass over the partitions)
+
+        :param Validation_Plan: the ValidationPlan_ to evaluate
+        :param frame: the frame to validate (all frames if None)
+        :return:
+        """
+        frames = range(self.frame_no) if frame is None else [self.frame_index(frame)]
+        reduced = self.map_partitions(frames, Validation_Plan)
+        for frame in frames:
+            self.frame_started(frame)
+            counts, timings, _ = reduced[frame]
+            for label in Validation_Plan.labels():
+                status = self.rule_status.setdefault(label, {}).setdefault(frame, {})
+                results = self.rule_results.setdefault(label, {}).setdefault(frame, {})
+                self.store(frame, counts.get(label, {}), status, results, timings.get(label, {}), label)
+
+    def scan(self, approximate=False):
+        """ Compute the summary statistics of all the frames (per partition, then merged)
+
+        :param approximate: also compute approximate quantiles and distinct counts (ApproximateStatistics_)
+        """
+        statistics = ApproximateStatistics if approximate else StreamingStatistics
+        reduced = self.map_partitions(range(self.frame_no), None, statistics=statistics)
+        for frame in range(self.frame_no):
+            self.statistics[frame] = reduced[frame][2]
+
+    def describe(self, verbosity=0, approximate=False):
+        """ Describe the frames from the partition footers (and the merged partition statistics)
+
+        :param approximate: include approximate quantiles and distinct counts (with error bounds)
+        :return:
+        """
+        if verbosity > 0 and (not self.statistics or (approximate and not isinstance(
+                self.statistics.get(0), ApproximateStatistics))):
+            self.scan(approximate)
+        for frame in range(self.frame_no):
+            print("\n")
+            print("=" * 80)
+            print("Frame: ", frame, " Data Types")
+            print(self.col_datatypes.get(frame))
+            print("-" * 80)
+            print("Frame: ", frame, " Summary Statistics")
+            print("-" * 80)
+            if verbosity == 0:
+                print("Column Names: ", self.col_names[frame])
+                print("Row Count: ", self.col_length[frame])
+                print("Partitions: ", len(self.partitions[frame]))
+            else:
+                print(self.statistics[frame].to_frame())
+
+
+#
+# SQL (DuckDB) Data Source
+#
+
+def sql_identifier(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def sql_literal(value):
+    """ A SQL literal of a string, boolean or (python or numpy) finite number
+
+    """
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    elif isinstance(value, (bool, np.bool_)):
+        return 'TRUE' if value else 'FALSE'
+    elif isinstance(value, (int, np.integer)):
+        return str(int(value))
+    elif isinstance(value, (float, np.floating)):
+        if not np.isfinite(value):
+            raise ValueError("Non-finite rule argument cannot be compiled to SQL: " + str(value))
+        return repr(float(value))
+    raise ValueError("Rule argument cannot be compiled to SQL: " + repr(value))
+
+
+def sql_column_kind(column_type):
+    """ Classify a SQL column type as 'int', 'float', 'bool', 'varchar', 'temporal' or 'other'
+
+    """
+    column_type = column_type.upper()
+    if column_type == 'BOOLEAN':
+        return 'bool'
+    elif 'INT' in column_type:
+        return 'int'
+    elif column_type in ('FLOAT', 'DOUBLE', 'REAL') or column_type.startswith('DECIMAL'):
+        return 'float'
+    elif column_type in ('VARCHAR', 'TEXT', 'STRING'):
+        return 'varchar'
+    elif column_type.startswith(('DATE', 'TIME')):
+        return 'temporal'
+    return 'other'
+
+
+def sql_rule(rule_function, rule_args, column, column_type):
+    """ Compile a rule function over a column into a pair of per row SQL boolean expressions (result, not_applicable).
+    The expressions mirror the pandas semantics of the rules: missing values of numeric and text columns read
+    as NaN (a float), temporal columns and the cells of text columns are not numeric
+
+    :param rule_function: the name of the rule function (e.g. 'InRange')
+    :param rule_args: the rule arguments (tuple or None)
+    :param column: the column name
+    :param column_type: the SQL type of the column
+    :return: (result, not_applicable)
+    """
+    args = rule_args or ()
+    kind = sql_column_kind(column_type)
+    x = sql_identifier(column)
+    if kind == 'float':
+        null = '({} IS NULL OR isnan({}))'.format(x, x)
+    else:
+        null = '{} IS NULL'.format(x)
+    numeric = {'IsPositive': (lambda v: 'NOT ({} < 0)'.format(v), True),
+               'IsNonNegative': (lambda v: '{} >= 0'.format(v), False),
+               'IsAtLeast': (lambda v: '{} >= {}'.format(v, sql_literal(args[0])) if args else 'FALSE', False),
+               'IsAtMost': (lambda v: '{} <= {}'.format(v, sql_literal(args[0])) if args else 'FALSE', False),
+               'InRange': (lambda v: '{} BETWEEN {} AND {}'.format(v, sql_literal(args[0]), sql_literal(args[1]))
+                           if len(args) > 1 else 'FALSE', False)}
+    # The python type names of non-missing and missing cells (as seen by IsType)
+    type_names = {'int': ('int', 'float'), 'float': ('float', 'float'), 'bool': ('bool', 'float'),
+                  'varchar': ('str', 'float'), 'temporal': ('Timestamp', 'NaTType'), 'other': (None, None)}[kind]
+
+    if rule_function == 'IsPopulated':
+        return 'NOT {}'.format(null), 'FALSE'
+    elif rule_function in numeric:
+        predicate, missing_value = numeric[rule_function]
+        if kind in ('int', 'float', 'bool'):
+            value = 'CAST({} AS INTEGER)'.format(x) if kind == 'bool' else x
+            if missing_value:
+                return '({} OR {})'.format(null, predicate(value)), 'FALSE'
+            return '(NOT {} AND {})'.format(null, predicate(value)), 'FALSE'
+        elif kind == 'varchar':
+            # Missing cells are NaN (numeric), text cells are not applicable
+            return (null if missing_value else 'FALSE'), 'NOT {}'.format(null)
+        return 'FALSE', 'TRUE'
+    elif rule_function == 'IsType':
+        present, missing = type_names
+        if args and args[0] == present and args[0] == missing:
+            return 'TRUE', 'FALSE'
+        elif args and args[0] == present:
+            return 'NOT {}'.format(null), 'FALSE'
+        elif args and args[0] == missing:
+            return null, 'FALSE'
+        return 'FALSE', 'FALSE'
+    elif rule_function == 'IsString':
+        if kind == 'varchar':
+            return '(NOT {} AND length({}) > 0)'.format(null, x), 'FALSE'
+        return 'FALSE', 'FALSE'
+    elif rule_function == 'InList':
+        if kind in ('int', 'float', 'bool'):
+            values = [v for v in args if isinstance(v, (int, float, np.integer, np.floating)) and
+                      not isinstance(v, (bool, np.bool_)) and v == v]
+        elif kind == 'varchar':
+            values = [v for v in args if isinstance(v, str)]
+        else:
+            values = []
+        if not values:
+            return 'FALSE', 'FALSE'
+        return '(NOT {} AND {} IN ({}))'.format(null, x, ', '.join(sql_literal(v) for v in values)), 'FALSE'
+    raise ValueError("Rule function cannot be compiled to SQL: " + str(rule_function))
+
+
+class SQLDataSource(DataSource):
+    """ The _`SQLDataSource` object implements a CSV or Parquet file data source that is validated by an
+    embedded SQL engine (DuckDB) instead of pandas. The rules selected for each column are compiled into SQL
+    aggregates and evaluated in a single query, so the engine's columnar scan and parallelism do the counting.
+    Outcomes are stored as ValidationCounts_ in status / results (rule_status / rule_results for plans);
+    the failing row positions are extracted with an additional query when requested.
+    The class inherits from DataSource_
+
+    .. note:: Requires duckdb. Cell types are derived from the SQL column types, which approximates the
+        per cell type checks of the pandas path (e.g. for IsType)
+
+    """
+
+    def __init__(self, filename, file_format=None, keep_failures=False, connection=None):
+        """ Create a new SQL data source
+
+        :param filename: the CSV or Parquet filename (or a glob pattern of files)
+        :param file_format: 'csv' or 'parquet' (inferred from the file extension if omitted)
+        :param keep_failures: also extract the row positions of the failing cells
+        :param connection: an existing duckdb connection (a new in-memory one if omitted)
+
+        :Example:
+
+        .. code-block:: python
+
+            MySource = SQLDataSource("loan_tape.parquet")
+            MySource.validate_all(MyRule)
+            MySource.validation_summary()
+
+        """
+        import duckdb
+        DataSource.__init__(self)
+        self.filename = filename
+        self.keep_failures = keep_failures
+        if file_format is None:
+            file_format = 'parquet' if str(filename).lower().endswith(('.parquet', '.pq')) else 'csv'
+        self.file_format = file_format
+        self.connection = duckdb.connect() if connection is None else connection
+        reader = 'read_parquet' if file_format == 'parquet' else 'read_csv_auto'
+        self.relation = '{}({})'.format(reader, sql_literal(str(filename)))
+        self.frame_names = [os.path.basename(str(filename))]
+        self.frame_no = 1
+        schema = self.connection.execute('DESCRIBE SELECT * FROM ' + self.relation).fetchall()
+        self.col_names[0] = [row[0] for row in schema]
+        self.col_datatypes[0] = {row[0]: row[1] for row in schema}
+        self.col_length[0] = None
+        self.status[0] = {}
+        self.results[0] = {}
+
+    def query(self, sql):
+        with PROFILER.span('query', sql=sql):
+            return self.connection.execute(sql).fetchall()
+
+    def describe(self, verbosity=0):
+        """ Describe the table (column types, row count or, with verbosity, the engine's column summary)
+
+        :return:
+        """
+        print("\n")
+        print("=" * 80)
+        print("Frame: ", 0, " Data Types")
+        for column, column_type in self.col_datatypes[0].items():
+            print('{:<40}'.format(column), column_type)
+        print("-" * 80)
+        print("Frame: ", 0, " Summary Statistics")
+        print("-" * 80)
+        if verbosity == 0:
+            if self.col_length[0] is None:
+                self.col_length[0] = self.query('SELECT COUNT(*) FROM ' + self.relation)[0][0]
+            print("Column Names: ", self.col_names[0])
+            print("Row Count: ", self.col_length[0])
+        else:
+            print(self.connection.execute('SUMMARIZE SELECT * FROM ' + self.relation).df())
+
+    def compile(self, entries, columns=None):
+        """ Compile rule entries into SQL expressions
+
+        :param entries: list of (key, rule function, rule args, column selector) (as in ValidationPlan_)
+        :param columns: the columns to validate (all columns if None)
+        :return: list of (key, column, result expression, not applicable expression)
+        """
+        compiled = []
+        for column in (self.col_names[0] if columns is None else columns):
+            for key, function, args, selector in entries:
+                if ValidationPlan.selects((key, function, args, selector), column):
+                    result, not_applicable = sql_rule(function, args, column, self.col_datatypes[0][column])
+                    compiled.append((key, column, result, not_applicable))
+        return compiled
+
+    def evaluate(self, entries, columns=None):
+        """ Evaluate rule entries in a single aggregate query (plus one query per rule and column for the
+        failing rows when keep_failures is set)
+
+        :return: a dictionary of key: {column: ValidationCounts}
+        """
+        compiled = self.compile(entries, columns)
+        aggregates = ['COUNT(*)']
+        for _, _, result, not_applicable in compiled:
+            aggregates.append('SUM(CASE WHEN {} THEN 1 ELSE 0 END)'.format(not_applicable))
+            aggregates.append('SUM(CASE WHEN NOT ({}) AND {} THEN 1 ELSE 0 END)'.format(not_applicable, result))
+        row = self.query('SELECT ' + ', '.join(aggregates) + ' FROM ' + self.relation)[0]
+        length = row[0]
+        self.col_length[0] = length
+        counts = {}
+        for i, (key, column, result, not_applicable) in enumerate(compiled):
+            na_count, true_count = row[1 + 2 * i] or 0, row[2 + 2 * i] or 0
+            failures = None
+            if self.keep_failures and length - na_count - true_count > 0:
+                failures = [r[0] for r in self.query(
+                    'SELECT row_position FROM (SELECT row_number() OVER () - 1 AS row_position, * FROM {}) '
+                    'WHERE NOT ({}) AND NOT ({}) ORDER BY row_position'.format(self.relation, not_applicable, result))]
+            accumulator = ValidationCounts(self.keep_failures)
+            accumulator.add_counts(length, true_count, na_count, failures)
+            counts.setdefault(key, {})[column] = accumulator
+        return counts
+
+    def store(self, counts, status, results, rule=None):
+        for col, accumulator in counts.items():
+            status[col] = accumulator.status()
+            results[col] = accumulator
+            self.record(0, col, rule, status[col], accumulator)
+
+    def validate(self, column, Validation_Rule, frame=0):
+        """ Validate a column against the activated validation rule (one SQL query)
+
+        :param column:
+        :param Validation_Rule:
+        :param frame:
+        :return:
+        """
+        rule = Validation_Rule
+        counts = self.evaluate([(None, rule.active_rule, rule.active_rule_args, None)], [column])
+        self.set_status_rule(frame, counts.get(None, {}), rule.active_rule_name)
+        self.store(counts.get(None, {}), self.status[frame], self.results[frame], rule.active_rule_name)
+
+    def validate_frame(self, Validation_Rule, frame=0):
+        """ Validate all columns against the activated validation rule (one SQL query)
+
+        :param Validation_Rule:
+        :param frame:
+        :return:
+        """
+        rule = Validation_Rule
+        counts = self.evaluate([(None, rule.active_rule, rule.active_rule_args, None)])
+        self.set_status_rule(frame, counts.get(None, {}), rule.active_rule_name)
+        self.store(counts.get(None, {}), self.status[frame], self.results[frame], rule.active_rule_name)
+
+    def validate_all(self, Validation_Rule):
+        """ Validate all columns against the activated validation rule (a single frame)
+
+        :param Validation_Rule:
+        :return:
+        """
+        self.frame_started(0)
+        self.validate_frame(Validation_Rule, 0)
+
+    def validate_plan(self, Validation_Plan, frame=None):
+        """ Validate all columns against all the rules of a validation plan (one SQL query)
+
+        :param Validation_Plan: the ValidationPlan_ to evaluate
+        :param frame:
+        :return:
+        """
+        self.frame_started(0)
+        counts = self.evaluate(Validation_Plan.entries)
+        for label in Validation_Plan.labels():
+            status = self.rule_status.setdefault(label, {}).setdefault(0, {})
+            results = self.rule_results.setdefault(label, {}).setdefault(0, {})
+            self.store(counts.get(label, {}), status, results, label)
+
+
+#
+# Column Profile
+#
+
+# The column kinds of the values of pandas.api.types.infer_dtype
+CELL_KINDS = {
+    'integer': 'int',
+    'floating': 'float',
+    'string': 'string',
+    'boolean': 'bool',
+    'datetime': 'datetime',
+    'empty': 'empty',
+}
+
+
+class ColumnProfile(object):
+    """ The _`ColumnProfile` object wraps a series and lazily computes the per-column
+    preprocessing (cell types, null mask, numeric coercion) that the vectorized rules need.
+    A profile is computed once per column and shared by all the rules evaluated on it
+
+    """
+
+    def __init__(self, series):
+        """ Create a new column profile
+
+        :param series: the pandas series to profile
+        """
+        self.series = series
+        self.length = len(series)
+        self._cell_types = None
+        self._kind = None
+        self._null_mask = None
+        self._numeric_mask = None
+        self._numeric_values = None
+        self._object_values = None
+        self._fingerprint = None
+
+    @staticmethod
+    def data_token(series):
+        """ A token identifying the data of a series without reading it: the buffer address of numpy backed
+        series, the array object of extension arrays. Reassigning or modifying a column of a frame (copy on write)
+        changes the token of the series obtained from the frame
+
+        """
+        if isinstance(series.dtype, np.dtype):
+            values = series.to_numpy()
+            return values.__array_interface__['data'][0], values.shape, values.strides, str(values.dtype)
+        return id(series.array), len(series)
+
+    def is_numpy_numeric(self):
+        dtype = self.series.dtype
+        return isinstance(dtype, np.dtype) and dtype.kind in 'biuf'
+
+    def is_arrow(self):
+        """ Whether the column is backed by an Arrow array (ArrowDtype or pyarrow string columns)
+
+        """
+        dtype = self.series.dtype
+        return isinstance(dtype, pd.ArrowDtype) or \
+            (isinstance(dtype, pd.StringDtype) and dtype.storage == 'pyarrow')
+
+    def arrow_array(self):
+        """ The (zero-copy) Arrow array of an ArrowDtype column
+
+        """
+        return self.series.array.__arrow_array__()
+
+    def arrow_kind(self):
+        import pyarrow as pa
+        arrow_type = self.arrow_array().type
+        if pa.types.is_integer(arrow_type):
+            return 'int'
+        elif pa.types.is_floating(arrow_type) or pa.types.is_decimal(arrow_type):
+            return 'float'
+        elif pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+            return 'string'
+        elif pa.types.is_boolean(arrow_type):
+            return 'bool'
+        elif pa.types.is_temporal(arrow_type):
+            return 'datetime'
+        elif pa.types.is_null(arrow_type):
+            return 'empty'
+        return 'mixed'
+
+    def is_masked(self):
+        """ Whether the column is a pandas masked array (Int64, Float64, boolean dtypes)
+
+        """
+        return isinstance(self.series.array, (pd.arrays.IntegerArray, pd.arrays.FloatingArray, pd.arrays.BooleanArray))
+
+    def extension_kind(self):
+        """ The kind of the values of an Arrow or masked array column (None for other columns)
+
+        """
+        if self.is_arrow():
+            return self.arrow_kind()
+        if self.is_masked():
+            return {'i': 'int', 'u': 'int', 'f': 'float', 'b': 'bool'}[self.series.dtype.numpy_dtype.kind]
+        return None
+
+    @property
+    def object_values(self):
+        """ The cells of the column as a numpy object array
+
+        """
+        if self._object_values is None:
+            self._object_values = self.series.to_numpy(dtype=object)
+        return self._object_values
+
+    @property
+    def cell_types(self):
+        """ The python types of the cells in factorized form (codes, uniques), with the codes as a compact
+        integer array. The types are those seen by the scalar rule functions when applied via series.apply
+
+        """
+        if self._cell_types is None:
+            with PROFILER.span('coercion', stage='cell_types', cells=self.length):
+                self._cell_types = self.infer_cell_types()
+        return self._cell_types
+
+    def infer_cell_types(self):
+        """ Classify the cells of the column. The column kind is inferred once over the whole column; only the
+        cells of mixed columns (and the missing cells of homogeneous ones) are typed one by one
+
+        """
+        dtype = self.series.dtype
+        if self.is_numpy_numeric():
+            # Plain numpy numeric columns are seen as python bool / int / float
+            scalar_type = {'b': bool, 'i': int, 'u': int, 'f': float}[dtype.kind]
+            self._kind = {bool: 'bool', int: 'int', float: 'float'}[scalar_type]
+            return np.zeros(self.length, dtype=np.int8), np.array([scalar_type], dtype=object)
+        if isinstance(dtype, np.dtype) and dtype.kind == 'M':
+            # Datetime columns are seen as Timestamp / NaT
+            self._kind = 'datetime'
+            return self.null_mask.astype(np.int8), np.array([pd.Timestamp, type(pd.NaT)], dtype=object)
+        if self.extension_kind() not in (None, 'mixed'):
+            # The cells of an Arrow or masked array share a type: probe the types series.apply sees for a present
+            # and a missing cell (e.g. integer arrays with nulls are seen as floats)
+            self._kind = self.extension_kind()
+            nulls = self.null_mask
+            probe = sorted(set([int(np.argmin(nulls)), int(np.argmax(nulls))]))
+            probe_types = list(self.series.iloc[probe].apply(type))
+            if nulls.all():
+                return np.zeros(self.length, dtype=np.int8), np.array(probe_types[:1], dtype=object)
+            present = probe_types[probe.index(int(np.argmin(nulls)))]
+            missing = probe_types[probe.index(int(np.argmax(nulls)))]
+            if not nulls.any() or missing is present:
+                return np.zeros(self.length, dtype=np.int8), np.array([present], dtype=object)
+            return nulls.astype(np.int8), np.array([present, missing], dtype=object)
+        self._kind = CELL_KINDS.get(pd.api.types.infer_dtype(self.series, skipna=True), 'mixed')
+        scalar_type = {'int': int, 'float': float, 'string': str, 'bool': bool}.get(self._kind)
+        nulls = self.null_mask
+        if scalar_type is not None:
+            values = self.object_values
+            first = np.argmin(nulls)
+            # The inferred kind admits subclasses (e.g. numpy scalars), so check the type of a present cell
+            if not nulls[first] and type(values[first]) is scalar_type:
+                uniques = [scalar_type]
+                codes = np.zeros(self.length, dtype=np.int8)
+                if nulls.any():
+                    null_codes, null_types = pd.factorize(
+                        np.fromiter(map(type, values[nulls]), dtype=object, count=int(nulls.sum())))
+                    lookup = []
+                    for t in null_types:
+                        if t not in uniques:
+                            uniques.append(t)
+                        lookup.append(uniques.index(t))
+                    codes[nulls] = np.array(lookup, dtype=np.int8)[null_codes]
+                return codes, np.array(uniques, dtype=object)
+            self._kind = 'mixed'
+        types = np.fromiter(map(type, self.object_values), dtype=object, count=self.length)
+        codes, uniques = pd.factorize(types)
+        if len(uniques) < 128:
+            codes = codes.astype(np.int8)
+        return codes, uniques
+
+    @property
+    def kind(self):
+        """ The inferred kind of the column: 'int', 'float', 'string', 'bool', 'datetime', 'mixed' or 'empty'
+        (missing cells are ignored)
+
+        """
+        if self._kind is None:
+            self.cell_types
+        return self._kind
+
+    def type_counts(self):
+        """ The number of cells of each python type, e.g. {'str': 950, 'float': 50}
+
+        """
+        codes, uniques = self.cell_types
+        counts = np.bincount(codes, minlength=len(uniques))
+        return {t.__name__: int(count) for t, count in zip(uniques, counts) if count}
+
+    @property
+    def null_mask(self):
+        """ Boolean array flagging the missing cells
+
+        """
+        if self._null_mask is None:
+            self._null_mask = self.series.isna().to_numpy(dtype=bool)
+        return self._null_mask
+
+    @property
+    def numeric_mask(self):
+        """ Boolean array flagging the cells that are python int or float instances
+
+        """
+        if self._numeric_mask is None:
+            codes, uniques = self.cell_types
+            flags = np.array([issubclass(t, (int, float)) for t in uniques], dtype=bool)
+            self._numeric_mask = flags[codes]
+        return self._numeric_mask
+
+    @property
+    def numeric_values(self):
+        """ The cells of the column as float64, with the non-numeric cells set to NaN
+
+        """
+        if self._numeric_values is None:
+            if self.is_numpy_numeric():
+                self._numeric_values = self.series.to_numpy(dtype=np.float64)
+            elif self.extension_kind() not in (None, 'mixed'):
+                # Numeric Arrow and masked arrays convert directly (missing values as NaN); other arrays have no
+                # numeric value
+                if self.extension_kind() in ('int', 'float', 'bool'):
+                    # The conversion may return a read-only view of the array buffer (no nulls), so copy it
+                    values = np.array(self.series.to_numpy(dtype=np.float64, na_value=np.nan), dtype=np.float64,
+                                      copy=True)
+                else:
+                    values = np.full(self.length, np.nan)
+                values[~self.numeric_mask] = np.nan
+                self._numeric_values = values
+            else:
+                mask = self.numeric_mask
+                with PROFILER.span('coercion', stage='numeric_values', cells=self.length):
+                    values = np.full(self.length, np.nan)
+                    values[mask] = self.object_values[mask].astype(np.float64)
+                self._numeric_values = values
+        return self._numeric_values
+
+    @property
+    def fingerprint(self):
+        """ A content hash of the column (dtype, length, values and, for object columns, cell types)
+
+        """
+        if self._fingerprint is None:
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(repr((str(self.series.dtype), self.length)).encode('utf-8'))
+            digest.update(pd.util.hash_pandas_object(self.series, index=False).to_numpy().tobytes())
+            if not self.is_numpy_numeric():
+                # Values are hashed through their string form, so also hash the cell types (e.g. 1 vs '1')
+                codes, uniques = self.cell_types
+                digest.update(repr([t.__module__ + '.' + t.__qualname__ for t in uniques]).encode('utf-8'))
+                digest.update(np.ascontiguousarray(codes).tobytes())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def row_hashes(self):
+        """ A 64 bit hash per cell of the column (value and, for object columns, cell type)
+
+        """
+        hashes = pd.util.hash_pandas_object(self.series, index=False).to_numpy()
+        if not self.is_numpy_numeric():
+            codes, uniques = self.cell_types
+            names = np.array([t.__module__ + '.' + t.__qualname__ for t in uniques], dtype=object)
+            hashes = hashes * np.uint64(31) + pd.util.hash_array(names)[codes]
+        return hashes
+
+    def block_fingerprints(self, block_size):
+        """ A content hash per block of block_size consecutive cells (the last block may be shorter)
+
+        """
+        if self.is_numpy_numeric():
+            # Numeric cells are hashed directly from their bytes
+            hashes = np.ascontiguousarray(self.series.to_numpy())
+            salt = str(hashes.dtype).encode('utf-8')
+        else:
+            hashes = self.row_hashes()
+            salt = b''
+        return [hashlib.blake2b(hashes[start:start + block_size].tobytes(), digest_size=16, salt=salt[:16]).digest()
+                for start in range(0, self.length, block_size)]
+
+
+#
+# Rule result cache
+#
+
+class ResultCache(object):
+    """ The _`ResultCache` object memoizes rule outcomes in memory, keyed by the column content
+    fingerprint, the rule function, the rule arguments and the evaluation path (vectorized or scalar).
+    Changing either the data or the rule (or its arguments) therefore results in a different key. Entries are evicted in least recently
+    used order once the (approximate) memory used by the stored results exceeds max_bytes
+
+    """
+
+    entry_overhead = 256
+
+    def __init__(self, max_bytes=2 ** 28):
+        """ Create a new (empty) result cache
+
+        :param max_bytes: the memory cap of the stored results
+        """
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Rules may be evaluated by several threads (e.g. the ValidationService_ workers)
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __getstate__(self):
+        # Copies sent to other processes (e.g. parallel workers) start empty
+        return {'max_bytes': self.max_bytes}
+
+    def __setstate__(self, state):
+        self.__init__(state['max_bytes'])
+
+    @staticmethod
+    def make_key(col, rule_function, rule_args, vectorized=True):
+        # The evaluation path is part of the key: outcomes of the vectorized and scalar implementations of a rule
+        # are not shared
+        path = 'vectorized' if vectorized and rule_function in VECTORIZED_RULES else 'scalar'
+        return col.fingerprint, rule_function, repr(rule_args), path
+
+    def get(self, key):
+        """ Return the cached (msg, result) of a key or None (cache miss)
+
+        """
+        with self.lock:
+            outcome = self.entries.get(key)
+            if outcome is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return outcome[0]
+
+    def put(self, key, outcome):
+        """ Store a (msg, result) outcome
+
+        """
+        size = self.entry_overhead + (outcome[1].nbytes if outcome[1] is not None else 0)
+        with self.lock:
+            if key in self.entries:
+                self.nbytes -= self.entries.pop(key)[1]
+            self.entries[key] = (outcome, size)
+            self.nbytes += size
+            while self.nbytes > self.max_bytes and len(self.entries) > 1:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.nbytes -= evicted
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.nbytes = 0
+
+    def info(self):
+        """ The cache counters (hits, misses, evictions, entries, bytes)
+
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'entries': len(self.entries), 'bytes': self.nbytes}
+
+
+#
+# Validation Results
+#
+
+class ValidationResult(object):
+    """ The _`ValidationResult` object stores the outcome of a rule over a column as packed bit arrays
+    (one bit per cell) together with an optional packed "not applicable" mask. The True / False / NA
+    counts are computed once on construction so that summaries never need to expand the bits
+
+    """
+
+    def __init__(self, result, not_applicable=None):
+        """ Create a new validation result
+
+        :param result: array-like of booleans (one per cell)
+        :param not_applicable: optional array-like of booleans flagging the cells where the rule does not apply
+        """
+        result = np.asarray(result, dtype=bool)
+        self.length = len(result)
+        self.bits = np.packbits(result)
+        if not_applicable is not None and np.any(not_applicable):
+            not_applicable = np.asarray(not_applicable, dtype=bool)
+            self.na_bits = np.packbits(not_applicable)
+            self.na_count = int(np.count_nonzero(not_applicable))
+            self.true_count = int(np.count_nonzero(result & ~not_applicable))
+        else:
+            self.na_bits = None
+            self.na_count = 0
+            self.true_count = int(np.count_nonzero(result))
+        self.false_count = self.length - self.true_count - self.na_count
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        return iter(self.to_array())
+
+    def __getitem__(self, index):
+        return self.to_array()[index]
+
+    def __reduce_ex__(self, protocol):
+        # With pickle protocol 5 the packed bits are passed as out-of-band buffers: they can be shared
+        # (e.g. memory-mapped) between processes without copies
+        if protocol < 5:
+            return object.__reduce_ex__(self, protocol)
+        na_bits = None if self.na_bits is None else pickle.PickleBuffer(self.na_bits)
+        return restore_result, (pickle.PickleBuffer(self.bits), na_bits, self.length, self.true_count, self.na_count)
+
+    def __eq__(self, other):
+        if not isinstance(other, ValidationResult):
+            return NotImplemented
+        return self.length == other.length and np.array_equal(self.bits, other.bits) and \
+            np.array_equal(self.not_applicable(), other.not_applicable())
+
+    def __repr__(self):
+        return 'ValidationResult(length={}, true={}, false={}, na={})'.format(
+            self.length, self.true_count, self.false_count, self.na_count)
+
+    @property
+    def nbytes(self):
+        """ Memory used by the packed bit arrays
+
+        """
+        return self.bits.nbytes + (0 if self.na_bits is None else self.na_bits.nbytes)
+
+    def to_array(self):
+        """ Expand the outcome into a numpy boolean array (one element per cell)
+
+        """
+        return np.unpackbits(self.bits, count=self.length).astype(bool)
+
+    def not_applicable(self):
+        """ Expand the "not applicable" mask into a numpy boolean array
+
+        """
+        if self.na_bits is None:
+            return np.zeros(self.length, dtype=bool)
+        return np.unpackbits(self.na_bits, count=self.length).astype(bool)
+
+    @property
+    def failures(self):
+        """ Sorted array of the row positions where the rule evaluates to False.
+        Only the packed bytes holding a failure are expanded
+
+        """
+        failed = ~self.bits
+        if self.na_bits is not None:
+            failed &= ~self.na_bits
+        return bitmap_positions(failed, self.length)
+
+
+def restore_result(bits, na_bits, length, true_count, na_count):
+    """ Rebuild a ValidationResult_ around (possibly shared, read-only) packed bit buffers
+
+    """
+    result = ValidationResult.__new__(ValidationResult)
+    result.length = length
+    result.bits = np.frombuffer(bits, dtype=np.uint8)
+    result.na_bits = None if na_bits is None else np.frombuffer(na_bits, dtype=np.uint8)
+    result.true_count = true_count
+    result.na_count = na_count
+    result.false_count = length - true_count - na_count
+    return result
+
+
+class ValidationCounts(object):
+    """ The _`ValidationCounts` object accumulates the outcome of a rule over a column that is
+    processed in successive chunks. It keeps only the True / False / NA counts and, optionally,
+    the (global) row positions of the failing cells
+
+    """
+
+    def __init__(self, keep_failures=False):
+        """ Create a new (empty) counts accumulator
+
+        :param keep_failures: also record the row positions where the rule evaluates to False
+        """
+        self.length = 0
+        self.true_count = 0
+        self.false_count = 0
+        self.na_count = 0
+        self.keep_failures = keep_failures
+        self._failures = []
+
+    def __len__(self):
+        return self.length
+
+    def __repr__(self):
+        return 'ValidationCounts(length={}, true={}, false={}, na={})'.format(
+            self.length, self.true_count, self.false_count, self.na_count)
+
+    def update(self, result, not_applicable, offset=0):
+        """ Add the outcome of the rule over a chunk
+
+        :param result: boolean array of the rule outcome per cell
+        :param not_applicable: boolean array flagging the cells where the rule does not apply
+        :param offset: the row position of the first cell of the chunk
+        """
+        failed = ~result & ~not_applicable
+        na_count = int(np.count_nonzero(not_applicable))
+        false_count = int(np.count_nonzero(failed))
+        self.length += len(result)
+        self.na_count += na_count
+        self.false_count += false_count
+        self.true_count += len(result) - na_count - false_count
+        if self.keep_failures and false_count:
+            self._failures.append(np.flatnonzero(failed) + offset)
+
+    def merge(self, other, offset=0):
+        """ Add the counts accumulated by another accumulator (e.g. over a partition of the column)
+
+        :param other: the ValidationCounts_ to add
+        :param offset: the row position of the first cell counted by the other accumulator
+        """
+        self.length += other.length
+        self.true_count += other.true_count
+        self.false_count += other.false_count
+        self.na_count += other.na_count
+        if self.keep_failures and other.keep_failures and other.false_count:
+            self._failures.append(other.failures + offset)
+
+    def add_counts(self, length, true_count, na_count, failures=None):
+        """ Add precomputed counts (e.g. the aggregates of a SQL query)
+
+        :param length: the number of cells
+        :param true_count: the number of cells where the rule evaluates to True
+        :param na_count: the number of cells where the rule does not apply
+        :param failures: the (global) row positions where the rule evaluates to False
+        """
+        self.length += length
+        self.true_count += true_count
+        self.na_count += na_count
+        self.false_count += length - true_count - na_count
+        if self.keep_failures and failures is not None and len(failures):
+            self._failures.append(np.asarray(failures, dtype=np.int64))
+
+    @property
+    def failures(self):
+        """ Sorted array of the row positions where the rule evaluates to False (None if not recorded)
+
+        """
+        if not self.keep_failures:
+            return None
+        if len(self._failures) != 1:
+            self._failures = [np.concatenate(self._failures) if self._failures else np.zeros(0, dtype=np.int64)]
+        return self._failures[0]
+
+    def status(self):
+        """ The validation status message corresponding to the accumulated outcome
+
+        """
+        if self.length == 0:
+            return "Empty Series"
+        elif self.na_count > 0:
+            return 'Rule Not Applicable'
+        else:
+            return 'Validated'
+
+
+def bitmap_positions(bitmap, length, n=None):
+    """ Sorted array of the positions of the set bits of a packed bitmap (at most the first n).
+    Only the bytes holding a set bit are expanded
+
+    """
+    nonzero = np.flatnonzero(bitmap)
+    if n is not None:
+        # Each non zero byte holds at least one position
+        nonzero = nonzero[:n]
+    rows, bits = np.nonzero(np.unpackbits(bitmap[nonzero]).reshape(-1, 8))
+    positions = nonzero[rows].astype(np.int64) * 8 + bits
+    # Drop the padding bits of the last byte
+    return positions[positions < length][:n]
+
+
+def positions_bitmap(positions, length):
+    """ The packed bitmap of a set of positions
+
+    """
+    flags = np.zeros(length, dtype=bool)
+    flags[positions] = True
+    return np.packbits(flags)
+
+
+class FailureIndex(object):
+    """ The _`FailureIndex` object indexes the failing rows of the validation outcomes per (frame, column, rule).
+    Failures are kept as packed bitmaps (one bit per row, taken from the packed ValidationResult_ bits)
+    and, once requested, as sorted integer arrays of row positions (int32 when the positions allow it).
+    Intersections and unions across rules are bitwise operations on the bitmaps, and only the bytes of the
+    outcome holding a failure are expanded, so drill-down queries never expand the full results
+
+    """
+
+    def __init__(self):
+        self.outcomes = {}
+        self.bitmaps = {}
+        self.positions = {}
+
+    def __len__(self):
+        return len(self.outcomes)
+
+    def __contains__(self, key):
+        return key in self.outcomes
+
+    def add(self, frame, column, rule, result):
+        """ Index the outcome of a rule over a column (replacing a previous outcome). Outcomes without
+        failures (or without recorded failure positions) are removed from the index
+
+        :param result: a ValidationResult_ or ValidationCounts_ (None if the rule did not validate)
+        """
+        key = (frame, column, rule)
+        self.bitmaps.pop(key, None)
+        self.positions.pop(key, None)
+        if result is None or result.false_count == 0 or \
+                (isinstance(result, ValidationCounts) and result.failures is None):
+            self.outcomes.pop(key, None)
+        else:
+            self.outcomes[key] = result
+
+    def clear(self):
+        self.outcomes = {}
+        self.bitmaps = {}
+        self.positions = {}
+
+    def keys(self, frame=None, column=None, rule=None):
+        """ The indexed (frame, column, rule) keys, optionally restricted to a frame, column or rule
+
+        """
+        return [key for key in self.outcomes if (frame is None or key[0] == frame) and
+                (column is None or key[1] == column) and (rule is None or key[2] == rule)]
+
+    def bitmap(self, key):
+        """ The packed bitmap of the failing rows of a (frame, column, rule) key
+
+        """
+        if key not in self.bitmaps:
+            outcome = self.outcomes[key]
+            if isinstance(outcome, ValidationCounts):
+                bitmap = positions_bitmap(outcome.failures, len(outcome))
+            else:
+                bitmap = ~outcome.bits
+                if outcome.na_bits is not None:
+                    bitmap &= ~outcome.na_bits
+                if len(outcome) % 8:
+                    # Clear the padding bits of the last byte
+                    bitmap[-1] &= np.uint8(0xFF << (8 - len(outcome) % 8) & 0xFF)
+            self.bitmaps[key] = bitmap
+        return self.bitmaps[key]
+
+    def compact(self, positions, length):
+        if length < 2 ** 31:
+            return positions.astype(np.int32)
+        return positions
+
+    def failures(self, frame, column, rule):
+        """ Sorted array of the failing row positions of a rule over a column (empty if there are none)
+
+        """
+        key = (frame, column, rule)
+        if key not in self.positions:
+            if key not in self.outcomes:
+                return np.zeros(0, dtype=np.int32)
+            length = len(self.outcomes[key])
+            self.positions[key] = self.compact(bitmap_positions(self.bitmap(key), length), length)
+        return self.positions[key]
+
+    def head(self, frame, column, rule, n=10):
+        """ The first n failing row positions of a rule over a column
+
+        """
+        key = (frame, column, rule)
+        if key in self.positions or key not in self.outcomes:
+            return self.failures(*key)[:n]
+        length = len(self.outcomes[key])
+        return self.compact(bitmap_positions(self.bitmap(key), length, n), length)
+
+    def combine(self, keys, operation, n=None):
+        keys = list(keys)
+        indexed = [key for key in keys if key in self.outcomes]
+        if not indexed or (operation is np.bitwise_and and len(indexed) < len(keys)):
+            return np.zeros(0, dtype=np.int32)
+        lengths = set(len(self.outcomes[key]) for key in indexed)
+        if len(lengths) > 1:
+            raise ValueError("Outcomes of different lengths cannot be combined: " + str(indexed))
+        length = lengths.pop()
+        bitmap = self.bitmap(indexed[0]).copy()
+        for key in indexed[1:]:
+            operation(bitmap, self.bitmap(key), out=bitmap)
+        return self.compact(bitmap_positions(bitmap, length, n), length)
+
+    def intersection(self, keys, n=None):
+        """ Sorted array of the rows failing all the given (frame, column, rule) keys (at most the first n)
+
+        """
+        return self.combine(keys, np.bitwise_and, n)
+
+    def union(self, keys, n=None):
+        """ Sorted array of the rows failing any of the given (frame, column, rule) keys (at most the first n)
+
+        """
+        return self.combine(keys, np.bitwise_or, n)
+
+    def top(self, frame, n=10, keys=None):
+        """ The rows of a frame that fail the most rules / columns
+
+        :param keys: restrict the count to the given (frame, column, rule) keys (all the keys of the frame if None)
+        :return: a DataFrame of row positions and failure counts, by descending failure count
+        """
+        if keys is None:
+            keys = self.keys(frame)
+        keys = [key for key in keys if key in self.outcomes]
+        if not keys:
+            return pd.DataFrame({'row': np.zeros(0, dtype=np.int64), 'failures': np.zeros(0, dtype=np.int64)})
+        length = len(self.outcomes[keys[0]])
+        if sum(self.outcomes[key].false_count for key in keys) * 8 < length:
+            # Sparse failures: count the (sorted) positions
+            positions = np.sort(np.concatenate([self.failures(*key) for key in keys]))
+            starts = np.flatnonzero(np.concatenate(([True], positions[1:] != positions[:-1])))
+            rows = positions[starts].astype(np.int64)
+            counts = np.diff(np.append(starts, len(positions)))
+        else:
+            counts = np.zeros(length, dtype=np.uint16)
+            for key in keys:
+                counts += np.unpackbits(self.bitmap(key), count=length)
+            rows = np.flatnonzero(counts)
+            counts = counts[rows].astype(np.int64)
+        if len(rows) > n:
+            # All the rows above the n-th largest count, then the first rows at that count
+            threshold = -np.partition(-counts, n - 1)[n - 1]
+            above = counts > threshold
+            at = np.flatnonzero(counts == threshold)[:n - int(above.sum())]
+            above[at] = True
+            rows, counts = rows[above], counts[above]
+        # By descending count, then by row position
+        order = np.lexsort((rows, -counts))
+        return pd.DataFrame({'row': rows[order], 'failures': counts[order]})
+
+    def summary(self):
+        """ The failure count of each indexed (frame, column, rule), by descending count
+
+        """
+        summary = pd.DataFrame([key + (outcome.false_count,) for key, outcome in self.outcomes.items()],
+                               columns=['frame', 'column', 'rule', 'false_count'])
+        return summary.sort_values('false_count', ascending=False, kind='stable').reset_index(drop=True)
+
+
+#
+# Validation Plots
+#
+# The polar plot draws each validated column as a ray (angle) and its rows along the radius. Coordinates
+# are computed from the packed result bits with array operations; large tables are either sampled with a
+# fixed stride (points) or aggregated into radial bins per column ring (density) so that the cost of
+# rendering does not depend on the row count
+#
+
+PLOT_BACKGROUND = '#0B0050'
+PLOT_COLORS = ('greenyellow', 'azure')
+
+
+def plotted_results(results):
+    """ The (column, ValidationResult) pairs of a results dictionary that can be plotted (streamed counts
+    carry no cell outcomes)
+
+    """
+    return [(col, result) for col, result in results.items() if isinstance(result, ValidationResult)]
+
+
+def passed_bits(result):
+    """ The packed bits of the cells where a rule evaluates to True (not applicable cells excluded)
+
+    """
+    if result.na_bits is None:
+        return result.bits
+    return result.bits & ~result.na_bits
+
+
+def polar_points(results, max_points=100000, dr=0.02):
+    """ The polar coordinates of the validated cells (one ray per column, one point per row). When there are
+    more than max_points cells, every k-th row of each column is taken so that at most max_points remain
+
+    :param results: a dictionary of column: ValidationResult_ (e.g. DataSource.results[frame])
+    :param max_points: the maximum number of points (None for all the cells)
+    :param dr: the radial distance between consecutive rows
+    :return: (theta, r, passed) arrays
+    """
+    columns = plotted_results(results)
+    dt = 2 * np.pi / max(len(columns), 1)
+    total = sum(len(result) for _, result in columns)
+    step = max(1, -(-total // max_points)) if max_points else 1
+    theta = []
+    r = []
+    passed = []
+    for j, (col, result) in enumerate(columns):
+        rows = np.arange(0, result.length, step)
+        # Read the sampled bits without expanding the column
+        bits = (passed_bits(result)[rows >> 3] >> (7 - (rows & 7)).astype(np.uint8)) & 1
+        theta.append(np.full(len(rows), (j + 1) * dt))
+        r.append(0.1 + dr * (rows + 1))
+        passed.append(bits.astype(bool))
+    if not columns:
+        return np.zeros(0), np.zeros(0), np.zeros(0, dtype=bool)
+    return np.concatenate(theta), np.concatenate(r), np.concatenate(passed)
+
+
+def polar_density(results, bins=256, dr=0.02):
+    """ The share of passing cells per column and radial bin (rows are grouped into at most bins runs of equal
+    length). The counts are taken from the packed bytes (a bin spans a whole number of bytes), so the cost
+    is one pass over the stored bits and the output size does not depend on the row count
+
+    :param results: a dictionary of column: ValidationResult_ (e.g. DataSource.results[frame])
+    :param bins: the maximum number of radial bins
+    :param dr: the radial distance between consecutive rows
+    :return: (theta_edges, r_edges, share) where share has one row per column and one column per bin
+        (NaN beyond the end of a column)
+    """
+    columns = plotted_results(results)
+    dt = 2 * np.pi / max(len(columns), 1)
+    max_length = max([len(result) for _, result in columns] + [1])
+    bin_rows = 8 * max(1, -(-max_length // (8 * bins)))
+    bin_no = -(-max_length // bin_rows)
+    popcount = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1, dtype=np.uint8)
+    share = np.full((len(columns), bin_no), np.nan)
+    for j, (col, result) in enumerate(columns):
+        if result.length == 0:
+            continue
+        counts = popcount[passed_bits(result)]
+        # Sum the byte counts of the full bins in place (buffered casts), then the partial last bin
+        step = bin_rows // 8
+        full = len(counts) // step
+        passed = counts[:full * step].reshape(full, step).sum(axis=1, dtype=np.int64)
+        if full * step < len(counts):
+            passed = np.append(passed, counts[full * step:].sum(dtype=np.int64))
+        cells = np.minimum(bin_rows, result.length - np.arange(len(passed)) * bin_rows)
+        share[j, :len(passed)] = passed / cells
+    theta_edges = (np.arange(len(columns) + 1) + 0.5) * dt
+    r_edges = 0.1 + dr * np.minimum(np.arange(bin_no + 1) * bin_rows, max_length)
+    return theta_edges, r_edges, share
+
+
+def plot_polar(results, ax=None, mode='auto', max_points=100000, bins=256, title='OpenCPM::DQToolkit',
+               filename=None):
+    """ Draw the polar validation plot of a results dictionary (requires matplotlib)
+
+    :param results: a dictionary of column: ValidationResult_ (e.g. DataSource.results[frame])
+    :param ax: the polar axes to draw on (a new figure if omitted)
+    :param mode: 'points' (sampled cells), 'density' (binned share of passing cells) or 'auto' (points up to
+        max_points cells, density above)
+    :param max_points: the maximum number of points drawn
+    :param bins: the number of radial bins in density mode
+    :param title: the figure title (new figures only)
+    :param filename: also save the figure to this file
+    :return: the axes
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import LinearSegmentedColormap
+
+    if ax is None:
+        fig = plt.figure(facecolor=PLOT_BACKGROUND)
+        fig.suptitle(title, fontsize=20, color='azure')
+        ax = fig.add_subplot(111, polar=True, facecolor=PLOT_BACKGROUND)
+        ax.set_xticklabels([])
+        ax.set_yticklabels([])
+    if mode == 'auto':
+        total = sum(len(result) for _, result in plotted_results(results))
+        mode = 'points' if total <= max_points else 'density'
+    with PROFILER.span('plot', mode=mode):
+        if mode == 'points':
+            theta, r, passed = polar_points(results, max_points)
+            # One marker collection per outcome (much cheaper to render than a per point colored scatter)
+            for mask, color in ((~passed, PLOT_COLORS[0]), (passed, PLOT_COLORS[1])):
+                ax.plot(theta[mask], r[mask], linestyle='none', marker='o', markersize=1.4, markeredgewidth=0,
+                        color=color, alpha=0.75)
+        else:
+            theta_edges, r_edges, share = polar_density(results, bins)
+            if len(share):
+                # Quads have straight edges: split each column wedge into steps of at most 2 degrees
+                width = theta_edges[1] - theta_edges[0]
+                steps = int(np.ceil(width / np.radians(2)))
+                theta_edges = theta_edges[0] + np.arange(len(share) * steps + 1) * width / steps
+                ax.pcolormesh(theta_edges, r_edges, np.ma.masked_invalid(np.repeat(share, steps, axis=0).T),
+                              cmap=LinearSegmentedColormap.from_list('validation', PLOT_COLORS), vmin=0, vmax=1,
+                              edgecolors='face', linewidth=0.25)
+    if filename is not None:
+        ax.figure.savefig(filename, facecolor=PLOT_BACKGROUND)
+    return ax
+
+
+#
+# Vectorized Rule Functions
+#
+# Each function evaluates a rule over a column profile and returns a pair of boolean arrays
+# (result, not_applicable) that reproduce the outcome of the scalar Rule functions cell by cell
+#
+
+def vec_IsPopulated(col):
+    return ~col.null_mask, np.zeros(col.length, dtype=bool)
+
+
+def vec_IsPositive(col):
+    return ~(col.numeric_values < 0), ~col.numeric_mask
+
+
+def vec_IsNonNegative(col):
+    return col.numeric_values >= 0, ~col.numeric_mask
+
+
+def vec_IsAtLeast(col, *args):
+    a = args[0]
+    return a <= col.numeric_values, ~col.numeric_mask
+
+
+def vec_IsAtMost(col, *args):
+    a = args[0]
+    return col.numeric_values <= a, ~col.numeric_mask
+
+
+def vec_InRange(col, *args):
+    a = args[0]
+    b = args[1]
+    x = col.numeric_values
+    return (a <= x) & (x <= b), ~col.numeric_mask
+
+
+def vec_IsType(col, *args):
+    control_type = args[0]
+    codes, uniques = col.cell_types
+    flags = np.array([t.__name__ == control_type for t in uniques], dtype=bool)
+    return flags[codes], np.zeros(col.length, dtype=bool)
+
+
+def vec_IsString(col):
+    codes, uniques = col.cell_types
+    # Cells that are neither numeric nor temporal and support len()
+    flags = np.array([not (issubclass(t, (int, float)) or t.__name__ in ['Timestamp', 'time', 'datetime'])
+                      and hasattr(t, '__len__') for t in uniques], dtype=bool)
+    result = flags[codes]
+    if col.is_arrow() and col.kind == 'string':
+        import pyarrow.compute as pc
+        # String lengths from the Arrow buffers (no python objects)
+        lengths = pc.fill_null(pc.utf8_length(col.arrow_array()), 0).to_numpy()
+        result &= lengths > 0
+    elif col.kind == 'string' and flags.sum() == 1 and str in list(uniques):
+        # Only str cells are candidates; they are non empty unless equal to ''
+        result[result] = col.object_values[result] != ''
+    elif result.any():
+        candidates = col.object_values[result]
+        lengths = np.fromiter(map(len, candidates), dtype=np.int64, count=len(candidates))
+        result[result] = lengths > 0
+    return result, np.zeros(col.length, dtype=bool)
+
+
+def contains(values, x):
+    """ The membership test of the scalar InList rule (x in values) for a single cell, with comparisons
+    that cannot be decided (e.g. pd.NA == 1) counted as no match
+
+    """
+    for value in values:
+        if x is value:
+            return True
+        try:
+            if x == value:
+                return True
+        except TypeError:
+            pass
+    return False
+
+
+def vec_InList(col, *args):
+    if col.is_arrow() and col.kind in ('int', 'float', 'string'):
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        # Membership test on the Arrow buffers, restricted to the values of a compatible type
+        if col.kind == 'string':
+            values = [v for v in args if isinstance(v, str)]
+        else:
+            values = [v for v in args if isinstance(v, (int, float)) and not isinstance(v, bool)]
+        if col.kind == 'int':
+            values = [int(v) for v in values if float(v).is_integer()]
+        array = col.arrow_array()
+        result = np.array(pc.fill_null(pc.is_in(array, value_set=pa.array(values, type=array.type)), False),
+                          dtype=bool)
+    elif col.is_arrow():
+        # Arrow arrays of other types are compared through their python values
+        result = np.array(pd.Series(col.object_values).isin(args), dtype=bool)
+    else:
+        result = np.array(col.series.isin(args), dtype=bool)
+    nulls = col.null_mask
+    if nulls.any():
+        # Missing cells only match by identity or equality of the value series.apply passes (e.g. a None cell
+        # matches None but a NaN float does not match np.nan), not by the NaN matching of isin
+        result[nulls] = col.series[nulls].apply(lambda x: contains(args, x)).to_numpy(dtype=bool)
+    return result, np.zeros(col.length, dtype=bool)
+
+
+VECTORIZED_RULES = {
+    'IsPopulated': vec_IsPopulated,
+    'IsPositive': vec_IsPositive,
+    'IsAtLeast': vec_IsAtLeast,
+    'IsAtMost': vec_IsAtMost,
+    'InRange': vec_InRange,
+    'IsNonNegative': vec_IsNonNegative,
+    'IsType': vec_IsType,
+    'IsString': vec_IsString,
+    'InList': vec_InList,
+}
+
+
+def rule_masks(rule_function, rule_args, col, vectorized=True):
+    """ Evaluate a rule function over a column profile and return the cell by cell outcome
+    as a pair of boolean arrays (result, not_applicable)
+
+    :param rule_function: the name of the rule function (e.g. 'IsPositive')
+    :param rule_args: the rule arguments (tuple or None)
+    :param col: the ColumnProfile_ of the series
+    :param vectorized: use the whole-column implementation when available
+    :return: (result, not_applicable)
+    """
+    if vectorized and rule_function in VECTORIZED_RULES:
+        result, not_applicable = VECTORIZED_RULES[rule_function](col, *(rule_args or ()))
+        # As with the scalar path, cells where the rule is not applicable do not count as passed
+        return np.asarray(result, dtype=bool) & ~not_applicable, not_applicable
+    rule = getattr(Rule, rule_function)
+    values = col.series.apply(rule, args=rule_args).values
+    # Cells where the rule function does not return a boolean are not applicable
+    not_applicable = np.fromiter((np.any(np.isnan(value)) for value in values), dtype=bool, count=len(values))
+    result = np.fromiter((not na and bool(value) for value, na in zip(values, not_applicable)), dtype=bool,
+                         count=len(values))
+    return result, not_applicable
+
+
+def evaluate_rule(rule_function, rule_args, col, vectorized=True, cache=None):
+    """ Evaluate a rule function over a column profile.
+    When applicable, it returns a ValidationResult_ (packed Booleans True/False)
+
+    :param rule_function: the name of the rule function (e.g. 'IsPositive')
+    :param rule_args: the rule arguments (tuple or None)
+    :param col: the ColumnProfile_ of the series
+    :param vectorized: use the whole-column implementation when available
+    :param cache: an optional ResultCache_ memoizing the outcome
+    :return: (msg, ValidationResult)
+    """
+    # Escape empty frames
+    if col.length == 0:
+        return "Empty Series", None
+    if cache is not None:
+        with PROFILER.span('cache_lookup', function=rule_function) as span:
+            key = cache.make_key(col, rule_function, rule_args, vectorized)
+            outcome = cache.get(key)
+            span.set(cache='miss' if outcome is None else 'hit')
+        if outcome is not None:
+            return outcome
+    with PROFILER.span('rule', function=rule_function, cells=col.length):
+        result, not_applicable = rule_masks(rule_function, rule_args, col, vectorized)
+    with PROFILER.span('bookkeeping', function=rule_function):
+        if not_applicable.any():
+            outcome = 'Rule Not Applicable', None
+        else:
+            outcome = 'Validated', ValidationResult(result)
+        if cache is not None:
+            cache.put(key, outcome)
+    return outcome
+
+
 class Rule(object):
     """ The _`Rule` object implements a collection of validation rules
 
 
     """
 
-    def __init__(self):
+    def __init__(self, vectorized=True, cache=None):
         """ Create a new collection of Rules
 
+        :param vectorized: use the whole-column implementation of a rule when one is available
+        :param cache: an optional ResultCache_ memoizing rule outcomes (True creates a default cache)
+
         """
+        self.vectorized = vectorized
+        if cache is True:
+            cache = ResultCache()
+        elif cache is False:
+            cache = None
+        self.cache = cache
         self.active_rule = None
         self.active_rule_name = None
         self.active_rule_args = None
@@ -301,31 +4279,13 @@ class Rule(object):
     # Apply a validation rule to a series
     def apply(self, series):
         """ Apply series against the activated validation rule.
-        When applicable, it returns a list of Booleans (True/False)
+        When applicable, it returns a ValidationResult_ (packed Booleans True/False)
+
+        :param series: the series or its ColumnProfile_ (e.g. the cached profile of a data source column)
         """
-        # Escape empty frames
-        if len(series) == 0:
-            result = None
-            msg = "Empty Series"
-            return msg, result
-        else:
-            rule = getattr(Rule, self.active_rule)
-            result = series.apply(rule, args=self.active_rule_args)
-            result_list = list(result.values)
-            print(result_list)
-            # Check that the rule application is valid
-            IsValid = True
-            # Test that all results are boolean
-            for value in range(len(result_list)):
-                # print(type(result_list[value]))
-                if np.isnan(result_list[value]):
-                    IsValid = False
-            if IsValid:
-                msg = 'Validated'
-                return msg, result_list
-            else:
-                msg = 'Rule Not Applicable'
-                return msg, None
+        col = series if isinstance(series, ColumnProfile) else ColumnProfile(series)
+        with PROFILER.span('apply', rule=self.active_rule_name, cells=col.length):
+            return evaluate_rule(self.active_rule, self.active_rule_args, col, self.vectorized, self.cache)
 
     #
     # Rule Functions
@@ -340,7 +4300,16 @@ class Rule(object):
             else:
                 return True
         else:
-            return np.NaN
+            return np.nan
+
+    def IsNonNegative(x):
+        if isinstance(x, (int, float)):
+            if x >= 0:
+                return True
+            else:
+                return False
+        else:
+            return np.nan
 
     def IsAtLeast(x, *args):
         a = args[0]
@@ -350,7 +4319,7 @@ class Rule(object):
             else:
                 return False
         else:
-            return [np.NaN]
+            return [np.nan]
 
     def IsAtMost(x, *args):
         a = args[0]
@@ -360,7 +4329,7 @@ class Rule(object):
             else:
                 return False
         else:
-            return [np.NaN]
+            return [np.nan]
 
     def InRange(x, *args):
         a = args[0]
@@ -371,7 +4340,7 @@ class Rule(object):
             else:
                 return False
         else:
-            return [np.NaN]
+            return [np.nan]
 
     def IsType(x, *args):
         control_type = args[0]
@@ -391,3 +4360,935 @@ class Rule(object):
             return True
         else:
             return False
+
+
+class ValidationPlan(object):
+    """ The _`ValidationPlan` object binds a set of validation rules (with their arguments and the
+    columns they apply to) so that they can be evaluated together in a single pass over the data.
+    Each column is profiled once and the profile is shared by all the rules that select it
+
+    """
+
+    def __init__(self, rules=None):
+        """ Create a new (empty) validation plan
+
+        :param rules: the Rule_ collection used to look up rule names (a default collection if omitted)
+
+        :Example:
+
+        .. code-block:: python
+
+            MyPlan = ValidationPlan()
+            MyPlan.add('R1')
+            MyPlan.add('R3', args=(100,), columns=['Original Balance', 'Current Balance'])
+            MySource.validate_plan(MyPlan)
+
+        """
+        if rules is None:
+            rules = Rule()
+        self.rules = rules
+        self.entries = []
+
+    def add(self, rule_name, args=None, columns=None, label=None):
+        """ Add a rule to the plan
+
+        :param rule_name: a rule name from the rule collection (e.g. 'R3')
+        :param args: override the default rule arguments
+        :param columns: the columns the rule applies to: None (all columns), a list of names or a callable
+        :param label: the key under which outcomes are stored (defaults to the rule name)
+        """
+        function, default_args = self.rules.rule_data(rule_name)[:2]
+        if label is None:
+            label = rule_name
+        if label in self.labels():
+            raise ValueError("Duplicate plan entry label: " + str(label))
+        if args is None:
+            args = default_args
+        self.entries.append((label, function, args, columns))
+
+    def labels(self):
+        return [entry[0] for entry in self.entries]
+
+    @staticmethod
+    def selects(entry, column):
+        """ Test whether a plan entry applies to a column
+
+        """
+        columns = entry[3]
+        if columns is None:
+            return True
+        elif callable(columns):
+            return bool(columns(column))
+        else:
+            return column in columns
+
+    def evaluate(self, series, column=None, timings=None):
+        """ Evaluate all the plan entries that select a column on its series
+
+        :param series: the series or its ColumnProfile_
+        :param timings: an optional dictionary receiving the evaluation time of each label
+        :return: a dictionary of label: (msg, ValidationResult)
+        """
+        col = series if isinstance(series, ColumnProfile) else ColumnProfile(series)
+        if column is None:
+            column = col.series.name
+        outcomes = {}
+        for entry in self.entries:
+            if self.selects(entry, column):
+                start = time.perf_counter()
+                with PROFILER.span('apply', rule=entry[0], cells=col.length):
+                    outcomes[entry[0]] = evaluate_rule(entry[1], entry[2], col, self.rules.vectorized,
+                                                       self.rules.cache)
+                if timings is not None:
+                    timings[entry[0]] = time.perf_counter() - start
+        return outcomes
+
+    def masks(self, series, column=None, timings=None):
+        """ Evaluate all the plan entries that select a column and return the raw cell by cell outcomes
+
+        :param timings: an optional dictionary receiving the evaluation time of each label
+        :return: a dictionary of label: (result, not_applicable)
+        """
+        if column is None:
+            column = series.name
+        col = ColumnProfile(series)
+        outcomes = {}
+        for entry in self.entries:
+            if self.selects(entry, column):
+                start = time.perf_counter()
+                with PROFILER.span('rule', rule=entry[0], function=entry[1], cells=col.length):
+                    outcomes[entry[0]] = rule_masks(entry[1], entry[2], col, self.rules.vectorized)
+                if timings is not None:
+                    timings[entry[0]] = time.perf_counter() - start
+        return outcomes
+
+
+#
+# Dataset Rule Functions
+#
+# Dataset rules test rows (several columns at once) or keys across frames. Each function evaluates a rule over
+# a frame of a data source and returns a pair of boolean arrays (result, not_applicable) with one value per row
+#
+
+COMPARISON_OPERATORS = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+
+def key_columns(columns):
+    if isinstance(columns, (list, tuple)):
+        return list(columns)
+    return [columns]
+
+
+def key_index(df, columns):
+    """ An index over the (compound) key values of the rows of a frame (hash based lookups)
+
+    """
+    if len(columns) == 1:
+        return pd.Index(df[columns[0]])
+    return pd.MultiIndex.from_frame(df[columns])
+
+
+def ds_IsUnique(source, frame, columns):
+    """ Rows whose (compound) key value occurs once in the frame. Duplicates are detected with a hash table
+    over the key values (missing key values compare equal)
+
+    """
+    df = source.df[frame]
+    result = ~df.duplicated(subset=key_columns(columns), keep=False).to_numpy(dtype=bool)
+    return result, np.zeros(len(df), dtype=bool)
+
+
+def ds_IsForeignKey(source, frame, columns, reference_frame, reference_columns=None, method='hash'):
+    """ Rows whose (compound) key value exists in the reference columns of another frame (e.g. another sheet).
+    The lookup is a hash join ('hash') or a binary search over the sorted reference keys ('sorted', single
+    column keys only). Missing key values never match
+
+    """
+    columns = key_columns(columns)
+    reference_columns = columns if reference_columns is None else key_columns(reference_columns)
+    df = source.df[frame]
+    reference = source.df[source.frame_index(reference_frame)]
+    result = None
+    if method == 'sorted' and len(columns) == 1:
+        values = df[columns[0]].to_numpy()
+        try:
+            keys = np.unique(reference[reference_columns[0]].dropna().to_numpy())
+            positions = np.searchsorted(keys, values).clip(0, max(len(keys) - 1, 0))
+            result = (keys[positions] == values) if len(keys) else np.zeros(len(df), dtype=bool)
+        except TypeError:
+            # Keys of mixed (non comparable) types cannot be sorted
+            result = None
+    if result is None:
+        result = key_index(df, columns).isin(key_index(reference, reference_columns))
+    result = np.asarray(result, dtype=bool) & df[columns].notnull().all(axis=1).to_numpy(dtype=bool)
+    return result, np.zeros(len(df), dtype=bool)
+
+
+def ds_Compare(source, frame, left, comparison, right):
+    """ Rows where the comparison between two numeric columns (or a column and a constant) holds,
+    e.g. ('Current Balance', '<=', 'Original Balance'). Rows with non numeric values are not applicable
+    (all rows when the right column is not in the frame)
+
+    """
+    df = source.df[frame]
+    compare = COMPARISON_OPERATORS[comparison]
+    left_col = source.profile(frame, left)
+    not_applicable = ~left_col.numeric_mask
+    if isinstance(right, str):
+        if right not in df:
+            # The rule does not apply to a frame without the right column
+            return np.zeros(len(df), dtype=bool), np.ones(len(df), dtype=bool)
+        right_col = source.profile(frame, right)
+        not_applicable = not_applicable | ~right_col.numeric_mask
+        right = right_col.numeric_values
+    with np.errstate(invalid='ignore'):
+        result = compare(left_col.numeric_values, right)
+    return np.asarray(result, dtype=bool), not_applicable
+
+
+def ds_RowPredicate(source, frame, predicate, columns=None):
+    """ Rows where a vectorized predicate holds. The predicate takes the frame (restricted to the given
+    columns) and returns a boolean array-like with one value per row (e.g. lambda df: df['a'] + df['b'] == df['c'])
+
+    """
+    df = source.df[frame]
+    if columns is not None:
+        df = df[key_columns(columns)]
+    result = np.asarray(predicate(df), dtype=bool)
+    return result, np.zeros(len(df), dtype=bool)
+
+
+DATASET_RULES = {
+    'IsUnique': ds_IsUnique,
+    'IsForeignKey': ds_IsForeignKey,
+    'Compare': ds_Compare,
+    'RowPredicate': ds_RowPredicate,
+}
+
+
+def dataset_rule_columns(rule_function, rule_args):
+    """ The columns of the validated frame that a dataset rule reads (None if not known)
+
+    """
+    args = rule_args or ()
+    if rule_function in ('IsUnique', 'IsForeignKey'):
+        return key_columns(args[0])
+    elif rule_function == 'Compare':
+        return [args[0]] + ([args[2]] if isinstance(args[2], str) else [])
+    elif rule_function == 'RowPredicate' and len(args) > 1 and args[1] is not None:
+        return key_columns(args[1])
+    return []
+
+
+def evaluate_dataset_rule(rule_function, rule_args, source, frame):
+    """ Evaluate a dataset rule function over a frame of a data source.
+    When applicable, it returns a ValidationResult_ (packed Booleans True/False, one per row)
+
+    :param rule_function: the name of the dataset rule function (e.g. 'IsUnique')
+    :param rule_args: the rule arguments (tuple)
+    :param source: the DataSource_
+    :param frame: the frame index
+    :return: (msg, ValidationResult)
+    """
+    if len(source.df[frame]) == 0:
+        return "Empty Frame", None
+    with PROFILER.span('rule', function=rule_function, cells=len(source.df[frame])):
+        result, not_applicable = DATASET_RULES[rule_function](source, frame, *(rule_args or ()))
+    if not_applicable.any():
+        return 'Rule Not Applicable', None
+    return 'Validated', ValidationResult(result)
+
+
+class DatasetPlan(object):
+    """ The _`DatasetPlan` object binds a set of dataset rules: rules over rows, multiple columns or keys
+    across frames (uniqueness, referential integrity, row-wise constraints), as opposed to the cell by cell
+    rules of a Rule_ collection
+
+    """
+
+    def __init__(self):
+        """ Create a new (empty) dataset plan
+
+        :Example:
+
+        .. code-block:: python
+
+            MyPlan = DatasetPlan()
+            MyPlan.add('D1', args=('Loan Identifier',), frames=['Loans'])
+            MyPlan.add('D2', args=('Borrower Identifier', 'Borrowers'), frames=['Loans'])
+            MyPlan.add('D3', args=('Current Balance', '<=', 'Original Balance'))
+            MySource.validate_dataset(MyPlan)
+            MySource.dataset_summary()
+
+        """
+        self.entries = []
+        self.rule_dict = {
+            'D1': ('IsUnique', "Tests uniqueness of a (compound) key (columns)"),
+            'D2': ('IsForeignKey', "Tests a key exists in another frame (columns, frame, frame columns, method)"),
+            'D3': ('Compare', "Tests a comparison between columns (column, operator, column or value)"),
+            'D4': ('RowPredicate', "Tests a vectorized row predicate (function, columns)"),
+        }
+
+    def show_rules(self):
+        """ Display all the currently available Dataset Rules
+
+        """
+        print("\n")
+        print("=" * 80)
+        print('{:<9}'.format("Rule_Name"), '{:<15}'.format("Function"), "Description")
+        print("=" * 80)
+        for rule_name in sorted(self.rule_dict.keys()):
+            print('{:^9}'.format(rule_name), '{:<15}'.format(self.rule_dict[rule_name][0]),
+                  self.rule_dict[rule_name][1])
+
+    def add(self, rule_name, args, frames=None, label=None):
+        """ Add a dataset rule to the plan
+
+        :param rule_name: a rule name (e.g. 'D1') or dataset rule function (e.g. 'IsUnique')
+        :param args: the rule arguments
+        :param frames: the frames (indexes or names) the rule applies to (all frames with the rule columns if None)
+        :param label: the key under which outcomes are stored (defaults to the rule name)
+        """
+        if rule_name in self.rule_dict:
+            function = self.rule_dict[rule_name][0]
+        elif rule_name in DATASET_RULES:
+            function = rule_name
+        else:
+            raise ValueError("Unknown dataset rule: " + str(rule_name))
+        if function == 'Compare':
+            if len(args) != 3:
+                raise ValueError("Compare takes (column, operator, column or value): " + str(args))
+            if args[1] not in COMPARISON_OPERATORS:
+                raise ValueError("Unknown comparison operator: " + str(args[1]))
+            right = args[2]
+            # The right operand is a column name or a real number
+            if not isinstance(right, str) and (isinstance(right, (bool, np.bool_)) or
+                                               not isinstance(right, (int, float, np.integer, np.floating))):
+                raise ValueError("Compare operand is neither a column nor a number: " + repr(right))
+        if label is None:
+            label = rule_name
+        if label in self.labels():
+            raise ValueError("Duplicate plan entry label: " + str(label))
+        self.entries.append((label, function, tuple(args), frames))
+
+    def labels(self):
+        return [entry[0] for entry in self.entries]
+
+    @staticmethod
+    def selects(entry, frame, name, df):
+        """ Test whether a plan entry applies to a frame (given by index and name)
+
+        """
+        frames = entry[3]
+        if frames is not None:
+            return frame in frames or (name is not None and name in frames)
+        return all(column in df for column in dataset_rule_columns(entry[1], entry[2]))
+
+
+class ValidationState(object):
+    """ The _`ValidationState` object keeps what an incremental validation run needs to revalidate only
+    what changed: a content fingerprint per block of rows of each frame / column and the cell by cell
+    outcome (result and "not applicable" masks) of each rule. It can be saved to and loaded from disk
+
+    """
+
+    def __init__(self, block_size=8192):
+        """ Create a new (empty) validation state
+
+        :param block_size: the number of rows per fingerprinted block
+        """
+        self.block_size = block_size
+        self.blocks = {}
+        self.outcomes = {}
+        self.last_run = {}
+
+    def changed_blocks(self, frame, column, blocks):
+        """ The indexes of the blocks whose fingerprint differs from the saved one (or that are new)
+
+        """
+        previous = self.blocks.get((frame, column), [])
+        return [block for block, digest in enumerate(blocks)
+                if block >= len(previous) or previous[block] != digest]
+
+    def merge(self, previous, blocks, length, series, function, args, vectorized=True, profiles=None):
+        """ Evaluate a rule function on the given blocks of a series and merge the outcome with the
+        previous outcome of the other (unchanged) blocks
+
+        :param previous: the ValidationResult_ of the previous run (None if there is none)
+        :param blocks: the indexes of the blocks to evaluate
+        :param length: the length of the series
+        :param series: the series
+        :param function: the rule function name
+        :param args: the rule arguments
+        :param vectorized: use the whole-column implementation when available
+        :param profiles: a dictionary of ColumnProfile_ per row range, shared between rules
+        :return: the merged ValidationResult_
+        """
+        if profiles is None:
+            profiles = {}
+        result = np.zeros(length, dtype=bool)
+        not_applicable = np.zeros(length, dtype=bool)
+        if previous is not None:
+            # Unchanged blocks lie within both lengths; changed ones are overwritten below
+            common = min(length, len(previous))
+            result[:common] = previous.to_array()[:common]
+            not_applicable[:common] = previous.not_applicable()[:common]
+        for first, last in self.block_runs(blocks):
+            rows = (first * self.block_size, min((last + 1) * self.block_size, length))
+            if rows not in profiles:
+                profiles[rows] = ColumnProfile(series.iloc[rows[0]:rows[1]])
+            run_result, run_na = rule_masks(function, args, profiles[rows], vectorized)
+            result[rows[0]:rows[1]] = run_result
+            not_applicable[rows[0]:rows[1]] = run_na
+            self.last_run['evaluated_cells'] = self.last_run.get('evaluated_cells', 0) + rows[1] - rows[0]
+        return ValidationResult(result, not_applicable)
+
+    @staticmethod
+    def block_runs(blocks):
+        """ Group sorted block indexes into runs of consecutive blocks [(first, last), ...]
+
+        """
+        runs = []
+        for block in blocks:
+            if runs and runs[-1][1] == block - 1:
+                runs[-1][1] = block
+            else:
+                runs.append([block, block])
+        return [tuple(run) for run in runs]
+
+    def save(self, filename):
+        with open(filename, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(filename):
+        """ Load a saved state (a new empty state if the file does not exist)
+
+        """
+        if not os.path.exists(filename):
+            return ValidationState()
+        with open(filename, 'rb') as f:
+            return pickle.load(f)
+
+
+#
+# Validation Service
+#
+# A long lived process keeping parsed data sources, compiled validation plans and rule outcomes in memory
+# between requests. Jobs (files x rules) are scheduled over a thread pool; a bounded number of pending tasks
+# provides backpressure (requests beyond the bound are rejected as busy instead of queued without limit)
+#
+
+class ServiceBusy(Exception):
+    """ Raised when a validation request does not fit in the pending task bound of a ValidationService_
+
+    """
+    pass
+
+
+class InvalidRequest(ValueError):
+    """ Raised when a validation request does not follow the request schema of a ValidationService_
+
+    """
+    pass
+
+
+class ValidationService(object):
+    """ The _`ValidationService` object validates batches of jobs (many files x many rules) while keeping its
+    state warm between batches:
+
+    * data sources are kept open (parsed frames stay in memory) and are only rebuilt when the file changes
+      (modification time or size)
+    * validation plans are compiled once per distinct rule list
+    * rule outcomes are memoized per column content (ResultCache_) and, for unchanged files, per job
+
+    Each (file, rules) task runs on a worker thread. Tasks on the same data source are serialized
+
+    .. note:: The Profiler_ keeps a single span stack, so profiling should stay disabled while jobs run
+        concurrently
+
+    """
+
+    def __init__(self, workers=4, max_pending=64, max_sources=32, cache=True, frame_cache=None):
+        """ Create a new validation service
+
+        :param workers: the number of worker threads
+        :param max_pending: the maximum number of tasks queued or running (backpressure bound)
+        :param max_sources: the number of data sources kept open (least recently used are closed first)
+        :param cache: the ResultCache_ shared by all the plans (True creates a default cache, False disables it)
+        :param frame_cache: an optional FrameCache_ (or cache directory) for parsed sheets across restarts
+
+        :Example:
+
+        .. code-block:: python
+
+            service = ValidationService(workers=4)
+            service.run({'jobs': [{'files': ['tape_1.xlsx', 'tape_2.xlsx'], 'options': {'header_row': 2},
+                                   'rules': ['R1', ['R3', [100]]]}]})
+
+        """
+        if cache is True:
+            cache = ResultCache()
+        if isinstance(frame_cache, str):
+            frame_cache = FrameCache(frame_cache)
+        self.rules = Rule(cache=cache)
+        self.frame_cache = frame_cache
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_sources = max_sources
+        from concurrent.futures import ThreadPoolExecutor
+        # Pay the numpy / pandas import cost when the service starts rather than on the first request
+        load_backends()
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.lock = threading.Lock()
+        # Signalled when pending tasks complete (requests wait on it for room in the pending bound)
+        self.task_completed = threading.Condition(self.lock)
+        self.pending = 0
+        self.sources = OrderedDict()
+        self.plans = {}
+        self.outcomes = OrderedDict()
+        self.counters = {'requests': 0, 'invalid': 0, 'tasks': 0, 'rejected': 0, 'sources_opened': 0,
+                         'memo_hits': 0}
+
+    @staticmethod
+    def source_kind(filename, kind=None):
+        """ The data source type of a file: 'xls', 'stream' or 'sql' (inferred from the file extension if omitted)
+
+        """
+        if kind is not None:
+            return kind
+        return 'xls' if str(filename).lower().endswith(('.xlsx', '.xlsm', '.xls')) else 'stream'
+
+    @staticmethod
+    def file_signature(filename):
+        stat = os.stat(filename)
+        return stat.st_mtime_ns, stat.st_size
+
+    def open_source(self, kind, filename, options):
+        """ Create a data source for a job
+
+        :param kind: 'xls', 'stream' or 'sql'
+        :param filename: the filename
+        :param options: the data source keyword arguments (e.g. header_row, sheets, streaming, chunksize)
+        """
+        options = dict(options)
+        if kind == 'xls':
+            header_row = options.pop('header_row', 0)
+            options.setdefault('cache', self.frame_cache)
+            return XLSDataSource(filename, header_row, **options)
+        elif kind == 'stream':
+            return StreamDataSource(filename, **options)
+        elif kind == 'sql':
+            return SQLDataSource(filename, **options)
+        raise ValueError("Unknown data source type: " + str(kind))
+
+    def source(self, kind, filename, options):
+        """ Return the warm data source of a file (opening it if needed, reopening it if the file changed)
+
+        :return: (entry, warm) where entry is the dictionary holding the source and its lock
+        """
+        key = (kind, os.path.abspath(str(filename)), json.dumps(options, sort_keys=True, default=str))
+        signature = self.file_signature(filename)
+        with self.lock:
+            entry = self.sources.get(key)
+            if entry is not None and entry['signature'] == signature:
+                self.sources.move_to_end(key)
+                return entry, True
+            if entry is None:
+                entry = {'key': key, 'lock': threading.Lock(), 'source': None, 'signature': None}
+                self.sources[key] = entry
+            while len(self.sources) > self.max_sources:
+                self.sources.popitem(last=False)
+        with entry['lock']:
+            if entry['signature'] != signature:
+                with PROFILER.span('open', filename=str(filename)):
+                    entry['source'] = self.open_source(kind, filename, options)
+                entry['signature'] = signature
+                with self.lock:
+                    self.counters['sources_opened'] += 1
+                return entry, False
+        return entry, True
+
+    def plan(self, rules):
+        """ Return the compiled ValidationPlan_ of a rule list. Each rule is given as a rule name ('R1'), a list
+        [rule name, args] or a dictionary {'rule': name, 'args': [...], 'columns': [...], 'label': ...}
+
+        :return: (plan key, ValidationPlan)
+        """
+        key = json.dumps(rules, sort_keys=True, default=str)
+        with self.lock:
+            plan = self.plans.get(key)
+        if plan is None:
+            plan = ValidationPlan(self.rules)
+            for rule in rules:
+                if isinstance(rule, str):
+                    rule = {'rule': rule}
+                elif isinstance(rule, (list, tuple)):
+                    rule = {'rule': rule[0], 'args': rule[1] if len(rule) > 1 else None}
+                args = rule.get('args')
+                label = rule.get('label')
+                if label is None and args is not None:
+                    label = '{}{}'.format(rule['rule'], tuple(args))
+                plan.add(rule['rule'], tuple(args) if args is not None else None, rule.get('columns'), label)
+            with self.lock:
+                plan = self.plans.setdefault(key, plan)
+        return key, plan
+
+    job_keys = {'files', 'filename', 'rules', 'source', 'options', 'frames'}
+
+    def check_request(self, request):
+        """ Check that a request follows the request schema (see submit), raising InvalidRequest_ otherwise
+
+        """
+
+        def check(condition, message):
+            if not condition:
+                raise InvalidRequest(message)
+
+        check(isinstance(request, dict), "The request must be a JSON object")
+        check(set(request) == {'jobs'}, "The request must only have a 'jobs' key, got: {}".format(sorted(request)))
+        check(isinstance(request['jobs'], list), "'jobs' must be a list")
+        for number, job in enumerate(request['jobs']):
+            prefix = 'jobs[{}]: '.format(number)
+            check(isinstance(job, dict), prefix + "a job must be a JSON object")
+            check(set(job) <= self.job_keys, prefix + "unknown keys: {}".format(sorted(set(job) - self.job_keys)))
+            check(('files' in job) != ('filename' in job), prefix + "exactly one of 'files' or 'filename' is required")
+            files = job['files'] if 'files' in job else [job['filename']]
+            check(isinstance(files, list) and all(isinstance(filename, str) for filename in files),
+                  prefix + "'files' must be a list of filenames ('filename' a filename)")
+            check(job.get('source') in (None, 'xls', 'stream', 'sql'),
+                  prefix + "'source' must be 'xls', 'stream' or 'sql'")
+            check(isinstance(job.get('options', {}), dict), prefix + "'options' must be a JSON object")
+            check(job.get('frames') is None or isinstance(job['frames'], list), prefix + "'frames' must be a list")
+            rules = job.get('rules')
+            check(isinstance(rules, list) and rules, prefix + "'rules' must be a non empty list")
+            for rule in rules:
+                if isinstance(rule, list):
+                    check(1 <= len(rule) <= 2 and (len(rule) == 1 or isinstance(rule[1], list)),
+                          prefix + "a rule list must be [rule name] or [rule name, [args]]: {}".format(rule))
+                    name = rule[0]
+                elif isinstance(rule, dict):
+                    check(set(rule) <= {'rule', 'args', 'columns', 'label'} and 'rule' in rule,
+                          prefix + "a rule object has the keys rule, args, columns and label: {}".format(rule))
+                    check(rule.get('args') is None or isinstance(rule['args'], list),
+                          prefix + "'args' must be a list: {}".format(rule))
+                    check(rule.get('columns') is None or isinstance(rule['columns'], list),
+                          prefix + "'columns' must be a list: {}".format(rule))
+                    name = rule['rule']
+                else:
+                    name = rule
+                check(isinstance(name, str) and name in self.rules.rule_dict,
+                      prefix + "unknown rule: {!r}".format(name))
+
+    def tasks(self, request):
+        """ Expand a request into (kind, filename, options, rules, frames) tasks, one per file of each job
+
+        """
+        try:
+            self.check_request(request)
+        except InvalidRequest:
+            with self.lock:
+                self.counters['invalid'] += 1
+            raise
+        tasks = []
+        for job in request['jobs']:
+            files = job['files'] if 'files' in job else [job['filename']]
+            for filename in files:
+                tasks.append((self.source_kind(filename, job.get('source')), filename, job.get('options', {}),
+                              job.get('rules', []), job.get('frames')))
+        return tasks
+
+    def execute(self, kind, filename, options, rules, frames=None):
+        """ Run a task: validate a file against a list of rules
+
+        :return: the task outcome (a dictionary with the ValidationRecord fields per frame / column / rule)
+        """
+        start = time.perf_counter()
+        try:
+            entry, warm = self.source(kind, filename, options)
+            plan_key, plan = self.plan(rules)
+            memo_key = (entry['key'], entry['signature'], plan_key, json.dumps(frames, default=str))
+            with self.lock:
+                records = self.outcomes.get(memo_key)
+                if records is not None:
+                    self.outcomes.move_to_end(memo_key)
+                    self.counters['memo_hits'] += 1
+            memo = records is not None
+            if records is None:
+                with entry['lock']:
+                    source = entry['source']
+                    source.report.clear()
+                    source.failure_index.clear()
+                    if frames is None:
+                        source.validate_plan(plan)
+                    else:
+                        for frame in frames:
+                            source.validate_plan(plan, source.frame_index(frame))
+                    names = list(source.frame_names)
+                    records = [dict(record._asdict(), frame=names[record.frame] if names else record.frame)
+                               for record in source.report]
+                with self.lock:
+                    self.outcomes[memo_key] = records
+                    while len(self.outcomes) > 16 * self.max_sources:
+                        self.outcomes.popitem(last=False)
+            return {'filename': str(filename), 'source': kind, 'warm': warm, 'memo': memo, 'records': records,
+                    'elapsed': time.perf_counter() - start}
+        except Exception as error:
+            return {'filename': str(filename), 'source': kind, 'error': '{}: {}'.format(type(error).__name__, error),
+                    'elapsed': time.perf_counter() - start}
+
+    def submit(self, request, timeout=0):
+        """ Schedule the tasks of a request on the worker pool
+
+        :param request: a dictionary {'jobs': [{'files': [...], 'rules': [...], 'source': ..., 'options': {...},
+            'frames': [...]}, ...]}. A job names its files ('files', or a single 'filename') and a non empty list of
+            rules (see plan); 'source' ('xls', 'stream' or 'sql'), 'options' (data source arguments) and 'frames'
+            are optional. Requests that do not follow this schema raise InvalidRequest_
+        :param timeout: how long to wait (seconds) for room in the pending task bound before raising ServiceBusy_
+        :return: the list of futures (one per task)
+        """
+        tasks = self.tasks(request)
+        with self.task_completed:
+            self.counters['requests'] += 1
+            if len(tasks) > self.max_pending:
+                self.counters['rejected'] += 1
+                raise ServiceBusy("Request has more tasks ({}) than the pending bound ({})".format(
+                    len(tasks), self.max_pending))
+            if not self.task_completed.wait_for(lambda: self.pending + len(tasks) <= self.max_pending, timeout):
+                self.counters['rejected'] += 1
+                raise ServiceBusy("Too many pending tasks ({})".format(self.pending))
+            self.pending += len(tasks)
+            self.counters['tasks'] += len(tasks)
+        futures = [self.executor.submit(self.execute, *task) for task in tasks]
+        for future in futures:
+            future.add_done_callback(self.task_done)
+        return futures
+
+    def task_done(self, future):
+        with self.task_completed:
+            self.pending -= 1
+            self.task_completed.notify_all()
+
+    def run(self, request, timeout=0):
+        """ Run a request and wait for its outcome
+
+        :return: a dictionary {'tasks': [task outcome, ...], 'elapsed': seconds}
+        """
+        start = time.perf_counter()
+        futures = self.submit(request, timeout)
+        return {'tasks': [future.result() for future in futures], 'elapsed': time.perf_counter() - start}
+
+    def status(self):
+        """ The service state: pending tasks, open sources, compiled plans, counters and result cache usage
+
+        """
+        with self.lock:
+            status = {'workers': self.workers, 'pending': self.pending, 'max_pending': self.max_pending,
+                      'sources': [entry['key'][1] for entry in self.sources.values()], 'plans': len(self.plans),
+                      'memoized': len(self.outcomes), 'counters': dict(self.counters)}
+        if self.rules.cache is not None:
+            status['cache'] = self.rules.cache.info()
+        return status
+
+    def clear(self):
+        """ Close all the data sources and drop the compiled plans and memoized outcomes
+
+        """
+        with self.lock:
+            self.sources.clear()
+            self.plans.clear()
+            self.outcomes.clear()
+        if self.rules.cache is not None:
+            self.rules.cache.clear()
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+
+class ServiceRequestHandler(http.server.BaseHTTPRequestHandler):
+    """ The _`ServiceRequestHandler` object is the HTTP interface of a ValidationServer_:
+
+    * POST /validate: run a request (JSON body), returns the task outcomes (400 when the request does not follow
+      the request schema, 503 when the service is busy)
+    * GET /status: the service state
+    * POST /clear: drop the warm state
+
+    """
+
+    def address_string(self):
+        # Unix socket clients have no address
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def send_json(self, code, body, headers=None):
+        data = json.dumps(body, default=str).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == '/status':
+            self.send_json(200, self.server.service.status())
+        else:
+            self.send_json(404, {'error': 'Not found: ' + self.path})
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            if length < 0:
+                raise ValueError(length)
+        except ValueError:
+            self.send_json(400, {'error': 'Invalid Content-Length: {}'.format(self.headers.get('Content-Length'))})
+            return
+        body = self.rfile.read(length) if length else b''
+        if self.path == '/clear':
+            self.server.service.clear()
+            self.send_json(200, {'cleared': True})
+        elif self.path == '/validate':
+            try:
+                request = json.loads(body or b'{}')
+            except ValueError as error:
+                self.send_json(400, {'error': 'Invalid JSON: {}'.format(error)})
+                return
+            try:
+                self.send_json(200, self.server.service.run(request, self.server.queue_timeout))
+            except InvalidRequest as error:
+                self.send_json(400, {'error': 'Invalid request: {}'.format(error)})
+            except ServiceBusy as error:
+                self.send_json(503, {'error': str(error)}, {'Retry-After': '1'})
+        else:
+            self.send_json(404, {'error': 'Not found: ' + self.path})
+
+
+if hasattr(socketserver, 'UnixStreamServer'):
+    class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        """ A threading HTTP server listening on a Unix socket
+
+        """
+        daemon_threads = True
+
+
+class ValidationServer(object):
+    """ The _`ValidationServer` object serves a ValidationService_ over HTTP on a local TCP port or a Unix socket
+
+    """
+
+    def __init__(self, service=None, host='127.0.0.1', port=8765, socket_path=None, queue_timeout=5,
+                 verbose=False, handler=ServiceRequestHandler):
+        """ Create a new validation server (it starts listening immediately)
+
+        :param service: the ValidationService_ (a default service if omitted)
+        :param host: the TCP host
+        :param port: the TCP port (0 picks a free port)
+        :param socket_path: listen on this Unix socket instead of TCP
+        :param queue_timeout: how long (seconds) a request waits for room in the pending bound before a 503
+        :param verbose: log the requests
+        :param handler: the request handler class (a ServiceRequestHandler_ subclass)
+
+        :Example:
+
+        .. code-block:: python
+
+            server = ValidationServer(ValidationService(workers=4), port=8765)
+            server.serve_forever()
+
+        """
+        self.service = service if service is not None else ValidationService()
+        self.socket_path = socket_path
+        if socket_path is not None:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            self.httpd = UnixHTTPServer(socket_path, handler)
+        else:
+            self.httpd = http.server.ThreadingHTTPServer((host, port), handler)
+        self.httpd.service = self.service
+        self.httpd.queue_timeout = queue_timeout
+        self.httpd.verbose = verbose
+        self.thread = None
+
+    @property
+    def address(self):
+        return self.socket_path if self.socket_path is not None else self.httpd.server_address[:2]
+
+    def serve_forever(self):
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.close()
+
+    def start(self):
+        """ Serve in a background thread
+
+        """
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def close(self):
+        if self.thread is not None:
+            self.httpd.shutdown()
+        self.httpd.server_close()
+        self.service.shutdown()
+        if self.socket_path is not None and os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+
+class UnixSocketConnection(http.client.HTTPConnection):
+    """ An http.client.HTTPConnection to a Unix socket (the host is only used in the request headers)
+
+    """
+
+    def __init__(self, socket_path, timeout=None):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+def service_request(address, request=None, path='/validate', timeout=None):
+    """ Send a request to a running ValidationServer_
+
+    :param address: (host, port) or a Unix socket path
+    :param request: the request dictionary (GET when None)
+    :param path: '/validate', '/status' or '/clear'
+    :return: (HTTP status, response dictionary)
+
+    :Example:
+
+    .. code-block:: python
+
+        code, response = service_request(('127.0.0.1', 8765), {'jobs': [{'files': [filename], 'rules': ['R1'],
+                                                                        'options': {'header_row': 2}}]})
+
+    """
+    if isinstance(address, str):
+        connection = UnixSocketConnection(address, timeout)
+    else:
+        connection = http.client.HTTPConnection(*address, timeout=timeout)
+    try:
+        if request is None:
+            connection.request('GET', path)
+        else:
+            connection.request('POST', path, json.dumps(request, default=str),
+                               {'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        return response.status, json.loads(response.read() or b'{}')
+    finally:
+        connection.close()
@@ -0,0 +1,290 @@
+# encoding: utf-8
+
+# (c) 2018-2024 Open Risk, all rights reserved
+#
+# DataQualityToolkit is licensed under the Apache 2.0 license a copy of which is included
+# in the source distribution of TransitionMatrix. This is notwithstanding any licenses of
+# third-party software included in this distribution. You may not use this file except in
+# compliance with the License.
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" This file is part of the DataQualityToolkit package.
+
+Benchmark harness for DataSource loading and Rule evaluation. Synthetic tables (tall, wide,
+mixed dtypes, null-heavy) and a many-sheet workbook modelled on datasets/EBA_Sample.xlsx are
+generated, then load time, per rule throughput (cells/sec), peak memory and validation_summary
+cost are measured. Results are written as JSON so that runs can be compared across commits
+
+Usage (from the repository root)::
+
+    PYTHONPATH=. python benchmarks/benchmark.py --scale 1 --output bench.json
+    PYTHONPATH=. python benchmarks/benchmark.py --compare old.json new.json
+    PYTHONPATH=. python benchmarks/benchmark.py --check-import 0.2
+
+The import check fails (exit status 1) when importing DQToolkit takes longer than the given number of
+seconds or loads one of the heavy backends (numpy, pandas, openpyxl, lxml, pyarrow, matplotlib, ...)
+
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from DQToolkit import DataSource
+from DQToolkit import Rule
+from DQToolkit import XLSDataSource
+
+EBA_SAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'datasets', 'EBA_Sample.xlsx')
+
+
+#
+# Synthetic data generators
+#
+
+def mixed_column(rng, n, kind, null_fraction=0.0):
+    """ Generate a column of a given kind: 'float', 'int', 'string', 'date', 'mixed' or 'bool' """
+    if kind == 'float':
+        values = pd.Series(rng.normal(100, 50, n))
+    elif kind == 'int':
+        values = pd.Series(rng.integers(-10, 1000, n))
+    elif kind == 'string':
+        values = pd.Series(rng.choice(['EUR', 'USD', 'GBP', 'CHF', ''], n), dtype=object)
+    elif kind == 'date':
+        values = pd.Series(pd.Timestamp('2020-01-01') + pd.to_timedelta(rng.integers(0, 3650, n), unit='D'))
+    elif kind == 'bool':
+        values = pd.Series(rng.random(n) < 0.5)
+    else:
+        pool = np.array([1, 2.5, 'text', '', pd.Timestamp('2021-06-30'), -3], dtype=object)
+        values = pd.Series(pool[rng.integers(0, len(pool), n)], dtype=object)
+    if null_fraction > 0:
+        values = values.astype(object) if kind in ('int', 'bool') else values
+        values[rng.random(n) < null_fraction] = None
+    return values
+
+
+def synthetic_table(rows, columns, kinds=('float', 'int', 'string', 'date', 'mixed'), null_fraction=0.0, seed=0):
+    """ Generate a table cycling through the given column kinds """
+    rng = np.random.default_rng(seed)
+    data = {}
+    for c in range(columns):
+        kind = kinds[c % len(kinds)]
+        data['{}_{}'.format(kind, c)] = mixed_column(rng, rows, kind, null_fraction)
+    return pd.DataFrame(data)
+
+
+def tables(scale):
+    """ The named synthetic tables of the benchmark """
+    return {
+        'tall': synthetic_table(200000 * scale, 5, kinds=('float', 'int')),
+        'wide': synthetic_table(2000 * scale, 500),
+        'mixed': synthetic_table(50000 * scale, 10),
+        'null_heavy': synthetic_table(50000 * scale, 10, null_fraction=0.6),
+    }
+
+
+def eba_like_workbook(filename, rows, sheets=None, seed=0):
+    """ Write a workbook with the sheet names and headers of the EBA sample (header at row 2) and synthetic rows """
+    rng = np.random.default_rng(seed)
+    template = pd.ExcelFile(EBA_SAMPLE, engine="openpyxl")
+    sheet_names = template.sheet_names if sheets is None else template.sheet_names[:sheets]
+    kinds = ('string', 'float', 'int', 'date', 'mixed')
+    with pd.ExcelWriter(filename, engine="openpyxl") as writer:
+        for sheet in sheet_names:
+            columns = list(pd.read_excel(template, sheet, header=2, nrows=0))
+            df = pd.DataFrame({col: mixed_column(rng, rows, kinds[c % len(kinds)], 0.1)
+                               for c, col in enumerate(columns)})
+            df.to_excel(writer, sheet_name=sheet, startrow=2, index=False)
+    return len(sheet_names)
+
+
+def memory_source(df):
+    """ Wrap a dataframe into a single frame DataSource """
+    source = DataSource()
+    source.df[0] = df
+    source.col_names[0] = list(df)
+    source.col_length[0] = len(df)
+    source.status[0] = {}
+    source.results[0] = {}
+    return source
+
+
+#
+# Measurements
+#
+
+def measure(function, repeat=1, trace_memory=True):
+    """ Run a function and return (best wall time, peak traced memory in bytes, last return value).
+    Timings come from untraced runs; the peak memory from one additional traced run """
+    best = None
+    value = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    peak = None
+    if trace_memory:
+        tracemalloc.start()
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return best, peak, value
+
+
+def benchmark_rules(name, df, rule_names, repeat):
+    results = []
+    cells = df.shape[0] * df.shape[1]
+    for rule_name in rule_names:
+        for vectorized in (True, False):
+            if not vectorized and cells > 600000:
+                # The scalar path is only sampled on smaller tables
+                continue
+            source = memory_source(df)
+            rule = Rule(vectorized=vectorized)
+            rule.activate(rule_name)
+            record = {'benchmark': 'rule', 'table': name, 'rule': rule_name, 'vectorized': vectorized,
+                      'rows': df.shape[0], 'columns': df.shape[1]}
+            try:
+                elapsed, peak, _ = measure(lambda: source.validate_all(rule), repeat, trace_memory=vectorized)
+            except Exception as e:
+                # e.g. scalar rule functions raising on unexpected cell types
+                record['error'] = repr(e)
+                results.append(record)
+                continue
+            summary_time, _, _ = measure(lambda: quiet(source.validation_summary), repeat, trace_memory=False)
+            record.update({'seconds': elapsed, 'cells_per_second': cells / elapsed if elapsed else None,
+                           'peak_bytes': peak, 'summary_seconds': summary_time})
+            results.append(record)
+    return results
+
+
+def benchmark_workbook(rows, sheets, repeat):
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, 'eba_like.xlsx')
+        sheet_no = eba_like_workbook(filename, rows, sheets)
+        for label, loader in [('open', lambda: XLSDataSource(filename, 2)),
+                              ('load_all', lambda: XLSDataSource(filename, 2).load()),
+                              ('load_one', lambda: XLSDataSource(filename, 2).df[0])]:
+            elapsed, peak, _ = measure(loader, repeat)
+            results.append({'benchmark': 'load', 'table': 'eba_like', 'mode': label, 'rows': rows, 'sheets': sheet_no,
+                            'seconds': elapsed, 'peak_bytes': peak})
+    return results
+
+
+HEAVY_MODULES = ('numpy', 'pandas', 'openpyxl', 'lxml', 'pyarrow', 'matplotlib', 'duckdb', 'aiohttp', 'asyncio')
+
+IMPORT_PROBE = """
+import sys, time
+start = time.perf_counter()
+import DQToolkit
+DQToolkit.Rule().rule_dict
+elapsed = time.perf_counter() - start
+print(elapsed)
+print(' '.join(sys.modules))
+"""
+
+
+def benchmark_import(repeat):
+    """ Time importing DQToolkit (and reading the rule metadata) in fresh interpreters and list the heavy
+    modules that were actually loaded (lazily imported modules that were not used do not count) """
+    root = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([root, os.environ.get('PYTHONPATH', '')]))
+    best = None
+    heavy = []
+    for _ in range(max(repeat, 3)):
+        output = subprocess.run([sys.executable, '-c', IMPORT_PROBE], capture_output=True, text=True, env=env,
+                                check=True).stdout.split('\n')
+        elapsed = float(output[0])
+        best = elapsed if best is None else min(best, elapsed)
+        heavy = [prefix for prefix in HEAVY_MODULES
+                 if any(name == prefix or name.startswith(prefix + '.') for name in output[1].split())]
+    return [{'benchmark': 'import', 'mode': 'DQToolkit', 'seconds': best, 'heavy_modules': heavy}]
+
+
+def check_import(budget, repeat=3):
+    """ Import time regression check: returns False (and prints the reason) if the budget is exceeded or
+    a heavy backend is loaded on import """
+    record = benchmark_import(repeat)[0]
+    print('Import time: {:.4f}s (budget {:.4f}s)'.format(record['seconds'], budget))
+    if record['heavy_modules']:
+        print('Heavy modules loaded on import:', ', '.join(record['heavy_modules']))
+    return record['seconds'] <= budget and not record['heavy_modules']
+
+
+def quiet(function):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return function()
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = None
+    return {'commit': commit, 'python': platform.python_version(), 'numpy': np.__version__,
+            'pandas': pd.__version__, 'machine': platform.machine(), 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S')}
+
+
+def run(scale=1, repeat=1, rules=('R1', 'R2', 'R3', 'R5', 'R6', 'R7', 'R8'), workbook_rows=2000, sheets=None):
+    results = benchmark_import(repeat)
+    for name, df in tables(scale).items():
+        results.extend(benchmark_rules(name, df, rules, repeat))
+    results.extend(benchmark_workbook(workbook_rows * scale, sheets, repeat))
+    return {'environment': environment(), 'results': results}
+
+
+def compare(old_file, new_file):
+    """ Print the relative change of the timings of two benchmark outputs """
+    with open(old_file) as f:
+        old = json.load(f)
+    with open(new_file) as f:
+        new = json.load(f)
+
+    def key(r):
+        return tuple((k, r[k]) for k in ('benchmark', 'table', 'rule', 'vectorized', 'mode') if k in r)
+
+    baseline = {key(r): r for r in old['results']}
+    print('{:<70}'.format('Benchmark'), '{:>10}'.format('Old (s)'), '{:>10}'.format('New (s)'), '{:>8}'.format('Ratio'))
+    for r in new['results']:
+        if key(r) in baseline and 'seconds' in r and 'seconds' in baseline[key(r)]:
+            before = baseline[key(r)]['seconds']
+            print('{:<70}'.format(str(dict(key(r)))), '{:>10.4f}'.format(before), '{:>10.4f}'.format(r['seconds']),
+                  '{:>8.2f}'.format(r['seconds'] / before if before else float('nan')))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='DataQualityToolkit benchmarks')
+    parser.add_argument('--scale', type=int, default=1, help='multiplier of the synthetic table sizes')
+    parser.add_argument('--repeat', type=int, default=1, help='repetitions per measurement (best time is kept)')
+    parser.add_argument('--sheets', type=int, default=None, help='number of sheets of the EBA-like workbook')
+    parser.add_argument('--output', default='bench_output.json', help='the JSON output file')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='compare two JSON outputs')
+    parser.add_argument('--check-import', type=float, metavar='SECONDS',
+                        help='only run the import time regression check with the given budget')
+    args = parser.parse_args()
+    if args.check_import is not None:
+        sys.exit(0 if check_import(args.check_import, args.repeat) else 1)
+    elif args.compare:
+        compare(*args.compare)
+    else:
+        output = run(args.scale, args.repeat, sheets=args.sheets)
+        with open(args.output, 'w') as f:
+            json.dump(output, f, indent=2)
+        print('Wrote', len(output['results']), 'measurements to', args.output)
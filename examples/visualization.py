@@ -16,10 +16,6 @@
 
 """
 
-import matplotlib.cm as cm
-import matplotlib.pyplot as plt
-import numpy as np
-
 from DQToolkit import Rule
 from DQToolkit import WikiDataSource
 
@@ -36,31 +32,7 @@ MyRule.activate('R4')
 # Instantiate a datasource object
 MySource = WikiDataSource(url)
 MySource.validate_all(MyRule)
-r = []
-theta = []
-colors = []
-dt = 2 * np.pi / MySource.result_no
-dr = 0.02
-ts = 0
-
-for col in MySource.results:
-    ts = ts + dt
-    rs = 0.1
-    if MySource.results[col] is not None:
-        for point in MySource.results[col]:
-            rs = rs + dr
-            r.append(rs)
-            theta.append(ts)
-            if point == np.True_:
-                colors.append('azure')
-            else:
-                colors.append('greenyellow')
 
-fig = plt.figure(facecolor='#0B0050')
-fig.suptitle('OpenCPM::DQToolkit', fontsize=20, color='azure')
-ax = fig.add_subplot(111, polar=True, facecolor='#0B0050')
-ax.set_xticklabels([])
-ax.set_yticklabels([])
-c = plt.scatter(theta, r, c=colors, s=2, cmap=cm.hsv)
-c.set_alpha(0.75)
-plt.savefig('Test.png', facecolor='#0B0050')
+# Polar plot of the stored results: one ray per column, rows along the radius.
+# Tables above max_points cells are drawn as the share of passing cells per radial bin
+MySource.plot_validation(frame=0, max_points=100000, bins=256, filename='Test.png')
@@ -0,0 +1,44 @@
+# encoding: utf-8
+
+# (c) 2018-2024 Open Risk, all rights reserved
+#
+# DataQualityToolkit is licensed under the Apache 2.0 license a copy of which is included
+# in the source distribution of TransitionMatrix. This is notwithstanding any licenses of
+# third-party software included in this distribution. You may not use this file except in
+# compliance with the License.
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" This file is part of the DataQualityToolkit package.
+
+"""
+
+from DQToolkit import ValidationServer, ValidationService
+from DQToolkit import service_request
+
+filename = "../datasets/EBA_Sample.xlsx"
+header_row = 2
+
+# Start a validation server in the background (parsed sheets, plans and outcomes stay warm between requests)
+MyServer = ValidationServer(ValidationService(workers=4), port=0).start()
+
+# A batch of jobs: each job validates a list of files against a list of rules
+MyRequest = {'jobs': [{'files': [filename], 'options': {'header_row': header_row},
+                       'rules': ['R1', ['R3', [100]], {'rule': 'R7', 'columns': ['Portfolio ID']}]}]}
+
+# The first request parses the workbook, repeat requests are served from the warm state
+for attempt in range(2):
+    code, response = service_request(MyServer.address, MyRequest)
+    print("Status: ", code, " Elapsed: ", response['elapsed'])
+
+# Display the outcomes that have failing cells
+for record in response['tasks'][0]['records']:
+    if record['false_count']:
+        print(record['frame'], record['column'], record['rule'], record['false_count'])
+
+# Inspect the service state and stop the server
+print(service_request(MyServer.address, path='/status')[1])
+MyServer.close()
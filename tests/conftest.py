@@ -0,0 +1,60 @@
+# encoding: utf-8
+
+# (c) 2018-2024 Open Risk, all rights reserved
+#
+# DataQualityToolkit is licensed under the Apache 2.0 license a copy of which is included
+# in the source distribution of TransitionMatrix. This is notwithstanding any licenses of
+# third-party software included in this distribution. You may not use this file except in
+# compliance with the License.
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from DQToolkit import DataSource
+
+EBA_SAMPLE = os.path.join(ROOT, 'datasets', 'EBA_Sample.xlsx')
+
+
+def frame_source(*frames):
+    """ An in-memory data source holding the given DataFrames (one frame each)
+
+    """
+    source = DataSource()
+    source.frame_no = len(frames)
+    for frame, df in enumerate(frames):
+        source.df[frame] = df
+        source.col_names[frame] = list(df.columns)
+        source.col_length[frame] = len(df)
+        source.status[frame] = {}
+        source.results[frame] = {}
+    return source
+
+
+def assert_same_outcomes(status, results, expected_status, expected_results):
+    """ Compare the status and the outcomes (ValidationResult or ValidationCounts) of the columns of a frame
+
+    """
+    assert status == expected_status
+    for col, msg in expected_status.items():
+        if msg != 'Validated':
+            continue
+        result = results[col]
+        expected = expected_results[col]
+        assert (result.true_count, result.false_count) == (expected.true_count, expected.false_count), col
+        np.testing.assert_array_equal(np.asarray(result.failures), np.asarray(expected.failures))
+
+
+@pytest.fixture
+def eba_sample():
+    return EBA_SAMPLE
@@ -0,0 +1,84 @@
+# encoding: utf-8
+
+# (c) 2018-2024 Open Risk, all rights reserved
+#
+# DataQualityToolkit is licensed under the Apache 2.0 license a copy of which is included
+# in the source distribution of TransitionMatrix. This is notwithstanding any licenses of
+# third-party software included in this distribution. You may not use this file except in
+# compliance with the License.
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Rules evaluated on Arrow-backed (dtype_backend='pyarrow') columns """
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from DQToolkit import ColumnProfile, Rule, StreamDataSource, XLSDataSource, rule_masks
+
+ARROW_COLUMNS = {
+    'double': pd.Series([1.5, -2.0, 3.0, 0.0, 12.0], dtype='double[pyarrow]'),
+    'double_nulls': pd.Series([1.5, -2.0, None, 0.0, 12.0], dtype='double[pyarrow]'),
+    'int64': pd.Series([1, -2, 3, 0, 12], dtype='int64[pyarrow]'),
+    'int64_nulls': pd.Series([1, -2, None, 0, 12], dtype='int64[pyarrow]'),
+}
+
+
+@pytest.mark.parametrize('rule_name', ['R2', 'R3', 'R4', 'R5', 'R8'])
+@pytest.mark.parametrize('column', sorted(ARROW_COLUMNS))
+def test_numeric_rules_match_scalar(column, rule_name):
+    series = ARROW_COLUMNS[column]
+    function, args = Rule().rule_data(rule_name)[:2]
+    expected = rule_masks(function, args, ColumnProfile(series), vectorized=False)
+    result = rule_masks(function, args, ColumnProfile(series), vectorized=True)
+    np.testing.assert_array_equal(result[0], expected[0])
+    np.testing.assert_array_equal(result[1], expected[1])
+
+
+def test_numeric_values_do_not_modify_series():
+    series = ARROW_COLUMNS['double'].copy()
+    values = ColumnProfile(series).numeric_values
+    values[:] = 0
+    assert series.tolist() == [1.5, -2.0, 3.0, 0.0, 12.0]
+
+
+def test_xls_pyarrow_backend(eba_sample):
+    sheet = '7. Loan'
+    rule = Rule()
+    rule.activate('R2')
+    arrow = XLSDataSource(eba_sample, 2, sheets=[sheet], dtype_backend='pyarrow')
+    arrow.validate_all(rule)
+    numpy = XLSDataSource(eba_sample, 2, sheets=[sheet])
+    numpy.validate_all(rule)
+    validated = [col for col, status in numpy.status[0].items() if status == 'Validated']
+    assert validated
+    for col in validated:
+        if str(arrow.df[0][col].dtype) in ('double[pyarrow]', 'int64[pyarrow]'):
+            assert arrow.status[0][col] == 'Validated'
+            assert arrow.results[0][col].false_count == numpy.results[0][col].false_count
+
+
+@pytest.mark.parametrize('file_format', ['csv', 'parquet'])
+def test_stream_statistics_pyarrow_backend(tmp_path, file_format):
+    df = pd.DataFrame({'a': [1.5, -2.0, None, 0.0, 12.0, 3.0, 1.5] * 3, 'b': [1, 2, 3, 4, 5, 6, 2] * 3,
+                       'c': ['x', 'y', None, 'x', 'z', 'y', 'x'] * 3})
+    filename = str(tmp_path / ('data.' + file_format))
+    if file_format == 'csv':
+        df.to_csv(filename, index=False)
+    else:
+        df.to_parquet(filename, index=False)
+    frames = []
+    for dtype_backend in (None, 'pyarrow'):
+        source = StreamDataSource(filename, chunksize=5, dtype_backend=dtype_backend)
+        source.scan(approximate=True)
+        frames.append(source.statistics.to_frame())
+    assert str(source.col_datatypes[0]['a']) == 'double[pyarrow]'
+    pd.testing.assert_frame_equal(frames[1], frames[0])
+    assert frames[1].loc['mean', 'a'] == pytest.approx(df['a'].mean())
+    assert frames[1].loc['distinct'].tolist() == pytest.approx([5, 6, 3], rel=0.01)
@@ -0,0 +1,96 @@
+# encoding: utf-8
+
+# (c) 2018-2024 Open Risk, all rights reserved
+#
+# DataQualityToolkit is licensed under the Apache 2.0 license a copy of which is included
+# in the source distribution of TransitionMatrix. This is notwithstanding any licenses of
+# third-party software included in this distribution. You may not use this file except in
+# compliance with the License.
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+""" Memoized rule outcomes (ResultCache) and parsed frames (FrameCache) """
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from DQToolkit import ColumnProfile, FrameCache, ResultCache, Rule, XLSDataSource, evaluate_rule
+
+
+def test_cache_hits_and_invalidation():
+    cache = ResultCache()
+    series = pd.Series([1.0, -2.0, 3.0])
+    first = evaluate_rule('IsPositive', None, ColumnProfile(series), cache=cache)
+    second = evaluate_rule('IsPositive', None, ColumnProfile(series.copy()), cache=cache)
+    assert second is first
+    assert cache.info()['hits'] == 1
+    evaluate_rule('IsPositive', None, ColumnProfile(pd.Series([1.0, -2.0, 4.0])), cache=cache)
+    evaluate_rule('IsAtLeast', (2,), ColumnProfile(series), cache=cache)
+    evaluate_rule('IsAtLeast', (3,), ColumnProfile(series), cache=cache)
+    assert cache.info()['misses'] == 4
+
+
+def test_cache_keeps_evaluation_paths_apart():
+    cache = ResultCache()
+    col = ColumnProfile(pd.Series([1, None, 3], dtype='Int64'))
+    assert cache.make_key(col, 'IsPositive', None, True) != cache.make_key(col, 'IsPositive', None, False)
+    # Rules without a vectorized implementation always use the scalar path
+    assert cache.make_key(col, 'Unknown', None, True) == cache.make_key(col, 'Unknown', None, False)
+    vectorized = Rule(vectorized=True, cache=cache)
+    scalar = Rule(vectorized=False, cache=cache)
+    for rule in (vectorized, scalar):
+        rule.activate('R2')
+        rule.apply(col.series)
+    assert cache.info()['entries'] == 2
+
+
+def test_cache_eviction():
+    cache = ResultCache(max_bytes=2 * ResultCache.entry_overhead + 64)
+    for shift in range(5):
+        evaluate_rule('IsPositive', None, ColumnProfile(pd.Series(np.arange(100.0) - shift)), cache=cache)
+    assert cache.info()['evictions'] > 0
+    assert cache.nbytes <= cache.max_bytes
+
+
+def test_frame_cache_cold_and_warm(eba_sample, tmp_path):
+    cache = FrameCache(str(tmp_path / 'frames'))
+    cold = XLSDataSource(eba_sample, 2, sheets=['7. Loan'], cache=cache)
+    assert not cold.is_cached(0)
+    cold_df = cold.df[0]
+    assert (cache.hits, cache.misses) == (0, 1)
+    warm = XLSDataSource(eba_sample, 2, sheets=['7. Loan'], cache=cache)
+    assert warm.is_cached(0)
+    pd.testing.assert_frame_equal(warm.df[0], cold_df)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_frame_cache_keys_the_reader(eba_sample, tmp_path):
+    cache = FrameCache(str(tmp_path / 'frames'))
+    XLSDataSource(eba_sample, 2, sheets=['7. Loan'], cache=cache).df[0]
+    streaming = XLSDataSource(eba_sample, 2, sheets=['7. Loan'], cache=cache, streaming=True)
+    assert not streaming.is_cached(0)
+    streaming.df[0]
+    assert cache.hits == 0
+    assert len(cache.entries()) == 2
+
+
+def test_frame_cache_eviction(tmp_path):
+    df = pd.DataFrame({'a': np.arange(10000.0)})
+    cache = FrameCache(str(tmp_path / 'frames'))
+    cache.put('first', 'sheet', df)
+    size = cache.size()
+    cache.max_bytes = int(2.5 * size)
+    cache.put('second', 'sheet', df)
+    # The second entry is the least recently used: the first one is read after it
+    os.utime(cache.entry_path('second'), (1, 1))
+    assert cache.get('first', 'sheet') is not None
+    cache.put('third', 'sheet', df)
+    assert sorted(key for _, _, key in cache.entries()) == ['first', 'third']
+    assert cache.size() <= cache.max_bytes
+    assert cache.get('second', 'sheet') is None and cache.misses == 1
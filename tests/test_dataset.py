@@ -0,0 +1,95 @@
+# encoding: utf-8
+
+# (c) 2018-2024 Open Risk, all rights reserved
+#
+# DataQualityToolkit is licensed under the Apache 2.0 license a copy of which is included
+# in the source distribution of TransitionMatrix. This is notwithstanding any licenses of
+# third-party software included in this distribution. You may not use this file except in
+# compliance with the License.
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+""" Dataset rules: uniqueness, foreign keys, comparisons and row predicates over frames """
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from DQToolkit import DatasetPlan, evaluate_dataset_rule
+from conftest import frame_source
+
+
+@pytest.fixture
+def source():
+    loans = pd.DataFrame({'loan': [1, 2, 2, np.nan, np.nan, 6],
+                          'pool': ['A', 'A', 'B', 'B', 'A', 'A'],
+                          'borrower': [10, 11, 12, np.nan, 99, 10],
+                          'current': [90.0, 50.0, 120.0, 10.0, 0.0, 5.0],
+                          'original': [100.0, 50.0, 100.0, 20.0, 10.0, 1.0],
+                          'name': ['a', 'b', 'c', 'd', 'e', 'f']})
+    borrowers = pd.DataFrame({'borrower': [10, 11, 12], 'pool': ['A', 'A', 'C'], 'mixed': [10, 'x', 11.0]})
+    source = frame_source(loans, borrowers)
+    source.frame_names = ['Loans', 'Borrowers']
+    return source
+
+
+def outcome(source, function, *args, frame=0):
+    msg, result = evaluate_dataset_rule(function, args, source, frame)
+    return msg, (result.to_array().tolist() if result is not None else None)
+
+
+def test_is_unique_missing_and_compound_keys(source):
+    # Missing key values compare equal
+    assert outcome(source, 'IsUnique', 'loan') == ('Validated', [True, False, False, False, False, True])
+    assert outcome(source, 'IsUnique', ['loan', 'pool']) == ('Validated', [True, True, True, True, True, True])
+
+
+@pytest.mark.parametrize('method', ['hash', 'sorted'])
+def test_is_foreign_key(source, method):
+    # Missing key values never match
+    assert outcome(source, 'IsForeignKey', 'borrower', 'Borrowers', None, method) == \
+        ('Validated', [True, True, True, False, False, True])
+    assert outcome(source, 'IsForeignKey', ['borrower', 'pool'], 1, None, method) == \
+        ('Validated', [True, True, False, False, False, True])
+
+
+def test_is_foreign_key_sorted_falls_back_on_mixed_types(source):
+    expected = outcome(source, 'IsForeignKey', 'borrower', 'Borrowers', 'mixed', 'hash')
+    assert outcome(source, 'IsForeignKey', 'borrower', 'Borrowers', 'mixed', 'sorted') == expected
+    assert expected == ('Validated', [True, True, False, False, False, True])
+
+
+def test_compare(source):
+    assert outcome(source, 'Compare', 'current', '<=', 'original') == \
+        ('Validated', [True, True, False, True, True, False])
+    assert outcome(source, 'Compare', 'current', '>', 40) == ('Validated', [True, True, True, False, False, False])
+    assert outcome(source, 'Compare', 'name', '<=', 'original') == ('Rule Not Applicable', None)
+    assert outcome(source, 'Compare', 'current', '<=', 'missing') == ('Rule Not Applicable', None)
+
+
+def test_row_predicate(source):
+    assert outcome(source, 'RowPredicate', lambda df: df['current'] + df['original'] > 100,
+                   ['current', 'original']) == ('Validated', [True, False, True, False, False, False])
+
+
+@pytest.mark.parametrize('args', [('current', '=<', 'original'), ('current', '<', None),
+                                  ('current', '<', ['original']), ('current', '<', True), ('current', '<')])
+def test_compare_rejects_invalid_arguments(args):
+    with pytest.raises(ValueError):
+        DatasetPlan().add('D3', args=args)
+
+
+def test_plan_selects_frames(source):
+    plan = DatasetPlan()
+    plan.add('D1', args=('borrower',))
+    plan.add('D2', args=('borrower', 'Borrowers'), frames=['Loans'], label='foreign_key')
+    plan.add('D3', args=('current', '<=', 'original'))
+    plan.add('D1', args=('mixed',), frames=[1], label='unique_mixed')
+    source.validate_dataset(plan)
+    assert source.dataset_status == {'D1': {0: 'Validated', 1: 'Validated'}, 'foreign_key': {0: 'Validated'},
+                                     'D3': {0: 'Validated'}, 'unique_mixed': {1: 'Validated'}}
+    assert source.dataset_results['D1'][0].false_count == 2
@@ -0,0 +1,70 @@
+# encoding: utf-8
+
+# (c) 2018-2024 Open Risk, all rights reserved
+#
+# DataQualityToolkit is licensed under the Apache 2.0 license a copy of which is included
+# in the source distribution of TransitionMatrix. This is notwithstanding any licenses of
+# third-party software included in this distribution. You may not use this file except in
+# compliance with the License.
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+""" Importing DQToolkit does not load numpy, pandas or the optional backends """
+
+import os
+import subprocess
+import sys
+
+from conftest import ROOT
+
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from benchmark import HEAVY_MODULES
+
+
+def run_python(code):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    return subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, env=env, check=True,
+                          cwd=ROOT).stdout.split()
+
+
+def test_import_does_not_load_backends():
+    loaded = run_python('import sys, DQToolkit; print(" ".join(sys.modules))')
+    heavy = [name for name in loaded if name.split('.')[0] in HEAVY_MODULES]
+    assert heavy == []
+
+
+FIRST_USE = """
+import sys, threading, DQToolkit
+
+def validate(outcomes):
+    rule = DQToolkit.Rule()
+    rule.activate('R8')
+    status, result = rule.apply(DQToolkit.pd.Series([1.0, -1.0]))
+    outcomes.append((status, result.true_count))
+
+outcomes = []
+threads = [threading.Thread(target=validate, args=(outcomes,)) for _ in range(4)]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+import numpy, pandas
+print(outcomes == [('Validated', 1)] * 4, DQToolkit.np is numpy, DQToolkit.pd is pandas)
+"""
+
+
+def test_backends_load_on_first_use():
+    # The first access from several threads at once binds the module globals to the real modules
+    assert run_python(FIRST_USE) == ['True', 'True', 'True']
+
+
+def test_import_budget():
+    # A generous bound: the benchmark check (benchmarks/benchmark.py --check-import) holds the tighter budget
+    elapsed = float(run_python('import time; start = time.perf_counter(); import DQToolkit; '
+                               'print(time.perf_counter() - start)')[0])
+    assert elapsed < 1.0
@@ -0,0 +1,97 @@
+# encoding: utf-8
+
+# (c) 2018-2024 Open Risk, all rights reserved
+#
+# DataQualityToolkit is licensed under the Apache 2.0 license a copy of which is included
+# in the source distribution of TransitionMatrix. This is notwithstanding any licenses of
+# third-party software included in this distribution. You may not use this file except in
+# compliance with the License.
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+""" Incremental validation reruns give the outcomes of a full validation, evaluating only the changed blocks """
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from DQToolkit import Rule, ValidationPlan, ValidationState
+from conftest import assert_same_outcomes, frame_source
+
+BLOCK_SIZE = 4
+
+
+def make_rule():
+    rule = Rule()
+    rule.activate('R2')
+    return rule
+
+
+def make_plan():
+    plan = ValidationPlan()
+    plan.add('R2')
+    plan.add('R8', label='non_negative')
+    return plan
+
+
+def loans(length=20):
+    rows = np.arange(length)
+    return pd.DataFrame({'a': np.where(rows % 7 == 3, -1.0, rows + 1.0),
+                         'b': pd.Series(rows, dtype=object).where(rows != 9, 'x')})
+
+
+def modified(df):
+    df = df.copy()
+    df.loc[5, 'a'] = -5.0
+    return df
+
+
+# (new data, evaluated rows per column and rule, columns re-evaluated)
+RERUNS = {
+    'unchanged': (loans, 0, 0),
+    'changed_block': (lambda: modified(loans()), BLOCK_SIZE, 1),
+    'appended': (lambda: loans(23), 3, 2),
+    'truncated': (lambda: loans(18), 2, 2),
+}
+
+
+def assert_same_as_full(source, expected, validator):
+    if isinstance(validator, ValidationPlan):
+        for label in validator.labels():
+            assert_same_outcomes(source.rule_status[label][0], source.rule_results[label][0],
+                                 expected.rule_status[label][0], expected.rule_results[label][0])
+    else:
+        assert_same_outcomes(source.status[0], source.results[0], expected.status[0], expected.results[0])
+    # Each outcome is recorded once
+    assert len(source.report) == len(expected.report)
+
+
+def full_run(df, validator):
+    source = frame_source(df)
+    if isinstance(validator, ValidationPlan):
+        source.validate_plan(validator)
+    else:
+        source.validate_frame(validator)
+    return source
+
+
+@pytest.mark.parametrize('make_validator', [make_rule, make_plan])
+@pytest.mark.parametrize('rerun', sorted(RERUNS))
+def test_incremental_rerun(make_validator, rerun):
+    validator = make_validator()
+    rules = len(validator.entries) if isinstance(validator, ValidationPlan) else 1
+    source = frame_source(loans())
+    state = source.validate_incremental(validator, ValidationState(block_size=BLOCK_SIZE))
+    assert state.last_run['evaluated_cells'] == 20 * 2 * rules
+    assert_same_as_full(source, full_run(loans(), validator), validator)
+
+    make_data, rows, columns = RERUNS[rerun]
+    df = make_data()
+    source = frame_source(df)
+    state = source.validate_incremental(validator, state)
+    assert state.last_run['evaluated_cells'] == rows * columns * rules
+    assert_same_as_full(source, full_run(df, validator), validator)
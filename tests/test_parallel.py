@@ -0,0 +1,50 @@
+# encoding: utf-8
+
+# (c) 2018-2024 Open Risk, all rights reserved
+#
+# DataQualityToolkit is licensed under the Apache 2.0 license a copy of which is included
+# in the source distribution of TransitionMatrix. This is notwithstanding any licenses of
+# third-party software included in this distribution. You may not use this file except in
+# compliance with the License.
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+""" Sheets parsed and validated in worker processes give the same outcomes as sequential validation """
+
+from DQToolkit import Rule, ValidationPlan, XLSDataSource
+from conftest import assert_same_outcomes
+
+SHEETS = ['1. Portfolio', '7. Loan', '11. Property']
+
+
+def test_parallel_validate_all(eba_sample):
+    rule = Rule()
+    rule.activate('R2')
+    sequential = XLSDataSource(eba_sample, 2, sheets=SHEETS)
+    sequential.validate_all(rule)
+    parallel = XLSDataSource(eba_sample, 2, sheets=SHEETS, workers=2)
+    parallel.validate_all(rule)
+    for frame in range(len(SHEETS)):
+        assert parallel.df.is_loaded(frame)
+        assert_same_outcomes(parallel.status[frame], parallel.results[frame],
+                             sequential.status[frame], sequential.results[frame])
+    assert [(r.frame, r.column, r.status) for r in parallel.report] == \
+        [(r.frame, r.column, r.status) for r in sequential.report]
+
+
+def test_parallel_validate_plan(eba_sample):
+    plan = ValidationPlan()
+    plan.add('R1')
+    plan.add('R5')
+    sequential = XLSDataSource(eba_sample, 2, sheets=SHEETS)
+    sequential.validate_plan(plan)
+    parallel = XLSDataSource(eba_sample, 2, sheets=SHEETS, workers=2)
+    parallel.validate_plan(plan)
+    for label in plan.labels():
+        for frame in range(len(SHEETS)):
+            assert_same_outcomes(parallel.rule_status[label][frame], parallel.rule_results[label][frame],
+                                 sequential.rule_status[label][frame], sequential.rule_results[label][frame])
@@ -0,0 +1,73 @@
+# encoding: utf-8
+
+# (c) 2018-2024 Open Risk, all rights reserved
+#
+# DataQualityToolkit is licensed under the Apache 2.0 license a copy of which is included
+# in the source distribution of TransitionMatrix. This is notwithstanding any licenses of
+# third-party software included in this distribution. You may not use this file except in
+# compliance with the License.
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+""" Partitioned validation matches the in-memory data source and drills down without materializing frames """
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from DQToolkit import PartitionedDataSource, Rule, write_partitions
+from conftest import assert_same_outcomes, frame_source
+
+
+@pytest.fixture
+def loans():
+    rng = np.random.default_rng(7)
+    return pd.DataFrame({'Balance': rng.normal(100, 80, 2500).round(2),
+                         'Rate': np.where(rng.random(2500) < 0.1, np.nan, rng.random(2500))})
+
+
+@pytest.fixture
+def partitions(loans, tmp_path):
+    return write_partitions(loans, str(tmp_path / 'loans'), partition_rows=400)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_partitioned_validate_all(loans, partitions, workers):
+    rule = Rule()
+    rule.activate('R8')
+    expected = frame_source(loans)
+    expected.validate_all(rule)
+    source = PartitionedDataSource(partitions, workers=workers, keep_failures=True)
+    source.validate_all(rule)
+    assert_same_outcomes(source.status[0], source.results[0], expected.status[0], expected.results[0])
+
+
+@pytest.mark.parametrize('how', ['all', 'any'])
+def test_failing_rows_reads_only_failing_partitions(loans, partitions, how):
+    rule = Rule()
+    rule.activate('R8')
+    source = PartitionedDataSource(partitions, keep_failures=True)
+    source.validate_all(rule)
+    checks = [('Balance', 'R8'), ('Rate', 'R8')]
+    rows = source.failing_rows(checks, how=how)
+    mask = (loans['Balance'] < 0) & loans['Rate'].isnull() if how == 'all' else \
+        (loans['Balance'] < 0) | loans['Rate'].isnull()
+    pd.testing.assert_frame_equal(rows, loans[mask])
+    pd.testing.assert_frame_equal(source.failing_rows(checks, n=5, how=how), loans[mask].head(5))
+    assert not source.df.is_loaded(0)
+
+
+def test_failing_rows_without_failures(partitions):
+    rule = Rule()
+    rule.activate('R1')
+    source = PartitionedDataSource(partitions, keep_failures=True)
+    source.validate_all(rule)
+    rows = source.failing_rows(('Balance', 'R1'))
+    assert rows.empty and list(rows.columns) == ['Balance', 'Rate']
+    assert not source.df.is_loaded(0)
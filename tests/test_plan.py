@@ -0,0 +1,81 @@
+# encoding: utf-8
+
+# (c) 2018-2024 Open Risk, all rights reserved
+#
+# DataQualityToolkit is licensed under the Apache 2.0 license a copy of which is included
+# in the source distribution of TransitionMatrix. This is notwithstanding any licenses of
+# third-party software included in this distribution. You may not use this file except in
+# compliance with the License.
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+""" A validation plan evaluates its rules with the same outcomes as one validation pass per rule """
+
+import pandas as pd
+import pytest
+
+from DQToolkit import Rule, StreamDataSource, ValidationPlan, XLSDataSource
+from conftest import assert_same_outcomes, frame_source
+
+RULE_NAMES = ['R1', 'R2', 'R3', 'R4', 'R5', 'R6', 'R7', 'R8']
+
+
+def full_plan():
+    plan = ValidationPlan()
+    for rule_name in RULE_NAMES:
+        plan.add(rule_name)
+    plan.add('R3', args=(0,), label='R3_zero')
+    return plan
+
+
+def assert_plan_matches_rules(source, plan, frame=0):
+    for label, function, args, columns in plan.entries:
+        rule = Rule()
+        rule.active_rule, rule.active_rule_name, rule.active_rule_args = function, label, args
+        source.status[frame] = {}
+        source.results[frame] = {}
+        source.validate_frame(rule, frame)
+        assert_same_outcomes(source.rule_status[label][frame], source.rule_results[label][frame],
+                             source.status[frame], source.results[frame])
+
+
+def test_plan_in_memory():
+    df = pd.DataFrame({'a': [1.5, -2.0, None, 12.0], 'b': [1, 'x', None, ''], 'c': [3, 4, 5, -1]})
+    source = frame_source(df)
+    plan = full_plan()
+    source.validate_plan(plan)
+    assert_plan_matches_rules(source, plan)
+
+
+def test_plan_xls(eba_sample):
+    source = XLSDataSource(eba_sample, 2, sheets=['7. Loan'])
+    plan = full_plan()
+    source.validate_plan(plan)
+    assert_plan_matches_rules(source, plan)
+
+
+def test_plan_column_selection():
+    df = pd.DataFrame({'a': [1, -2], 'b': [3, 4]})
+    source = frame_source(df)
+    plan = ValidationPlan()
+    plan.add('R2', columns=['b'])
+    plan.add('R8', columns=lambda column: column == 'a')
+    source.validate_plan(plan)
+    assert list(source.rule_status['R2'][0]) == ['b']
+    assert list(source.rule_status['R8'][0]) == ['a']
+    with pytest.raises(ValueError):
+        plan.add('R2')
+
+
+def test_plan_stream(tmp_path):
+    df = pd.DataFrame({'a': [1.5, -2.0, None, 12.0] * 50, 'b': [1, -3, 7, 0] * 50, 'c': ['x', '', None, 'y'] * 50})
+    filename = str(tmp_path / 'data.csv')
+    df.to_csv(filename, index=False)
+    source = StreamDataSource(filename, chunksize=64, keep_failures=True)
+    plan = full_plan()
+    source.validate_plan(plan)
+    assert_plan_matches_rules(source, plan)
@@ -0,0 +1,77 @@
+# encoding: utf-8
+
+# (c) 2018-2024 Open Risk, all rights reserved
+#
+# DataQualityToolkit is licensed under the Apache 2.0 license a copy of which is included
+# in the source distribution of TransitionMatrix. This is notwithstanding any licenses of
+# third-party software included in this distribution. You may not use this file except in
+# compliance with the License.
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+""" Column profiles (type inference) cached per data source column """
+
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from DQToolkit import ColumnProfile, Rule
+from conftest import frame_source
+
+
+@pytest.fixture
+def source():
+    return frame_source(pd.DataFrame({'a': [1.0, -2.0, 3.0], 'b': [1, 'x', None],
+                                      'c': pd.Series([1, None, 3], dtype='Int64')}))
+
+
+def test_profile_reused(source):
+    profile = source.profile(0, 'b')
+    assert source.profile(0, 'b') is profile
+    with contextlib.redirect_stdout(io.StringIO()):
+        source.describe()
+    rule = Rule()
+    for rule_name in ('R2', 'R6', 'R7'):
+        rule.activate(rule_name)
+        source.validate_frame(rule)
+    assert source.profile(0, 'b') is profile
+    assert profile.type_counts() == {'int': 1, 'str': 1, 'NoneType': 1}
+
+
+@pytest.mark.parametrize('column, value', [('a', -5.0), ('b', 2), ('c', 7)])
+def test_profile_invalidated_on_change(source, column, value):
+    rule = Rule()
+    rule.activate('R2')
+    profile = source.profile(0, column)
+    source.df[0].loc[0, column] = value
+    assert source.profile(0, column) is not profile
+    source.df[0][column] = source.df[0][column].copy()
+    changed = source.profile(0, column)
+    assert changed.series.iloc[0] == value
+    source.df[0] = source.df[0].copy()
+    assert source.profile(0, column) is not changed
+
+
+def test_profile_tracks_frame_replacement(source):
+    rule = Rule()
+    rule.activate('R2')
+    source.validate(column='a', Validation_Rule=rule)
+    assert source.results[0]['a'].false_count == 1
+    source.df[0] = pd.DataFrame({'a': [-1.0, -2.0, -3.0]})
+    source.validate(column='a', Validation_Rule=rule)
+    assert source.results[0]['a'].false_count == 3
+    source.clear_profiles(0)
+    assert not source.profiles
+
+
+def test_data_token():
+    series = pd.Series(np.arange(4.0))
+    assert ColumnProfile.data_token(series) == ColumnProfile.data_token(series[:])
+    assert ColumnProfile.data_token(series) != ColumnProfile.data_token(series.copy())
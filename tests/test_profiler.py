@@ -0,0 +1,54 @@
+# encoding: utf-8
+
+# (c) 2018-2024 Open Risk, all rights reserved
+#
+# DataQualityToolkit is licensed under the Apache 2.0 license a copy of which is included
+# in the source distribution of TransitionMatrix. This is notwithstanding any licenses of
+# third-party software included in this distribution. You may not use this file except in
+# compliance with the License.
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+""" Profiling instrumentation """
+
+import tracemalloc
+
+import pandas as pd
+
+from DQToolkit import Profiler, PROFILER, Rule
+from conftest import frame_source
+
+
+def test_profiler_records_spans():
+    source = frame_source(pd.DataFrame({'a': [1.0, -2.0, 3.0], 'b': ['x', 'y', None]}))
+    rule = Rule()
+    rule.activate('R2')
+    PROFILER.clear()
+    PROFILER.enable()
+    try:
+        source.validate_all(rule)
+    finally:
+        PROFILER.disable()
+    summary = PROFILER.summary(by=('column', 'name'))
+    PROFILER.clear()
+    assert ('a', 'validate') in summary.index
+    assert ('b', 'rule') in summary.index
+
+
+def test_profiler_stops_only_its_own_tracing():
+    profiler = Profiler()
+    tracemalloc.start()
+    try:
+        profiler.enable(trace_memory=True)
+        profiler.disable()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+    profiler.enable(trace_memory=True)
+    assert tracemalloc.is_tracing()
+    profiler.disable()
+    assert not tracemalloc.is_tracing()
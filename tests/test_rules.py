@@ -0,0 +1,81 @@
+# encoding: utf-8
+
+# (c) 2018-2024 Open Risk, all rights reserved
+#
+# DataQualityToolkit is licensed under the Apache 2.0 license a copy of which is included
+# in the source distribution of TransitionMatrix. This is notwithstanding any licenses of
+# third-party software included in this distribution. You may not use this file except in
+# compliance with the License.
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" The vectorized rule functions reproduce the scalar Rule functions cell by cell """
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from DQToolkit import ColumnProfile, Rule, rule_masks
+
+COLUMNS = {
+    'int': pd.Series([1, -2, 3, 0, 12]),
+    'float': pd.Series([1.5, -2.0, np.nan, 0.0, 12.0]),
+    'Int64': pd.Series([1, -2, None, 0, 12], dtype='Int64'),
+    'Int64_no_nulls': pd.Series([1, -2, 5, 0, 12], dtype='Int64'),
+    'Float64': pd.Series([1.5, -2.0, None, 0.0, 12.0], dtype='Float64'),
+    'boolean': pd.Series([True, False, None, True, False], dtype='boolean'),
+    'bool': pd.Series([True, False, True, True, False]),
+    'object': pd.Series([1, 'a', None, 2.5, np.nan], dtype=object),
+    'object_numbers': pd.Series([1, 2, None, -3, 10], dtype=object),
+    'str': pd.Series(['a', '', None, 'b', 'x'], dtype='str'),
+    'datetime': pd.Series(pd.to_datetime(['2020-01-01', None, '2021-01-01', '2020-02-02', '2020-01-03'])),
+}
+
+RULES = [
+    ('IsPopulated', None),
+    ('IsPositive', None),
+    ('IsNonNegative', None),
+    ('IsAtLeast', (10,)),
+    ('IsAtMost', (10,)),
+    ('InRange', (0, 1)),
+    ('IsType', ('int',)),
+    ('IsType', ('float',)),
+    ('IsType', ('bool',)),
+    ('IsType', ('str',)),
+    ('IsString', None),
+    ('InList', (1, 'a', 2.5, True)),
+    ('InList', (1, 'a', np.nan, None)),
+]
+
+
+@pytest.mark.parametrize('function, args', RULES, ids=[function + repr(args or '') for function, args in RULES])
+@pytest.mark.parametrize('column', sorted(COLUMNS))
+def test_vectorized_matches_scalar(column, function, args):
+    series = COLUMNS[column]
+    try:
+        expected = rule_masks(function, args, ColumnProfile(series), vectorized=False)
+    except TypeError:
+        pytest.skip('the scalar rule function is not defined on the missing cells of this column')
+    result = rule_masks(function, args, ColumnProfile(series), vectorized=True)
+    np.testing.assert_array_equal(result[1], expected[1])
+    np.testing.assert_array_equal(result[0], expected[0])
+
+
+@pytest.mark.parametrize('column', sorted(COLUMNS))
+def test_rule_apply_status(column):
+    vectorized = Rule(vectorized=True)
+    scalar = Rule(vectorized=False)
+    for rule_name in sorted(vectorized.rule_dict):
+        vectorized.activate(rule_name)
+        scalar.activate(rule_name)
+        try:
+            expected_msg, expected = scalar.apply(COLUMNS[column])
+        except TypeError:
+            continue
+        msg, result = vectorized.apply(COLUMNS[column])
+        assert msg == expected_msg, rule_name
+        if expected is not None:
+            np.testing.assert_array_equal(result.to_array(), expected.to_array())
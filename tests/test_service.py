@@ -0,0 +1,112 @@
+# encoding: utf-8
+
+# (c) 2018-2024 Open Risk, all rights reserved
+#
+# DataQualityToolkit is licensed under the Apache 2.0 license a copy of which is included
+# in the source distribution of TransitionMatrix. This is notwithstanding any licenses of
+# third-party software included in this distribution. You may not use this file except in
+# compliance with the License.
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+""" The validation service (warm state, batched jobs, backpressure) and its HTTP interface """
+
+import json
+import threading
+
+import pytest
+
+from DQToolkit import (InvalidRequest, ServiceBusy, ValidationServer, ValidationService, XLSDataSource, Rule,
+                       service_request)
+
+
+@pytest.fixture
+def server():
+    server = ValidationServer(ValidationService(workers=2), port=0).start()
+    yield server
+    server.close()
+
+
+def test_validate_request(server, eba_sample):
+    request = {'jobs': [{'files': [eba_sample], 'options': {'header_row': 2, 'sheets': ['7. Loan']},
+                         'rules': ['R2', ['R3', [100]]]}]}
+    code, response = service_request(server.address, request)
+    assert code == 200
+    task = response['tasks'][0]
+    assert not task['warm'] and 'error' not in task
+    expected = XLSDataSource(eba_sample, 2, sheets=['7. Loan'])
+    rule = Rule()
+    rule.activate('R2')
+    expected.validate_all(rule)
+    statuses = {record['column']: record['status'] for record in task['records'] if record['rule'] == 'R2'}
+    assert statuses == expected.status[0]
+    code, response = service_request(server.address, request)
+    assert response['tasks'][0]['warm'] and response['tasks'][0]['memo']
+
+
+@pytest.mark.parametrize('request_body', [
+    [],
+    {'jobs': 'x'},
+    {'rules': 'R2'},
+    {'jobs': ['x']},
+    {'jobs': [{'files': 'a.csv', 'rules': ['R1']}]},
+    {'jobs': [{'files': ['a.csv']}]},
+    {'jobs': [{'files': ['a.csv'], 'rules': ['R99']}]},
+    {'jobs': [{'files': ['a.csv'], 'rules': [['R3', 100]]}]},
+    {'jobs': [{'files': ['a.csv'], 'rules': ['R1'], 'source': 'ftp'}]},
+    {'jobs': [{'files': ['a.csv'], 'rules': ['R1'], 'extra': 1}]},
+])
+def test_invalid_requests(server, request_body):
+    code, response = service_request(server.address, request_body)
+    assert code == 400
+    assert response['error'].startswith('Invalid request')
+    assert server.service.status()['counters']['invalid'] == 1
+
+
+def test_invalid_json(server):
+    from http.client import HTTPConnection
+    connection = HTTPConnection(*server.address)
+    connection.request('POST', '/validate', b'{not json', {'Content-Type': 'application/json'})
+    assert connection.getresponse().status == 400
+    connection.close()
+
+
+@pytest.mark.parametrize('content_length', ['abc', '-5', ''])
+def test_invalid_content_length(server, content_length):
+    from http.client import HTTPConnection
+    connection = HTTPConnection(*server.address, timeout=5)
+    connection.putrequest('POST', '/validate')
+    connection.putheader('Content-Length', content_length)
+    connection.endheaders()
+    response = connection.getresponse()
+    assert response.status == 400
+    assert json.loads(response.read())['error'].startswith('Invalid Content-Length')
+    connection.close()
+    assert service_request(server.address, path='/status')[0] == 200
+
+
+def test_backpressure():
+    service = ValidationService(workers=1, max_pending=1, cache=False)
+    release = threading.Event()
+    service.execute = lambda *task: release.wait(5)
+    request = {'jobs': [{'files': ['a.csv'], 'rules': ['R1']}]}
+    first = service.submit(request)
+    with pytest.raises(ServiceBusy):
+        service.submit(request, timeout=0)
+    with pytest.raises(ServiceBusy):
+        service.submit({'jobs': [{'files': ['a.csv', 'b.csv'], 'rules': ['R1']}]}, timeout=5)
+    waiting = []
+    thread = threading.Thread(target=lambda: waiting.append(service.submit(request, timeout=5)))
+    thread.start()
+    release.set()
+    thread.join(5)
+    assert waiting and all(future.result() for future in first + waiting[0])
+    counters = service.status()['counters']
+    assert (counters['requests'], counters['tasks'], counters['rejected']) == (4, 2, 2)
+    with pytest.raises(InvalidRequest):
+        service.run({'jobs': [{'filename': 1, 'rules': ['R1']}]})
+    service.shutdown()
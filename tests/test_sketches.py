@@ -0,0 +1,123 @@
+# encoding: utf-8
+
+# (c) 2018-2024 Open Risk, all rights reserved
+#
+# DataQualityToolkit is licensed under the Apache 2.0 license a copy of which is included
+# in the source distribution of TransitionMatrix. This is notwithstanding any licenses of
+# third-party software included in this distribution. You may not use this file except in
+# compliance with the License.
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+""" Approximate quantiles and distinct counts stay within their error bounds, also when merged """
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from DQToolkit import ApproximateStatistics, HyperLogLog, QuantileSketch
+
+LEVELS = [0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99]
+
+
+@pytest.fixture
+def values():
+    return np.random.default_rng(11).lognormal(0, 1, 200000)
+
+
+def rank_errors(sketch, values):
+    ordered = np.sort(values)
+    ranks = np.searchsorted(ordered, sketch.quantiles(LEVELS), side='right') / len(values)
+    return np.abs(ranks - np.asarray(LEVELS))
+
+
+def partitions(values, count=7):
+    return np.array_split(values, count)
+
+
+def test_quantiles_exact_while_small():
+    sketch = QuantileSketch(k=200, seed=1)
+    sketch.update([5.0, np.nan, 1.0, 3.0, 2.0, 4.0])
+    assert sketch.n == 5 and sketch.rank_error == 0.0
+    assert sketch.quantiles([0.0, 0.5, 1.0]) == [1.0, 3.0, 5.0]
+
+
+def test_quantiles_within_rank_error(values):
+    sketch = QuantileSketch(k=200, seed=1)
+    for chunk in np.array_split(values, 40):
+        sketch.update(chunk)
+    assert sketch.n == len(values)
+    assert 0 < sketch.rank_error < 0.02
+    assert rank_errors(sketch, values).max() <= sketch.rank_error
+
+
+def test_merged_quantiles_match_single_pass(values):
+    single = QuantileSketch(k=200, seed=1)
+    single.update(values)
+    merged = QuantileSketch(k=200, seed=2)
+    for part in partitions(values):
+        sketch = QuantileSketch(k=200, seed=3)
+        sketch.update(part)
+        merged.merge(sketch)
+    assert merged.n == single.n
+    assert rank_errors(merged, values).max() <= merged.rank_error
+    assert sum(map(len, merged.levels)) <= 2 * sum(map(len, single.levels))
+
+
+def distinct_values():
+    rng = np.random.default_rng(5)
+    return pd.Series(rng.integers(0, 50000, 150000))
+
+
+def test_distinct_within_relative_error():
+    series = distinct_values()
+    sketch = HyperLogLog(p=14)
+    sketch.update(HyperLogLog.hash_values(series))
+    exact = series.nunique()
+    # Three standard errors
+    assert abs(sketch.estimate() - exact) / exact <= 3 * sketch.relative_error
+
+
+def test_distinct_hashes_ignore_the_chunk_dtype():
+    assert (HyperLogLog.hash_values(pd.Series([1, 2, 3])) ==
+            HyperLogLog.hash_values(pd.Series([1.0, 2.0, np.nan, 3.0]))).all()
+
+
+def test_merged_distinct_matches_single_pass():
+    series = distinct_values()
+    single = HyperLogLog(p=12)
+    single.update(HyperLogLog.hash_values(series))
+    merged = HyperLogLog(p=12)
+    for part in np.array_split(np.arange(len(series)), 7):
+        sketch = HyperLogLog(p=12)
+        sketch.update(HyperLogLog.hash_values(series.iloc[part]))
+        merged.merge(sketch)
+    np.testing.assert_array_equal(merged.registers, single.registers)
+    assert merged.estimate() == single.estimate()
+
+
+def test_merged_statistics_match_single_pass(values):
+    df = pd.DataFrame({'amount': values[:50000], 'grade': np.array(list('ABCDE'))[np.arange(50000) % 5]})
+    df.loc[::97, 'amount'] = np.nan
+    single = ApproximateStatistics()
+    for chunk in np.array_split(np.arange(len(df)), 10):
+        single.update(df.iloc[chunk])
+    merged = ApproximateStatistics()
+    for part in np.array_split(np.arange(len(df)), 4):
+        statistics = ApproximateStatistics()
+        statistics.update(df.iloc[part])
+        merged.merge(statistics)
+    single, merged = single.to_frame(), merged.to_frame()
+    exact = ['count', 'nulls', 'mean', 'std', 'min', 'max', 'distinct', 'distinct_error']
+    pd.testing.assert_frame_equal(merged.loc[exact], single.loc[exact])
+    assert merged.loc['count', 'amount'] == df['amount'].count()
+    assert merged.loc['mean', 'amount'] == pytest.approx(df['amount'].mean())
+    assert merged.loc['distinct', 'grade'] == pytest.approx(5, rel=0.01)
+    ordered = np.sort(df['amount'].dropna())
+    for level in ('25%', '50%', '75%'):
+        rank = np.searchsorted(ordered, merged.loc[level, 'amount'], side='right') / len(ordered)
+        assert abs(rank - float(level[:-1]) / 100) <= merged.loc['rank_error', 'amount']
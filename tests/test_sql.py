@@ -0,0 +1,73 @@
+# encoding: utf-8
+
+# (c) 2018-2024 Open Risk, all rights reserved
+#
+# DataQualityToolkit is licensed under the Apache 2.0 license a copy of which is included
+# in the source distribution of TransitionMatrix. This is notwithstanding any licenses of
+# third-party software included in this distribution. You may not use this file except in
+# compliance with the License.
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+""" Rules compiled to SQL give the outcomes of the pandas path """
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('duckdb')
+
+from DQToolkit import Rule, SQLDataSource, sql_literal
+from conftest import frame_source
+
+LOANS = pd.DataFrame({'int': [1, -2, 3, 0, 12, 5], 'float': [1.5, -2.0, np.nan, 0.0, 12.0, 0.5],
+                      'text': ['a', None, 'b', 'c', 'a', 'x'], 'bool': [True, False, True, True, False, True],
+                      'positive': [1, 2, 3, 4, 5, 6]})
+
+RULES = [(name,) + tuple(Rule().rule_data(name)[:2]) for name in sorted(Rule().rule_dict)] + [
+    ('InList', 'InList', (1, 3, 'a', 2.0)),
+    ('InList_numpy', 'InList', (np.int64(3), np.float64(0.5), 'x')),
+    ('InRange_numpy', 'InRange', (np.int64(0), np.float64(1.5))),
+]
+
+
+@pytest.fixture(params=['csv', 'parquet'])
+def loan_file(request, tmp_path):
+    filename = str(tmp_path / ('loans.' + request.param))
+    if request.param == 'csv':
+        LOANS.to_csv(filename, index=False)
+        return filename, pd.read_csv(filename)
+    LOANS.to_parquet(filename, index=False)
+    return filename, pd.read_parquet(filename)
+
+
+def outcomes(source):
+    return {col: (msg, source.results[0][col].true_count, np.asarray(source.results[0][col].failures).tolist())
+            if msg == 'Validated' else (msg,) for col, msg in source.status[0].items()}
+
+
+@pytest.mark.parametrize('name, function, args', RULES)
+def test_sql_matches_pandas(loan_file, name, function, args):
+    filename, df = loan_file
+    rule = Rule()
+    rule.active_rule, rule.active_rule_args, rule.active_rule_name = function, args, name
+    source = SQLDataSource(filename, keep_failures=True)
+    source.validate_frame(rule)
+    expected = frame_source(df)
+    expected.validate_frame(rule)
+    assert outcomes(source) == outcomes(expected)
+    assert source.status_rules[0] == dict.fromkeys(LOANS.columns, name)
+
+
+def test_sql_literal():
+    assert sql_literal("it's") == "'it''s'"
+    assert sql_literal(np.float64(1.0)) == '1.0'
+    assert sql_literal(np.int64(-3)) == '-3'
+    assert sql_literal(np.bool_(True)) == 'TRUE'
+    for value in (float('nan'), np.float64('inf'), -np.inf):
+        with pytest.raises(ValueError):
+            sql_literal(value)
@@ -0,0 +1,100 @@
+# encoding: utf-8
+
+# (c) 2018-2024 Open Risk, all rights reserved
+#
+# DataQualityToolkit is licensed under the Apache 2.0 license a copy of which is included
+# in the source distribution of TransitionMatrix. This is notwithstanding any licenses of
+# third-party software included in this distribution. You may not use this file except in
+# compliance with the License.
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+""" Validation runs stored in a ResultStore and reopened as StoredRun sources """
+
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+
+from DQToolkit import ResultStore, Rule, StreamDataSource, ValidationPlan
+from conftest import assert_same_outcomes, frame_source
+
+
+def validated_source():
+    df = pd.DataFrame({'a': [1.0, -2.0, 3.0, -4.0], 'b': [1, 'x', None, 2], 'c': [5, 6, -7, 8]})
+    source = frame_source(df)
+    rule = Rule()
+    rule.activate('R2')
+    source.validate_all(rule)
+    plan = ValidationPlan()
+    plan.add('R2', columns=['a'])
+    plan.add('R8', label='non_negative')
+    source.validate_plan(plan)
+    return source
+
+
+def test_store_round_trip(tmp_path):
+    source = validated_source()
+    store = ResultStore(str(tmp_path / 'runs'))
+    run_id = store.save(source, metadata={'dataset': 'test'})
+    run = store.open(run_id)
+    assert run.metadata == {'dataset': 'test'}
+    assert_same_outcomes(run.status[0], run.results[0], source.status[0], source.results[0])
+    for label in ('R2', 'non_negative'):
+        assert_same_outcomes(run.rule_status[label][0], run.rule_results[label][0],
+                             source.rule_status[label][0], source.rule_results[label][0])
+    np.testing.assert_array_equal(run.results[0]['c'].to_array(), source.results[0]['c'].to_array())
+    assert run.failure_index.failures(0, 'a', 'R2').tolist() == [1, 3]
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        run.validation_summary()
+    assert 'Rule Not Applicable' in output.getvalue()
+    assert list(store.runs()['run_id']) == [run_id]
+
+
+def test_store_records_rule_of_each_outcome(tmp_path):
+    # The plan label 'R2' is also the name of the rule of the status outcomes
+    source = validated_source()
+    rule = Rule()
+    rule.activate('R8')
+    source.validate(column='c', Validation_Rule=rule)
+    store = ResultStore(str(tmp_path / 'runs'))
+    run_id = store.save(source)
+    rules = {entry['column']: entry['label'] for entry in store.index(run_id)['entries'] if entry['kind'] == 'rule'}
+    assert rules == {'a': 'R2', 'b': 'R2', 'c': 'R8'}
+    assert store.open(run_id).status_rules[0] == rules
+
+
+def test_store_counts_round_trip(tmp_path):
+    filename = str(tmp_path / 'data.csv')
+    pd.DataFrame({'a': [1.0, -2.0, 3.0] * 10}).to_csv(filename, index=False)
+    source = StreamDataSource(filename, chunksize=7, keep_failures=True)
+    rule = Rule()
+    rule.activate('R2')
+    source.validate_all(rule)
+    store = ResultStore(str(tmp_path / 'runs'))
+    run = store.open(store.save(source))
+    assert_same_outcomes(run.status[0], run.results[0], source.status[0], source.results[0])
+    assert run.status_rules[0] == {'a': 'R2'}
+
+
+def test_store_drops_outcomes_of_earlier_rules(tmp_path):
+    source = frame_source(pd.DataFrame({'b': [1, 'x', None, 2]}))
+    rule = Rule()
+    rule.activate('R1')
+    source.validate(column='b', Validation_Rule=rule)
+    rule.activate('R2')
+    source.validate(column='b', Validation_Rule=rule)
+    assert source.status[0] == {'b': 'Rule Not Applicable'} and source.results[0] == {}
+    # A stale outcome left in the results slot is not stored under the rule of the status
+    source.results[0]['b'] = source.failure_index.outcomes[(0, 'b', 'R1')]
+    store = ResultStore(str(tmp_path / 'runs'))
+    run_id = store.save(source)
+    assert [entry.get('type') for entry in store.index(run_id)['entries']] == [None]
+    run = store.open(run_id)
+    assert run.results[0] == {}
+    assert run.failing_positions(('b', 'R2')).tolist() == []
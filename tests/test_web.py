@@ -0,0 +1,111 @@
+# encoding: utf-8
+
+# (c) 2018-2024 Open Risk, all rights reserved
+#
+# DataQualityToolkit is licensed under the Apache 2.0 license a copy of which is included
+# in the source distribution of TransitionMatrix. This is notwithstanding any licenses of
+# third-party software included in this distribution. You may not use this file except in
+# compliance with the License.
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+""" Web pages served by a local HTTP server stand-in, fetched and revalidated by a WebDataSource """
+
+import http.server
+import threading
+
+import pytest
+
+pytest.importorskip('aiohttp')
+pytest.importorskip('lxml')
+
+from DQToolkit import PageCache, WebDataSource
+
+TABLE = '<table class="wikitable"><tr><th>{0}</th><th>n</th></tr><tr><td>x</td><td>1</td></tr>' \
+        '<tr><td>y</td><td>2</td></tr></table>'
+
+PAGES = {
+    '/two': '<html><body>' + TABLE.format('first') + '<table><tr><td>layout</td></tr></table>' +
+            TABLE.format('second') + '</body></html>',
+    '/one': '<html><body>' + TABLE.format('only') + '</body></html>',
+}
+
+LAST_MODIFIED = 'Sat, 01 Aug 2026 10:00:00 GMT'
+
+
+class PageHandler(http.server.BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.headers.get('If-None-Match'),
+                                     self.headers.get('If-Modified-Since')))
+        if self.path not in PAGES:
+            self.send_error(404)
+            return
+        etag = '"{}"'.format(len(PAGES[self.path]))
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = PAGES[self.path].encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', LAST_MODIFIED)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), PageHandler)
+    httpd.requests = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def page_urls(server):
+    base = 'http://127.0.0.1:{}'.format(server.server_address[1])
+    return [base + '/two', base + '/missing', base + '/one']
+
+
+def test_tables_become_frames(server):
+    urls = page_urls(server)
+    source = WebDataSource(urls)
+    assert source.frame_names == [urls[0] + '#0', urls[0] + '#1', urls[2] + '#0']
+    assert [list(source.df[frame].columns) for frame in range(source.frame_no)] == \
+        [['first', 'n'], ['second', 'n'], ['only', 'n']]
+    assert source.df[1]['n'].tolist() == [1, 2]
+    assert source.fetch_status == {urls[0]: 'fetched', urls[1]: 'error', urls[2]: 'fetched'}
+    assert list(source.errors) == [urls[1]] and '404' in source.errors[urls[1]]
+
+
+def test_cached_pages_are_revalidated(server, tmp_path):
+    urls = page_urls(server)
+    cache = PageCache(str(tmp_path / 'pages'))
+    first = WebDataSource(urls, cache=cache)
+    server.requests.clear()
+
+    second = WebDataSource(urls, cache=cache, fetch=False)
+    parsed = []
+    parse = second.parse
+    second.parse = lambda url, html: parsed.append(url) or parse(url, html)
+    second.refresh()
+    assert sorted(server.requests) == sorted([('/two', '"{}"'.format(len(PAGES['/two'])), LAST_MODIFIED),
+                                              ('/missing', None, None),
+                                              ('/one', '"{}"'.format(len(PAGES['/one'])), LAST_MODIFIED)])
+    assert second.fetch_status == {urls[0]: 'not modified', urls[1]: 'error', urls[2]: 'not modified'}
+    assert parsed == []
+    assert second.frame_names == first.frame_names
+    for frame in range(first.frame_no):
+        assert second.df[frame].equals(first.df[frame])
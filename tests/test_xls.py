@@ -0,0 +1,41 @@
+# encoding: utf-8
+
+# (c) 2018-2024 Open Risk, all rights reserved
+#
+# DataQualityToolkit is licensed under the Apache 2.0 license a copy of which is included
+# in the source distribution of TransitionMatrix. This is notwithstanding any licenses of
+# third-party software included in this distribution. You may not use this file except in
+# compliance with the License.
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+""" Lazy sheet loading in XLSDataSource """
+
+import contextlib
+import io
+
+from DQToolkit import Rule, XLSDataSource
+
+
+def test_sheets_load_on_access(eba_sample):
+    source = XLSDataSource(eba_sample, 2)
+    assert not any(source.df.is_loaded(frame) for frame in range(source.frame_no))
+    rule = Rule()
+    rule.activate('R2')
+    source.validate_frame(rule, 6)
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        source.validation_summary()
+    assert [frame for frame in range(source.frame_no) if source.df.is_loaded(frame)] == [6]
+    summary = output.getvalue()
+    assert all(col in summary for col in source.status[6])
+
+
+def test_sheet_selection(eba_sample):
+    source = XLSDataSource(eba_sample, 2, sheets=['7. Loan', '11. Property'])
+    assert source.frame_no == 2
+    assert source.frame_index('11. Property') == 1
+    assert source.col_length[1] == len(source.df[1])
@@ -0,0 +1,83 @@
+# encoding: utf-8
+
+# (c) 2018-2024 Open Risk, all rights reserved
+#
+# DataQualityToolkit is licensed under the Apache 2.0 license a copy of which is included
+# in the source distribution of TransitionMatrix. This is notwithstanding any licenses of
+# third-party software included in this distribution. You may not use this file except in
+# compliance with the License.
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+""" The streaming xlsx reader (XLSXReader) against pandas.read_excel """
+
+import warnings
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from DQToolkit import Rule, StreamDataSource, XLSDataSource, XLSXReader
+
+
+@pytest.fixture
+def wide_rows(tmp_path):
+    """ A sheet with data rows wider than the header row """
+    filename = str(tmp_path / 'wide.xlsx')
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = 'data'
+    sheet.append(['a', 'b'])
+    for row in range(10):
+        sheet.append([row, -row] + ([None, row * 10] if row == 7 else []))
+    workbook.save(filename)
+    return filename
+
+
+def test_streaming_matches_read_excel(eba_sample):
+    reader = XLSXReader(eba_sample)
+    for sheet_name in reader.sheet_names:
+        expected = pd.read_excel(eba_sample, sheet_name, header=2, engine='openpyxl')
+        df = reader.read(sheet_name, 2)
+        pd.testing.assert_frame_equal(df, expected, check_dtype=False)
+        assert reader.columns(sheet_name, 2) == list(expected.columns)
+
+
+def test_streaming_source_matches(eba_sample):
+    rule = Rule()
+    rule.activate('R2')
+    sheets = ['7. Loan', '8. History of Total Repayments']
+    streaming = XLSDataSource(eba_sample, 2, sheets=sheets, streaming=True)
+    streaming.validate_all(rule)
+    expected = XLSDataSource(eba_sample, 2, sheets=sheets)
+    expected.validate_all(rule)
+    assert streaming.status == expected.status
+
+
+def test_wide_rows_match_read_excel(wide_rows):
+    reader = XLSXReader(wide_rows)
+    expected = pd.read_excel(wide_rows, 'data', engine='openpyxl')
+    assert list(expected.columns) == ['a', 'b', 'Unnamed: 2', 'Unnamed: 3']
+    pd.testing.assert_frame_equal(reader.read('data'), expected, check_dtype=False)
+    assert reader.columns('data') == list(expected.columns)
+
+
+def test_wide_rows_beyond_first_chunk(wide_rows):
+    reader = XLSXReader(wide_rows)
+    with pytest.warns(UserWarning, match='ignored'):
+        chunks = list(reader.chunks('data', chunksize=3))
+    assert [list(chunk.columns) for chunk in chunks] == [['a', 'b']] * 4
+    assert reader.columns('data', chunksize=3) == ['a', 'b']
+    assert pd.concat(chunks)['b'].tolist() == [-row for row in range(10)]
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        source = StreamDataSource(wide_rows, chunksize=3, sheet_name='data')
+        rule = Rule()
+        rule.activate('R8')
+        source.validate_all(rule)
+    assert list(source.status[0]) == source.col_names[0] == ['a', 'b']
+    assert source.results[0]['b'].false_count == 9